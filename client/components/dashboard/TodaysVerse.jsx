@@ -2,7 +2,7 @@
 'use client';
 import React, { useState, useEffect } from 'react';
 import { BookOpen, RefreshCw } from 'lucide-react';
-import { getRandomVerse } from '@/lib/api';
+import { getDailyVerse, getRandomVerse } from '@/lib/api';
 
 const TodaysVerse = ({ darkMode }) => {
   const [currentVerse, setCurrentVerse] = useState(null);
@@ -60,7 +60,7 @@ const TodaysVerse = ({ darkMode }) => {
         setLoading(true);
 
         // Try to get from API first
-        const verseData = await getRandomVerse();
+        const verseData = await getDailyVerse();
         setCurrentVerse(verseData);
       } catch (err) {
         console.error('Error loading daily verse:', err);
@@ -66,6 +66,85 @@ export async function sendChatMessage(userInput, sessionId = null, interactionMo
   }
 }
 
+/**
+ * Send a chat message and stream the reply (Server-Sent Events)
+ * 
+ * @param {string} userInput - The user's message
+ * @param {string} sessionId - Optional session ID for continuing conversation
+ * @param {string} interactionMode - One of 'wisdom', 'socratic', 'story'
+ * @param {Object} handlers - Optional callbacks
+ * @param {Function} handlers.onMeta - Called with intent, emotion, verses, etc. once retrieval finishes
+ * @param {Function} handlers.onToken - Called with each reply chunk as it arrives
+ * @returns {Promise<Object>} Final event with reflection (replaces the streamed chunks), fallback_used and timings
+ */
+export async function streamChatMessage(userInput, sessionId = null, interactionMode = 'wisdom', { onMeta, onToken } = {}) {
+  try {
+    const token = await getAuthToken();
+    
+    const headers = {
+      'Content-Type': 'application/json',
+      'Accept': 'text/event-stream'
+    };
+    
+    if (token) {
+      headers['Authorization'] = `Bearer ${token}`;
+    }
+    
+    const response = await fetch(`${API_URL}/chat/stream`, {
+      method: 'POST',
+      headers,
+      body: JSON.stringify({
+        user_input: userInput,
+        session_id: sessionId,
+        interaction_mode: interactionMode
+      })
+    });
+    
+    if (!response.ok) {
+      const error = await response.json();
+      throw new Error(error.detail || 'Failed to send message');
+    }
+    
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let done = null;
+    
+    while (true) {
+      const { value, done: streamDone } = await reader.read();
+      if (streamDone) break;
+      buffer += decoder.decode(value, { stream: true });
+      
+      // Events are separated by a blank line
+      let boundary;
+      while ((boundary = buffer.indexOf('\n\n')) !== -1) {
+        const block = buffer.slice(0, boundary);
+        buffer = buffer.slice(boundary + 2);
+        
+        let event = 'message';
+        let data = '';
+        for (const line of block.split('\n')) {
+          if (line.startsWith('event: ')) event = line.slice(7);
+          else if (line.startsWith('data: ')) data += line.slice(6);
+        }
+        const payload = data ? JSON.parse(data) : {};
+        
+        if (event === 'meta') onMeta?.(payload);
+        else if (event === 'token') onToken?.(payload.text);
+        else if (event === 'done') done = payload;
+      }
+    }
+    
+    if (!done) {
+      throw new Error('Chat stream ended unexpectedly');
+    }
+    return done;
+  } catch (error) {
+    console.error('Error streaming chat message:', error);
+    throw error;
+  }
+}
+
 /**
  * Create a new conversation session (requires authentication)
  * 
@@ -195,6 +274,32 @@ export async function getRandomVerse() {
   }
 }
 
+/**
+ * Get the verse of the day from the Bhagavad Gita
+ * 
+ * The same verse is returned for the whole (UTC) day, and the response is
+ * cacheable by the browser until midnight.
+ * 
+ * @param {string|null} seed - Optional seed (e.g., user ID) for a personal verse of the day
+ * @returns {Promise<Object>} Verse with Sanskrit, transliteration, and English meaning
+ */
+export async function getDailyVerse(seed = null) {
+  try {
+    const query = seed ? `?seed=${encodeURIComponent(seed)}` : '';
+    const response = await fetch(`${API_URL}/verses/daily${query}`);
+    
+    if (!response.ok) {
+      const error = await response.json();
+      throw new Error(error.detail || 'Failed to fetch daily verse');
+    }
+    
+    return await response.json();
+  } catch (error) {
+    console.error('Error fetching daily verse:', error);
+    throw error;
+  }
+}
+
 /**
  * Search for verses based on query
  * 
@@ -1,14 +1,19 @@
 from fastapi import APIRouter, HTTPException, Depends, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import iterate_in_threadpool
 from sqlalchemy.orm import Session
 from app.db.database import get_db
+from app.core.config import settings
 from app.core.auth import require_auth, optional_auth
 from app.models.user import User
-from app.services.emotion_detection import get_emotion_service, EmotionDetectionService
-from app.services.vector_search import VectorSearchService
+from app.services.emotion_detection import get_emotion_service, dominant_emotion, EmotionDetectionService
+from app.services.vector_search import VectorSearchService, get_vector_service
 from app.services.reflection_generation import get_reflection_service, ReflectionGenerationService
 from app.services.conversation_manager import ConversationManager
 from app.services.logging_service import LoggingService
 from app.services.intent_classification import get_intent_service, IntentClassificationService
+from app.services.multitask_inference import get_multitask_service
+from app.services.analyzed_input import AnalyzedInput
 from app.services.casual_chat import get_casual_chat_service, CasualChatService
 from app.services.supabase_service import get_supabase_service
 from app.schemas.emotion import EmotionData
@@ -18,6 +23,8 @@ from app.models.conversation import ConversationSession
 from pydantic import BaseModel, Field
 from typing import Optional, List, Dict, Any
 import uuid
+import json
+import time
 import logging
 from datetime import datetime
 
@@ -80,45 +87,202 @@ class ChatResponse(BaseModel):
         }
 
 
-# Global service instances (will be initialized on first use)
-_vector_service: Optional[VectorSearchService] = None
+def get_conversation_manager(db: Session = Depends(get_db)) -> ConversationManager:
+    """Dependency to get conversation manager."""
+    return ConversationManager(db)
+
+
+def get_logging_service(db: Session = Depends(get_db)) -> LoggingService:
+    """Dependency to get logging service."""
+    return LoggingService(db)
 
 
-def get_vector_service() -> VectorSearchService:
-    """Dependency to get or create VectorSearchService instance."""
-    global _vector_service
-    if _vector_service is None:
+async def _prepare_turn(
+    request: ChatRequest,
+    analyzed: AnalyzedInput,
+    vector_service: VectorSearchService
+) -> Dict[str, Any]:
+    """
+    Classify intent, detect emotions and retrieve verses for a chat turn.
+    
+    Shared by the blocking and streaming chat endpoints; every step falls
+    back on failure instead of raising. The intent and emotion services are
+    fetched only when needed, so with the multi-task model they are never
+    loaded unless it fails.
+    
+    Args:
+        request: Chat request
+        analyzed: Shared analysis of request.user_input
+        vector_service: Verse search service
+    
+    Returns:
+        Dictionary with intent, intent_confidence, emotion (EmotionData or
+        None), verses (VerseSearchResult list) and fallback_used
+    """
+    fallback_used = False
+    
+    # Fast path: a direct verse reference ("BG 2.47", "chapter 2 verse 47")
+    # is resolved by ID, skipping intent, emotion and embedding models
+    try:
+        reference_verses = vector_service.find_verses_by_reference(request.user_input)
+    except Exception as e:
+        logger.warning(f"Verse reference lookup failed: {e}")
+        reference_verses = None
+    
+    # With the multi-task model, intent and emotions come from one forward pass
+    multitask_emotions = None
+    if settings.MULTITASK_ENABLED and not reference_verses:
         try:
-            _vector_service = VectorSearchService()
-            # Initialize database if CSV file exists
-            try:
-                _vector_service.initialize_database("Bhagwad_Gita.csv")
-            except Exception as e:
-                logger.warning(f"Could not initialize database from CSV: {e}")
+            intent, intent_confidence, multitask_emotions = get_multitask_service().analyze(
+                request.user_input,
+                threshold=0.15
+            )
+            logger.info(f"Multi-task intent: {intent} (confidence: {intent_confidence})")
         except Exception as e:
-            logger.error(f"Failed to initialize VectorSearchService: {e}")
-            raise HTTPException(status_code=500, detail="Vector search service unavailable")
+            logger.warning(f"Multi-task model failed, using separate intent and emotion models: {e}")
     
-    return _vector_service
+    # Step 0: Classify intent to determine routing
+    if reference_verses:
+        intent = "spiritual_guidance"
+        intent_confidence = 1.0
+        logger.info(f"Resolved verse reference: {[verse['id'] for verse in reference_verses]}")
+    elif multitask_emotions is None:
+        try:
+            intent, intent_confidence = get_intent_service().classify_intent(request.user_input, analyzed=analyzed)
+            logger.info(f"Classified intent: {intent} (confidence: {intent_confidence})")
+        except Exception as e:
+            logger.warning(f"Intent classification failed, defaulting to casual_chat: {e}")
+            intent = "casual_chat"
+            intent_confidence = 0.5
+    
+    # Step 1: Detect emotions (only for emotional_query intent)
+    emotion = None
+    if intent == "emotional_query":
+        try:
+            emotions_data = multitask_emotions or await get_emotion_service().detect_emotion_async(
+                text=request.user_input,
+                threshold=0.15  # Lower threshold for better emotion detection
+            )
+            dominant_emotion_data = dominant_emotion(emotions_data)
+            emotion = EmotionData(**dominant_emotion_data)
+            logger.info(f"Detected emotion: {emotion.label} (confidence: {emotion.confidence})")
+        
+        except Exception as e:
+            logger.warning(f"Emotion detection failed, using neutral fallback: {e}")
+            fallback_used = True
+            emotion = EmotionData(
+                label="neutral",
+                confidence=0.5,
+                emoji="😐",
+                color="#F3F4F6"
+            )
+    
+    # Step 2: Search for relevant verses (skip for casual_chat)
+    verses = []
+    if reference_verses:
+        verses = [VerseSearchResult(**verse) for verse in reference_verses]
+    elif intent in ["emotional_query", "spiritual_guidance"]:
+        try:
+            # For emotional queries, include emotion in search
+            # For spiritual guidance, search by query only
+            search_emotion = emotion.label if intent == "emotional_query" and emotion else None
+            
+            verses_data = vector_service.search_verses(
+                query=request.user_input,
+                emotion=search_emotion,
+                top_k=3,
+                analyzed=analyzed
+            )
+            verses = [VerseSearchResult(**verse) for verse in verses_data]
+            logger.info(f"Found {len(verses)} relevant verses")
+            
+            if not verses:
+                raise Exception("No verses found")
+        
+        except Exception as e:
+            logger.warning(f"Verse search failed, using fallback verse: {e}")
+            fallback_used = True
+            # Fallback to a default verse (BG2.47 - famous karma yoga verse)
+            verses = [VerseSearchResult(
+                id="BG2.47",
+                chapter=2,
+                verse=47,
+                shloka="कर्मण्येवाधिकारस्ते मा फलेषु कदाचन। मा कर्मफलहेतुर्भूर्मा ते सङ्गोऽस्त्वकर्मणि॥",
+                transliteration="karmaṇy-evādhikāras te mā phaleṣhu kadāchana mā karma-phala-hetur bhūr mā te saṅgo 'stv akarmaṇi",
+                eng_meaning="You have a right to perform your prescribed duty, but not to the fruits of action. Never consider yourself the cause of the results of your activities, and never be attached to not doing your duty.",
+                hin_meaning="तुम्हारा अधिकार केवल कर्म करने में है, फल में नहीं। इसलिए तुम कर्म के फल के हेतु मत बनो और न ही तुम्हारी अकर्म में आसक्ति हो।",
+                similarity_score=0.5
+            )]
+    
+    return {
+        "intent": intent,
+        "intent_confidence": intent_confidence,
+        "emotion": emotion,
+        "verses": verses,
+        "fallback_used": fallback_used
+    }
 
 
-def get_conversation_manager(db: Session = Depends(get_db)) -> ConversationManager:
-    """Dependency to get conversation manager."""
-    return ConversationManager(db)
+def _fallback_reflection(
+    request: ChatRequest,
+    intent: str,
+    emotion: Optional[EmotionData],
+    verses: List[VerseSearchResult],
+    casual_chat_service: CasualChatService,
+    reflection_service: ReflectionGenerationService
+) -> str:
+    """
+    Build a reply without Gemini: template-based, or a last-resort text.
+    
+    Args:
+        request: Chat request
+        intent: Classified intent
+        emotion: Detected emotion (None for casual chat)
+        verses: Retrieved verses
+        casual_chat_service: Casual chat service
+        reflection_service: Reflection generation service
+    
+    Returns:
+        Fallback reflection text
+    """
+    try:
+        if intent == "casual_chat":
+            reflection_text = casual_chat_service.generate_fallback_response(request.user_input)
+            logger.info("Generated fallback casual chat response")
+        else:
+            reflection_text = reflection_service.generate_fallback_reflection(
+                user_input=request.user_input,
+                emotion_data=emotion.model_dump() if emotion else {"label": "neutral", "confidence": 0.5},
+                verses=[verse.model_dump() for verse in verses]
+            )
+            logger.info("Generated fallback reflection")
+    except Exception as fallback_error:
+        logger.error(f"Fallback reflection also failed: {fallback_error}")
+        # Last resort reflection
+        if intent == "casual_chat":
+            reflection_text = "🙏 Namaste! I'm GitaGPT, your spiritual companion. I'm here to help you find wisdom from the Bhagavad Gita. How can I support you today?"
+        elif verses:
+            emotion_label = emotion.label if emotion else "seeking guidance"
+            reflection_text = f"""I understand you're {emotion_label}. Here's a verse that may provide guidance:
 
+**Verse {verses[0].chapter}.{verses[0].verse}:**
 
-def get_logging_service(db: Session = Depends(get_db)) -> LoggingService:
-    """Dependency to get logging service."""
-    return LoggingService(db)
+Sanskrit: {verses[0].shloka}
+
+English: {verses[0].eng_meaning}
+
+This ancient wisdom reminds us that we can find peace and clarity even in challenging times. Take a moment to reflect on how this teaching might apply to your current situation."""
+        else:
+            reflection_text = "I'm here to provide guidance from the Bhagavad Gita. Please share what's on your mind."
+    
+    return reflection_text
 
 
 @router.post("/", response_model=ChatResponse)
 async def chat(
     request: ChatRequest,
     current_user: User = Depends(optional_auth),
-    intent_service: IntentClassificationService = Depends(get_intent_service),
     casual_chat_service: CasualChatService = Depends(get_casual_chat_service),
-    emotion_service: EmotionDetectionService = Depends(get_emotion_service),
     vector_service: VectorSearchService = Depends(get_vector_service),
     reflection_service: ReflectionGenerationService = Depends(get_reflection_service),
     conversation_manager: ConversationManager = Depends(get_conversation_manager),
@@ -128,6 +292,7 @@ async def chat(
     Main conversation orchestration endpoint that handles the complete flow.
     
     This endpoint orchestrates the entire conversation flow:
+    0. Resolves direct verse references ("BG 2.47") by ID, or classifies intent
     1. Detects emotions from user input
     2. Searches for relevant verses based on semantic similarity
     3. Retrieves conversation context if session exists
@@ -179,73 +344,17 @@ async def chat(
         user_id = current_user.id if current_user else None
         logger.info(f"Processing chat request for user {user_id}, session {request.session_id}")
         
+        # Normalize, fingerprint and (lazily) embed the message once for all stages
+        analyzed = vector_service.analyze(request.user_input)
+        
         # Skip Supabase initialization to avoid database errors
         # supabase_service = get_supabase_service()
         
-        # Step 0: Classify intent to determine routing
-        try:
-            intent, intent_confidence = intent_service.classify_intent(request.user_input)
-            logger.info(f"Classified intent: {intent} (confidence: {intent_confidence})")
-        except Exception as e:
-            logger.warning(f"Intent classification failed, defaulting to casual_chat: {e}")
-            intent = "casual_chat"
-            intent_confidence = 0.5
-        
-        # Step 1: Detect emotions (only for emotional_query intent)
-        emotion = None
-        if intent == "emotional_query":
-            try:
-                emotions_data = emotion_service.detect_emotion(
-                    text=request.user_input,
-                    threshold=0.15  # Lower threshold for better emotion detection
-                )
-                dominant_emotion_data = emotion_service.get_dominant_emotion(emotions_data)
-                emotion = EmotionData(**dominant_emotion_data)
-                logger.info(f"Detected emotion: {emotion.label} (confidence: {emotion.confidence})")
-                
-            except Exception as e:
-                logger.warning(f"Emotion detection failed, using neutral fallback: {e}")
-                fallback_used = True
-                emotion = EmotionData(
-                    label="neutral",
-                    confidence=0.5,
-                    emoji="😐",
-                    color="#F3F4F6"
-                )
-        
-        # Step 2: Search for relevant verses (skip for casual_chat)
-        verses = []
-        if intent in ["emotional_query", "spiritual_guidance"]:
-            try:
-                # For emotional queries, include emotion in search
-                # For spiritual guidance, search by query only
-                search_emotion = emotion.label if intent == "emotional_query" and emotion else None
-                
-                verses_data = vector_service.search_verses(
-                    query=request.user_input,
-                    emotion=search_emotion,
-                    top_k=3
-                )
-                verses = [VerseSearchResult(**verse) for verse in verses_data]
-                logger.info(f"Found {len(verses)} relevant verses")
-                
-                if not verses:
-                    raise Exception("No verses found")
-                    
-            except Exception as e:
-                logger.warning(f"Verse search failed, using fallback verse: {e}")
-                fallback_used = True
-                # Fallback to a default verse (BG2.47 - famous karma yoga verse)
-                verses = [VerseSearchResult(
-                    id="BG2.47",
-                    chapter=2,
-                    verse=47,
-                    shloka="कर्मण्येवाधिकारस्ते मा फलेषु कदाचन। मा कर्मफलहेतुर्भूर्मा ते सङ्गोऽस्त्वकर्मणि॥",
-                    transliteration="karmaṇy-evādhikāras te mā phaleṣhu kadāchana mā karma-phala-hetur bhūr mā te saṅgo 'stv akarmaṇi",
-                    eng_meaning="You have a right to perform your prescribed duty, but not to the fruits of action. Never consider yourself the cause of the results of your activities, and never be attached to not doing your duty.",
-                    hin_meaning="तुम्हारा अधिकार केवल कर्म करने में है, फल में नहीं। इसलिए तुम कर्म के फल के हेतु मत बनो और न ही तुम्हारी अकर्म में आसक्ति हो।",
-                    similarity_score=0.5
-                )]
+        # Steps 0-2: Route by intent, detect emotions and search verses
+        turn = await _prepare_turn(request, analyzed, vector_service)
+        intent, intent_confidence = turn["intent"], turn["intent_confidence"]
+        emotion, verses = turn["emotion"], turn["verses"]
+        fallback_used = turn["fallback_used"]
         
         # Step 3: Simplified session management (skip database operations)
         # Use temporary session ID to avoid database errors
@@ -263,7 +372,7 @@ async def chat(
                     conversation_history=[msg.model_dump() for msg in conversation_history]
                 )
                 logger.info("Generated casual chat response using Gemini API")
-                
+            
             elif intent in ["emotional_query", "spiritual_guidance"]:
                 # Use full reflection service with verses
                 reflection_text = reflection_service.generate_reflection(
@@ -275,39 +384,13 @@ async def chat(
                     user_context=user_context
                 )
                 logger.info(f"Generated {intent} reflection using Gemini API")
-            
+        
         except Exception as e:
             logger.warning(f"Reflection generation failed, using fallback: {e}")
             fallback_used = True
-            try:
-                if intent == "casual_chat":
-                    reflection_text = casual_chat_service.generate_fallback_response(request.user_input)
-                    logger.info("Generated fallback casual chat response")
-                else:
-                    reflection_text = reflection_service.generate_fallback_reflection(
-                        user_input=request.user_input,
-                        emotion_data=emotion.model_dump() if emotion else {"label": "neutral", "confidence": 0.5},
-                        verses=[verse.model_dump() for verse in verses]
-                    )
-                    logger.info("Generated fallback reflection")
-            except Exception as fallback_error:
-                logger.error(f"Fallback reflection also failed: {fallback_error}")
-                # Last resort reflection
-                if intent == "casual_chat":
-                    reflection_text = "🙏 Namaste! I'm GitaGPT, your spiritual companion. I'm here to help you find wisdom from the Bhagavad Gita. How can I support you today?"
-                elif verses:
-                    emotion_label = emotion.label if emotion else "seeking guidance"
-                    reflection_text = f"""I understand you're {emotion_label}. Here's a verse that may provide guidance:
-
-**Verse {verses[0].chapter}.{verses[0].verse}:**
-
-Sanskrit: {verses[0].shloka}
-
-English: {verses[0].eng_meaning}
-
-This ancient wisdom reminds us that we can find peace and clarity even in challenging times. Take a moment to reflect on how this teaching might apply to your current situation."""
-                else:
-                    reflection_text = "I'm here to provide guidance from the Bhagavad Gita. Please share what's on your mind."
+            reflection_text = _fallback_reflection(
+                request, intent, emotion, verses, casual_chat_service, reflection_service
+            )
         
         # Skip message storage to avoid database errors
         # Message storage is not critical for AI response generation
@@ -329,13 +412,13 @@ This ancient wisdom reminds us that we can find peace and clarity even in challe
             fallback_used=fallback_used
         )
         
-        logger.info(f"Chat request completed successfully (intent: {intent}, fallback_used: {fallback_used})")
+        logger.info(f"Chat request completed successfully (intent: {intent}, fallback_used: {fallback_used}, input: {analyzed.log_summary()})")
         return response
-        
+    
     except HTTPException:
         # Re-raise HTTP exceptions (validation errors)
         raise
-        
+    
     except Exception as e:
         logger.error(f"Unexpected error in chat endpoint: {e}")
         
@@ -377,7 +460,7 @@ This verse reminds us to focus on our actions rather than worrying about outcome
                 intent_confidence=0.5,
                 fallback_used=True
             )
-            
+        
         except Exception as final_error:
             logger.error(f"Final fallback also failed: {final_error}")
             raise HTTPException(
@@ -386,8 +469,144 @@ This verse reminds us to focus on our actions rather than worrying about outcome
             )
 
 
+def _sse_event(event: str, data: Dict[str, Any]) -> str:
+    """Format one Server-Sent Event with a JSON payload."""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+@router.post("/stream")
+async def chat_stream(
+    request: ChatRequest,
+    current_user: User = Depends(optional_auth),
+    casual_chat_service: CasualChatService = Depends(get_casual_chat_service),
+    vector_service: VectorSearchService = Depends(get_vector_service),
+    reflection_service: ReflectionGenerationService = Depends(get_reflection_service)
+) -> StreamingResponse:
+    """
+    Streaming chat endpoint over Server-Sent Events.
+    
+    Runs the same routing, emotion detection and verse search as POST /chat/,
+    sends the results as soon as retrieval finishes, then streams the reply
+    while Gemini generates it. Time to first content is the retrieval
+    latency instead of the full generation latency.
+    
+    **Parameters:** same as POST /chat/
+    
+    **Events:**
+    - **meta**: intent, intent_confidence, emotion, verses, session_id and
+      interaction_mode (the ChatResponse fields known before generation)
+    - **token**: `{"text": ...}` reply chunks, in order
+    - **done**: reflection (the final cleaned reply; it replaces the
+      concatenated tokens, e.g. with the fallback reply if generation failed
+      mid-stream), fallback_used and timings in milliseconds (retrieval,
+      first_token, generation, total)
+    
+    **Error Handling:**
+    Same fallbacks as POST /chat/. Generation failures are reported in the
+    done event rather than as an HTTP error, since the response has started.
+    """
+    start = time.perf_counter()
+    
+    valid_modes = ["socratic", "wisdom", "story"]
+    if request.interaction_mode not in valid_modes:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid interaction mode '{request.interaction_mode}'. Must be one of: {valid_modes}"
+        )
+    
+    user_id = current_user.id if current_user else None
+    logger.info(f"Processing streaming chat request for user {user_id}, session {request.session_id}")
+    session_id = request.session_id or uuid.uuid4()
+    
+    try:
+        analyzed = vector_service.analyze(request.user_input)
+        turn = await _prepare_turn(request, analyzed, vector_service)
+    except Exception as e:
+        logger.error(f"Unexpected error in streaming chat endpoint: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Unable to process your request. Please try again later."
+        )
+    
+    intent, emotion, verses = turn["intent"], turn["emotion"], turn["verses"]
+    retrieval_ms = (time.perf_counter() - start) * 1000
+    
+    async def events():
+        fallback_used = turn["fallback_used"]
+        yield _sse_event("meta", {
+            "intent": intent,
+            "intent_confidence": turn["intent_confidence"],
+            "emotion": emotion.model_dump() if emotion else None,
+            "verses": [verse.model_dump() for verse in verses],
+            "session_id": str(session_id),
+            "interaction_mode": request.interaction_mode
+        })
+        
+        if intent == "casual_chat":
+            chunks = casual_chat_service.stream_response(
+                user_input=request.user_input,
+                conversation_history=[]
+            )
+        else:
+            chunks = reflection_service.stream_reflection(
+                user_input=request.user_input,
+                emotion_data=emotion.model_dump() if emotion else {"label": "neutral", "confidence": 0.5},
+                verses=[verse.model_dump() for verse in verses],
+                interaction_mode=request.interaction_mode,
+                conversation_history=[],
+                user_context=[]
+            )
+        
+        # The Gemini stream blocks between chunks, so iterate it off the event loop
+        parts = []
+        first_token_ms = None
+        generation_start = time.perf_counter()
+        try:
+            async for chunk in iterate_in_threadpool(chunks):
+                if first_token_ms is None:
+                    first_token_ms = (time.perf_counter() - start) * 1000
+                parts.append(chunk)
+                yield _sse_event("token", {"text": chunk})
+            
+            text = "".join(parts)
+            reflection_text = text.strip() if intent == "casual_chat" else reflection_service.clean_reflection(text)
+            logger.info(f"Streamed {intent} reply using Gemini API ({len(parts)} chunks)")
+        
+        except Exception as e:
+            logger.warning(f"Streaming generation failed, using fallback: {e}")
+            fallback_used = True
+            reflection_text = _fallback_reflection(
+                request, intent, emotion, verses, casual_chat_service, reflection_service
+            )
+            if not parts:
+                first_token_ms = (time.perf_counter() - start) * 1000
+                yield _sse_event("token", {"text": reflection_text})
+        
+        generation_ms = (time.perf_counter() - generation_start) * 1000
+        total_ms = (time.perf_counter() - start) * 1000
+        yield _sse_event("done", {
+            "reflection": reflection_text,
+            "fallback_used": fallback_used,
+            "timings": {
+                "retrieval": round(retrieval_ms, 1),
+                "first_token": round(first_token_ms, 1),
+                "generation": round(generation_ms, 1),
+                "total": round(total_ms, 1)
+            }
+        })
+        logger.info(f"Streaming chat request completed (intent: {intent}, fallback_used: {fallback_used}, input: {analyzed.log_summary()})")
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        # Disable proxy buffering so events reach the client as they are sent
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
 @router.get("/health")
 async def chat_service_health(
+    intent_service: IntentClassificationService = Depends(get_intent_service),
     emotion_service: EmotionDetectionService = Depends(get_emotion_service),
     vector_service: VectorSearchService = Depends(get_vector_service),
     reflection_service: ReflectionGenerationService = Depends(get_reflection_service),
@@ -406,12 +625,20 @@ async def chat_service_health(
     
     overall_healthy = True
     
+    # Report intent cascade tiers, hit rates and latencies
+    health_status["services"]["intent_classification"] = {
+        "status": "healthy" if intent_service.classifier or intent_service.embedding_classifier else "degraded",
+        "model": intent_service.model_name,
+        "cascade": intent_service.get_cascade_stats()
+    }
+    
     # Test emotion detection service
     try:
         test_emotions = emotion_service.detect_emotion("I am feeling good today")
         health_status["services"]["emotion_detection"] = {
             "status": "healthy",
-            "test_passed": len(test_emotions) > 0
+            "test_passed": len(test_emotions) > 0,
+            "batching": emotion_service.get_batching_stats()
         }
     except Exception as e:
         health_status["services"]["emotion_detection"] = {
@@ -1,7 +1,8 @@
 from fastapi import APIRouter, HTTPException, Depends
-from app.schemas.emotion import EmotionRequest, EmotionResponse, EmotionData
+from app.schemas.emotion import EmotionRequest, EmotionResponse, EmotionData, EmotionBatchRequest, EmotionBatchResponse
 from app.services.emotion_detection import get_emotion_service, EmotionDetectionService
 from typing import List
+import asyncio
 
 router = APIRouter(prefix="/emotions", tags=["emotions"])
 
@@ -28,7 +29,7 @@ async def detect_emotion(
     """
     try:
         # Detect emotions using the service
-        emotions_data = emotion_service.detect_emotion(
+        emotions_data = await emotion_service.detect_emotion_async(
             text=request.text,
             threshold=request.threshold
         )
@@ -63,6 +64,46 @@ async def detect_emotion(
         )
 
 
+@router.post("/detect/batch", response_model=EmotionBatchResponse)
+async def detect_emotions_batch(
+    request: EmotionBatchRequest,
+    emotion_service: EmotionDetectionService = Depends(get_emotion_service)
+) -> EmotionBatchResponse:
+    """
+    Detect emotions for many texts in a single request.
+    
+    Texts are grouped by length and classified in padded batches, which is
+    much faster than one `/emotions/detect` call per text (e.g., for
+    backfilling historical emotion logs).
+    
+    - **texts**: Texts to analyze (1-256 texts, each 1-5000 characters)
+    - **threshold**: Minimum confidence threshold (default: 0.3)
+    
+    Returns one result per text, in the same order as the texts.
+    """
+    try:
+        # Run the model off the event loop
+        results_data = await asyncio.get_running_loop().run_in_executor(
+            None, emotion_service.detect_emotions, request.texts, request.threshold
+        )
+        
+        results = []
+        for emotions_data in results_data:
+            results.append(EmotionResponse(
+                emotions=[EmotionData(**emotion) for emotion in emotions_data],
+                dominant=EmotionData(**emotion_service.get_dominant_emotion(emotions_data))
+            ))
+        
+        return EmotionBatchResponse(results=results)
+        
+    except Exception as e:
+        print(f"Error in batch emotion detection endpoint: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Unable to detect emotions. Please try again later."
+        )
+
+
 @router.get("/health")
 async def emotion_service_health(
     emotion_service: EmotionDetectionService = Depends(get_emotion_service)
@@ -80,6 +121,7 @@ async def emotion_service_health(
             "status": "healthy",
             "model": "SamLowe/roberta-base-go_emotions-onnx",
             "test_detection": len(test_result) > 0,
+            "batching": emotion_service.get_batching_stats(),
             "message": "Emotion detection service is operational"
         }
     except Exception as e:
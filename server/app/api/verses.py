@@ -1,37 +1,20 @@
-from fastapi import APIRouter, HTTPException, Depends
-from app.schemas.verse import VerseSearchRequest, VerseSearchResponse, VerseSearchResult, VerseMetadataResponse
-from app.services.vector_search import VectorSearchService
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Response
+from app.schemas.verse import (
+    VerseSearchRequest, VerseSearchResponse, VerseSearchResult, VerseMetadataResponse,
+    VerseBatchSearchRequest, VerseBatchSearchResponse
+)
+from app.services.vector_search import VectorSearchService, get_vector_service
+from app.services.verse_catalog import get_verse_catalog, VerseCatalog
 from app.services.supabase_service import get_supabase_service, SupabaseService
 from typing import List, Optional
+from datetime import datetime, timedelta, timezone
+import hashlib
 import logging
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/verses", tags=["verses"])
 
-# Global service instance (will be initialized on first use)
-_vector_service: Optional[VectorSearchService] = None
-
-
-def get_vector_service() -> VectorSearchService:
-    """
-    Dependency to get or create VectorSearchService instance.
-    """
-    global _vector_service
-    if _vector_service is None:
-        try:
-            _vector_service = VectorSearchService()
-            # Initialize database if CSV file exists
-            try:
-                _vector_service.initialize_database("Bhagwad_Gita.csv")
-            except Exception as e:
-                logger.warning(f"Could not initialize database from CSV: {e}")
-        except Exception as e:
-            logger.error(f"Failed to initialize VectorSearchService: {e}")
-            raise HTTPException(status_code=500, detail="Vector search service unavailable")
-    
-    return _vector_service
-
 
 @router.post("/search", response_model=VerseSearchResponse)
 async def search_verses(
@@ -41,24 +24,29 @@ async def search_verses(
     """
     Search for relevant Bhagavad Gita verses based on semantic similarity.
     
-    This endpoint performs semantic search using SentenceTransformers embeddings
+    This endpoint performs semantic search using sentence embeddings
     and optionally re-ranks results based on emotion-theme alignment.
     
     - **query**: Text to search for (1-5000 characters)
     - **emotion**: Optional emotion for theme-based re-ranking
     - **top_k**: Number of verses to return (1-20, default: 5)
+    - **mode**: Optional retrieval mode: "semantic" (embeddings only), "lexical"
+      (BM25 keyword search, useful for Sanskrit terms like "sthitaprajna" or quoted
+      phrases) or "hybrid" (both, fused by reciprocal rank fusion)
     
     Returns verses sorted by relevance score (semantic similarity + optional theme alignment).
     Each verse includes Sanskrit text, transliteration, English meaning, and similarity score.
     
-    The service uses ChromaDB for vector storage and 'all-mpnet-base-v2' model for embeddings.
+    The service uses ChromaDB for vector storage and the configured EMBEDDING_MODEL
+    (default 'all-mpnet-base-v2', PyTorch or ONNX Runtime backend) for embeddings.
     """
     try:
         # Search for verses using the vector service
         verses_data = vector_service.search_verses(
             query=request.query,
             emotion=request.emotion,
-            top_k=request.top_k
+            top_k=request.top_k,
+            mode=request.mode
         )
         
         # Convert to Pydantic models
@@ -81,30 +69,74 @@ async def search_verses(
         )
 
 
+@router.post("/search/batch", response_model=VerseBatchSearchResponse)
+async def search_verses_batch(
+    request: VerseBatchSearchRequest,
+    vector_service: VectorSearchService = Depends(get_vector_service)
+) -> VerseBatchSearchResponse:
+    """
+    Search for relevant verses for several queries in a single request.
+    
+    All queries are encoded in one batch and scored together, which is much
+    cheaper than issuing one `/verses/search` call per query.
+    
+    - **queries**: Texts to search for (1-100 queries)
+    - **emotions**: Optional emotion per query for theme-based re-ranking
+      (must match the number of queries; use null to skip re-ranking for a query)
+    - **top_k**: Number of verses to return per query (1-20, default: 5)
+    - **mode**: Optional retrieval mode ("semantic", "lexical" or "hybrid")
+    
+    Returns one search result per query, in the same order as the queries.
+    """
+    if request.emotions is not None and len(request.emotions) != len(request.queries):
+        raise HTTPException(
+            status_code=400,
+            detail="Number of emotions must match number of queries"
+        )
+    
+    try:
+        emotions = request.emotions or [None] * len(request.queries)
+        
+        results_data = vector_service.search_verses_batch(
+            queries=request.queries,
+            emotions=emotions,
+            top_k=request.top_k,
+            mode=request.mode
+        )
+        
+        results = [
+            VerseSearchResponse(
+                verses=[VerseSearchResult(**verse) for verse in verses_data],
+                query=query,
+                emotion=emotion
+            )
+            for query, emotion, verses_data in zip(request.queries, emotions, results_data)
+        ]
+        
+        return VerseBatchSearchResponse(results=results)
+        
+    except Exception as e:
+        logger.error(f"Error in batch verse search endpoint: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Unable to search verses. Please try again later."
+        )
+
+
 @router.get("/random", response_model=VerseMetadataResponse)
 async def get_random_verse(
-    vector_service: VectorSearchService = Depends(get_vector_service)
+    response: Response,
+    catalog: VerseCatalog = Depends(get_verse_catalog)
 ) -> VerseMetadataResponse:
     """
     Get a random verse from the Bhagavad Gita.
     
     Returns a randomly selected verse with complete metadata including
     Sanskrit text, transliteration, English meaning, and chapter/verse numbers.
-    Uses ChromaDB as primary source with Supabase as future enhancement.
+    Picked from the in-process verse catalog (no database or model access).
     """
     try:
-        # Try Supabase first if configured
-        try:
-            from app.services.supabase_service import get_supabase_service
-            supabase_service = get_supabase_service()
-            verse_data = supabase_service.get_random_verse()
-            if verse_data:
-                return VerseMetadataResponse(**verse_data)
-        except Exception as supabase_error:
-            logger.warning(f"Supabase unavailable, falling back to ChromaDB: {supabase_error}")
-        
-        # Fallback to ChromaDB
-        verse_data = vector_service.get_random_verse()
+        verse_data = catalog.random_verse()
         
         if verse_data is None:
             raise HTTPException(
@@ -112,6 +144,7 @@ async def get_random_verse(
                 detail="No verses available"
             )
         
+        response.headers["Cache-Control"] = "no-store"
         return VerseMetadataResponse(**verse_data)
         
     except HTTPException:
@@ -125,6 +158,61 @@ async def get_random_verse(
         )
 
 
+@router.get("/daily", response_model=VerseMetadataResponse)
+async def get_daily_verse(
+    response: Response,
+    seed: Optional[str] = Query(None, max_length=128, description="Optional seed (e.g., user ID) for a personal verse of the day"),
+    if_none_match: Optional[str] = Header(None),
+    catalog: VerseCatalog = Depends(get_verse_catalog)
+) -> VerseMetadataResponse:
+    """
+    Get the verse of the day.
+    
+    The verse is picked deterministically from the current UTC date and the
+    optional seed, so it stays the same for the whole day. The response has
+    `ETag` and `Cache-Control` headers valid until the next UTC midnight, and
+    requests with a matching `If-None-Match` get `304 Not Modified`.
+    
+    - **seed**: Optional seed for a personal verse of the day
+    """
+    try:
+        now = datetime.now(timezone.utc)
+        today = now.date()
+        verse_data = catalog.daily_verse(today, seed)
+        
+        if verse_data is None:
+            raise HTTPException(
+                status_code=404,
+                detail="No verses available"
+            )
+        
+        tomorrow = datetime.combine(today + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc)
+        etag_source = f"{today.isoformat()}:{seed or ''}:{verse_data['id']}"
+        etag = f'"{hashlib.sha256(etag_source.encode("utf-8")).hexdigest()[:32]}"'
+        cache_headers = {
+            "ETag": etag,
+            # Seeded (personal) verses must not be stored by shared caches
+            "Cache-Control": f"{'private' if seed else 'public'}, max-age={max(0, int((tomorrow - now).total_seconds()))}",
+            "Expires": tomorrow.strftime("%a, %d %b %Y %H:%M:%S GMT")
+        }
+        
+        if if_none_match and etag in [tag.strip() for tag in if_none_match.split(",")]:
+            return Response(status_code=304, headers=cache_headers)
+        
+        response.headers.update(cache_headers)
+        return VerseMetadataResponse(**verse_data)
+        
+    except HTTPException:
+        # Re-raise HTTP exceptions
+        raise
+    except Exception as e:
+        logger.error(f"Error retrieving daily verse: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail="Unable to retrieve daily verse. Please try again later."
+        )
+
+
 @router.get("/health")
 async def verse_service_health(
     vector_service: VectorSearchService = Depends(get_vector_service)
@@ -164,7 +252,8 @@ async def verse_service_health(
                 "chromadb": {
                     "status": "healthy" if chroma_healthy else "unhealthy",
                     "verses_count": chroma_count,
-                    "purpose": "Semantic search"
+                    "purpose": "Semantic search",
+                    "caches": vector_service.get_cache_stats()
                 },
                 "supabase": {
                     "status": "healthy" if supabase_healthy else "unhealthy",
@@ -185,7 +274,7 @@ async def verse_service_health(
 @router.get("/{verse_id}", response_model=VerseMetadataResponse)
 async def get_verse_by_id(
     verse_id: str,
-    vector_service: VectorSearchService = Depends(get_vector_service)
+    catalog: VerseCatalog = Depends(get_verse_catalog)
 ) -> VerseMetadataResponse:
     """
     Retrieve a specific verse by its ID.
@@ -194,20 +283,10 @@ async def get_verse_by_id(
     
     Returns the complete verse data including Sanskrit text, transliteration,
     English and Hindi meanings, and word-by-word meaning.
-    Tries ChromaDB first, then falls back to Supabase.
+    Served from the in-process verse catalog (no database round trip).
     """
     try:
-        # Try ChromaDB first (for consistency with search)
-        verse_data = vector_service.get_verse_by_id(verse_id)
-        
-        # If not found in ChromaDB, try Supabase as fallback
-        if verse_data is None:
-            try:
-                from app.services.supabase_service import get_supabase_service
-                supabase_service = get_supabase_service()
-                verse_data = supabase_service.get_verse_by_id(verse_id)
-            except Exception as supabase_error:
-                logger.warning(f"Supabase fallback failed: {supabase_error}")
+        verse_data = catalog.get(verse_id)
         
         if verse_data is None:
             raise HTTPException(
@@ -230,14 +309,16 @@ async def get_verse_by_id(
 
 @router.get("/chapter/{chapter_num}")
 async def get_verses_by_chapter(
-    chapter_num: int
+    chapter_num: int,
+    catalog: VerseCatalog = Depends(get_verse_catalog)
 ) -> dict:
     """
     Get all verses from a specific chapter.
     
     - **chapter_num**: Chapter number (1-18)
     
-    Returns all verses from the specified chapter with complete metadata.
+    Returns all verses from the specified chapter with complete metadata,
+    ordered by verse number. Served from the in-process verse catalog.
     """
     try:
         if chapter_num < 1 or chapter_num > 18:
@@ -246,17 +327,7 @@ async def get_verses_by_chapter(
                 detail="Chapter number must be between 1 and 18"
             )
         
-        # Try Supabase for chapter verses
-        try:
-            from app.services.supabase_service import get_supabase_service
-            supabase_service = get_supabase_service()
-            verses_data = supabase_service.get_verses_by_chapter(chapter_num)
-        except Exception as supabase_error:
-            logger.warning(f"Supabase unavailable for chapter query: {supabase_error}")
-            raise HTTPException(
-                status_code=503,
-                detail="Chapter verse lookup temporarily unavailable. Please configure Supabase."
-            )
+        verses_data = catalog.get_chapter(chapter_num)
         
         verses = [VerseMetadataResponse(**verse) for verse in verses_data]
         
@@ -0,0 +1,135 @@
+from typing import Any, Callable, Dict, List, Optional
+import asyncio
+import threading
+import time
+
+
+class MicroBatcher:
+    """
+    Collects concurrent async requests into batches for one model call.
+    
+    Callers await submit(item). A single worker task takes the first queued
+    item, waits up to max_wait_ms for more (or until max_batch_size items are
+    collected), runs batch_fn on the whole batch in a worker thread and
+    resolves each caller's future with its own result. While a batch runs,
+    new requests queue up and form the next batch, so batch sizes grow with
+    concurrency.
+    """
+    
+    def __init__(
+        self,
+        batch_fn: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 16,
+        max_wait_ms: float = 5.0
+    ):
+        """
+        Initialize the batcher.
+        
+        Args:
+            batch_fn: Blocking function mapping a list of items to a list of
+                results (same length and order)
+            max_batch_size: Maximum number of items per batch
+            max_wait_ms: Maximum time to wait for more items after the first one
+        """
+        self.batch_fn = batch_fn
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait_seconds = max(0.0, max_wait_ms) / 1000
+        
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker: Optional[asyncio.Task] = None
+        self._lock = threading.Lock()
+        
+        self.batches = 0
+        self.items = 0
+        self.max_queue_depth = 0
+        self.last_batch_size = 0
+        self.last_batch_ms = 0.0
+        self.total_batch_ms = 0.0
+    
+    def _ensure_worker(self) -> asyncio.Queue:
+        """Start the worker task on the running event loop if needed."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._loop is not loop or self._worker is None or self._worker.done():
+                self._loop = loop
+                self._queue = asyncio.Queue()
+                self._worker = loop.create_task(self._run(self._queue))
+            return self._queue
+    
+    async def submit(self, item: Any) -> Any:
+        """
+        Queue an item and wait for its result.
+        
+        Args:
+            item: Input for batch_fn
+        
+        Returns:
+            The result batch_fn produced for this item
+        """
+        queue = self._ensure_worker()
+        future = asyncio.get_running_loop().create_future()
+        queue.put_nowait((item, future))
+        self.max_queue_depth = max(self.max_queue_depth, queue.qsize())
+        return await future
+    
+    async def _run(self, queue: asyncio.Queue) -> None:
+        """Worker loop: collect a batch, run it in a thread, fan results out."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await queue.get()]
+            deadline = loop.time() + self.max_wait_seconds
+            
+            while len(batch) < self.max_batch_size:
+                if not queue.empty():
+                    batch.append(queue.get_nowait())
+                    continue
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            items = [item for item, _ in batch]
+            start = time.perf_counter()
+            try:
+                results = await loop.run_in_executor(None, self.batch_fn, items)
+                if len(results) != len(items):
+                    raise RuntimeError(f"Batch function returned {len(results)} results for {len(items)} items")
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            else:
+                for (_, future), result in zip(batch, results):
+                    if not future.done():
+                        future.set_result(result)
+            
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self.batches += 1
+            self.items += len(batch)
+            self.last_batch_size = len(batch)
+            self.last_batch_ms = elapsed_ms
+            self.total_batch_ms += elapsed_ms
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get batching statistics.
+        
+        Returns:
+            Dictionary with settings, current and peak queue depth, and batch counters
+        """
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_seconds * 1000,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue_depth": self.max_queue_depth,
+            "batches": self.batches,
+            "items": self.items,
+            "avg_batch_size": round(self.items / self.batches, 2) if self.batches else 0.0,
+            "last_batch_size": self.last_batch_size,
+            "last_batch_ms": round(self.last_batch_ms, 2),
+            "avg_batch_ms": round(self.total_batch_ms / self.batches, 2) if self.batches else 0.0
+        }
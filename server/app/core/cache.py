@@ -0,0 +1,110 @@
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional
+import threading
+import time
+
+
+class TTLCache:
+    """
+    Thread-safe bounded LRU cache with an optional per-entry time-to-live.
+    
+    Least recently used entries are evicted once max_size is reached, and
+    entries older than ttl_seconds are treated as misses and dropped.
+    Hit, miss, eviction and expiration counters are kept for monitoring.
+    """
+    
+    def __init__(self, max_size: int = 1024, ttl_seconds: Optional[float] = None):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_size: Maximum number of entries (0 disables caching)
+            ttl_seconds: Entry lifetime in seconds (None or 0 means no expiry)
+        """
+        self.max_size = max(0, max_size)
+        self.ttl_seconds = ttl_seconds or None
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+    
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Get a cached value and mark it as recently used.
+        
+        Args:
+            key: Cache key
+            default: Value returned on a miss
+        
+        Returns:
+            Cached value or default
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.monotonic():
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return default
+            
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+    
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Store a value, evicting the least recently used entry if full.
+        
+        Args:
+            key: Cache key
+            value: Value to cache
+        """
+        if self.max_size == 0:
+            return
+        
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else None
+        
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._entries[key] = (value, expires_at)
+            
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+    
+    def clear(self) -> None:
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get cache statistics.
+        
+        Returns:
+            Dictionary with size, limits, counters and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+            }
@@ -28,20 +28,83 @@ class Settings(BaseSettings):
     # ChromaDB
     CHROMA_DB_PATH: str = os.getenv("CHROMA_DB_PATH", "./chroma_db")
     
+    # Verse data and precomputed embedding artifacts (see scripts/build_verse_embeddings.py)
+    VERSE_CSV_PATH: str = os.getenv("VERSE_CSV_PATH", "Bhagwad_Gita.csv")
+    VERSE_ARTIFACT_DIR: str = os.getenv("VERSE_ARTIFACT_DIR", "./artifacts")
+    
+    # Vector Search Settings
+    # "numpy" keeps an in-memory exact-search index (Chroma is only used for persistence),
+    # "chroma" queries the Chroma HNSW index on every search
+    VECTOR_SEARCH_ENGINE: str = os.getenv("VECTOR_SEARCH_ENGINE", "numpy")
+    # "semantic" (dense only), "lexical" (BM25 only, no model) or "hybrid" (both, fused by RRF);
+    # stays "semantic" until hybrid has been evaluated on real queries
+    VECTOR_SEARCH_MODE: str = os.getenv("VECTOR_SEARCH_MODE", "semantic")
+    HYBRID_RRF_K: int = int(os.getenv("HYBRID_RRF_K", "60"))
+    # Weight of the BM25 ranking in the fusion (dense = 1.0); below ~0.9 lexical-only
+    # hits rank after the dense candidates and BM25 mostly re-orders them
+    HYBRID_LEXICAL_WEIGHT: float = float(os.getenv("HYBRID_LEXICAL_WEIGHT", "0.5"))
+    QUERY_EMBEDDING_CACHE_SIZE: int = int(os.getenv("QUERY_EMBEDDING_CACHE_SIZE", "2048"))
+    QUERY_EMBEDDING_CACHE_TTL: int = int(os.getenv("QUERY_EMBEDDING_CACHE_TTL", "86400"))  # seconds
+    SEARCH_RESULT_CACHE_SIZE: int = int(os.getenv("SEARCH_RESULT_CACHE_SIZE", "1024"))
+    SEARCH_RESULT_CACHE_TTL: int = int(os.getenv("SEARCH_RESULT_CACHE_TTL", "3600"))  # seconds
+    
     # Firebase
     FIREBASE_CREDENTIALS_PATH: str = os.getenv("FIREBASE_CREDENTIALS_PATH", "")
     
     # Model Settings
     EMOTION_MODEL: str = "SamLowe/roberta-base-go_emotions-onnx"
     EMOTION_MODEL_FILE: str = "onnx/model_quantized.onnx"
-    EMBEDDING_MODEL: str = "all-mpnet-base-v2"
+    # "onnxruntime" (direct InferenceSession) or "pipeline" (transformers pipeline)
+    EMOTION_BACKEND: str = os.getenv("EMOTION_BACKEND", "onnxruntime")
+    EMOTION_ORT_THREADS: int = int(os.getenv("EMOTION_ORT_THREADS", "0"))  # 0 = onnxruntime default
+    # JSON keyword lexicon for emotion boosting (empty = built-in grief/anger lexicon)
+    EMOTION_LEXICON_PATH: str = os.getenv("EMOTION_LEXICON_PATH", "")
+    # Long inputs: split into overlapping token windows instead of truncating at 512 tokens
+    EMOTION_CHUNKING: bool = os.getenv("EMOTION_CHUNKING", "true").lower() == "true"
+    EMOTION_CHUNK_STRIDE: int = int(os.getenv("EMOTION_CHUNK_STRIDE", "128"))  # overlap in tokens
+    EMOTION_CHUNK_AGGREGATION: str = os.getenv("EMOTION_CHUNK_AGGREGATION", "max")  # "max" or "mean"
+    # Multi-task model (scripts/build_multitask_model.py): intent + emotions from one forward pass
+    MULTITASK_ENABLED: bool = os.getenv("MULTITASK_ENABLED", "false").lower() == "true"
+    MULTITASK_MODEL: str = os.getenv("MULTITASK_MODEL", "./models/multitask_onnx")
+    MULTITASK_MODEL_FILE: str = os.getenv("MULTITASK_MODEL_FILE", "model.onnx")  # "model_quantized.onnx" for int8
+    EMBEDDING_MODEL: str = os.getenv("EMBEDDING_MODEL", "all-mpnet-base-v2")
+    EMBEDDING_BACKEND: str = os.getenv("EMBEDDING_BACKEND", "torch")  # "torch" or "onnx"
+    # ONNX file in the model repo or a local path; use "onnx/model_qint8_avx512_vnni.onnx" for int8
+    EMBEDDING_MODEL_FILE: str = os.getenv("EMBEDDING_MODEL_FILE", "onnx/model.onnx")
     LLM_MODEL: str = "gemini-1.5-flash"  # Stable model for consistent responses
+    # Zero-shot NLI model name, or "embedding" for prototype scoring on the retrieval encoder
     INTENT_MODEL: str = os.getenv("INTENT_MODEL", "facebook/bart-large-mnli")
+    # Zero-shot backend: "onnx" (exported NLI model, see scripts/export_intent_nli.py) or "pipeline"
+    INTENT_ZERO_SHOT_BACKEND: str = os.getenv("INTENT_ZERO_SHOT_BACKEND", "onnx")
+    INTENT_NLI_ONNX_MODEL: str = os.getenv("INTENT_NLI_ONNX_MODEL", "./models/intent_nli_onnx")
+    INTENT_NLI_ONNX_FILE: str = os.getenv("INTENT_NLI_ONNX_FILE", "model_quantized.onnx")  # "model.onnx" for fp32
+    INTENT_NLI_ORT_THREADS: int = int(os.getenv("INTENT_NLI_ORT_THREADS", "0"))  # 0 = onnxruntime default
     
     # Conversation Settings
     CONVERSATION_MEMORY_WINDOW: int = 5
     EMOTION_CONFIDENCE_THRESHOLD: float = 0.15  # Lower threshold for better emotion detection
+    # Opt-in micro-batching of concurrent emotion detection requests
+    EMOTION_BATCHING: bool = os.getenv("EMOTION_BATCHING", "false").lower() == "true"
+    EMOTION_BATCH_MAX_SIZE: int = int(os.getenv("EMOTION_BATCH_MAX_SIZE", "16"))
+    EMOTION_BATCH_MAX_WAIT_MS: float = float(os.getenv("EMOTION_BATCH_MAX_WAIT_MS", "5"))
     INTENT_CONFIDENCE_THRESHOLD: float = float(os.getenv("INTENT_CONFIDENCE_THRESHOLD", "0.6"))
+    # Embedding intent classifier (INTENT_MODEL="embedding")
+    INTENT_EMBEDDING_TEMPERATURE: float = float(os.getenv("INTENT_EMBEDDING_TEMPERATURE", "0.05"))
+    INTENT_EMBEDDING_CONFIDENCE_THRESHOLD: float = float(os.getenv("INTENT_EMBEDDING_CONFIDENCE_THRESHOLD", "0.5"))
+    INTENT_EXAMPLES_PATH: str = os.getenv("INTENT_EXAMPLES_PATH", "")  # extra labelled examples (JSON)
+    # Intent cascade: rules -> lexical -> embedding -> zero-shot, stopping at the first confident tier
+    INTENT_CASCADE: bool = os.getenv("INTENT_CASCADE", "false").lower() == "true"
+    # Platt-calibrated tier scores and exit thresholds (scripts/compare_intent_classifiers.py --calibrate)
+    INTENT_CASCADE_CALIBRATION_PATH: str = os.getenv("INTENT_CASCADE_CALIBRATION_PATH", "")
+    # Raw-score exit thresholds, used only without a calibration file
+    INTENT_LEXICAL_EXIT_CONFIDENCE: float = float(os.getenv("INTENT_LEXICAL_EXIT_CONFIDENCE", "0.8"))
+    INTENT_EMBEDDING_EXIT_CONFIDENCE: float = float(os.getenv("INTENT_EMBEDDING_EXIT_CONFIDENCE", "0.85"))
+    # Distilled intent head (scripts/distill_intent_head.py), a cascade tier before the embedding prototypes
+    INTENT_HEAD_PATH: str = os.getenv("INTENT_HEAD_PATH", "")
+    INTENT_HEAD_EXIT_CONFIDENCE: float = float(os.getenv("INTENT_HEAD_EXIT_CONFIDENCE", "0.9"))
+    
+    # Startup: load and exercise all models in parallel threads before /ready reports ready
+    MODEL_WARMUP: bool = os.getenv("MODEL_WARMUP", "true").lower() == "true"
     
     class Config:
         case_sensitive = True
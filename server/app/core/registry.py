@@ -0,0 +1,135 @@
+from typing import Any, Callable, Dict, Optional
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def get_process_rss() -> Optional[int]:
+    """
+    Get the resident set size of the current process.
+    
+    Returns:
+        RSS in bytes, or None where /proc is unavailable
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+class ModelRegistry:
+    """
+    Thread-safe, process-wide owner of heavy models and services.
+    
+    Each registered factory runs at most once per process, even under
+    concurrent first requests: lookups take a per-name lock with
+    double-checked locking, so loading one model never blocks lookups of
+    models that are already loaded. Load time and the RSS growth observed
+    while loading are recorded per name (RSS deltas are approximate when
+    several models load at the same time).
+    """
+    
+    def __init__(self):
+        self._factories: Dict[str, Callable[[], Any]] = {}
+        self._instances: Dict[str, Any] = {}
+        self._locks: Dict[str, threading.Lock] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+    
+    def register(self, name: str, factory: Callable[[], Any]) -> None:
+        """
+        Register a factory for a named model or service.
+        
+        Re-registering a name replaces the factory but keeps an instance
+        that is already loaded.
+        
+        Args:
+            name: Registry name (e.g., "sentence_encoder")
+            factory: Zero-argument callable creating the object
+        """
+        with self._lock:
+            self._factories[name] = factory
+            self._locks.setdefault(name, threading.Lock())
+    
+    def get(self, name: str) -> Any:
+        """
+        Get a model or service, creating it on first use.
+        
+        Args:
+            name: Registry name
+        
+        Returns:
+            The shared instance
+        
+        Raises:
+            KeyError: If no factory is registered under name
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        
+        with self._lock:
+            if name not in self._factories:
+                raise KeyError(f"No model registered under '{name}'")
+            factory = self._factories[name]
+            name_lock = self._locks[name]
+        
+        with name_lock:
+            instance = self._instances.get(name)
+            if instance is not None:
+                return instance
+            
+            rss_before = get_process_rss()
+            start = time.perf_counter()
+            try:
+                instance = factory()
+            except Exception as e:
+                self._stats[name] = {"loaded": False, "error": str(e)}
+                raise
+            
+            load_seconds = time.perf_counter() - start
+            rss_after = get_process_rss()
+            rss_delta = rss_after - rss_before if rss_before is not None and rss_after is not None else None
+            
+            self._stats[name] = {
+                "loaded": True,
+                "load_seconds": round(load_seconds, 3),
+                "rss_delta_mb": round(rss_delta / (1024 * 1024), 1) if rss_delta is not None else None,
+                "loaded_at": time.time()
+            }
+            self._instances[name] = instance
+            logger.info(f"Loaded {name} in {load_seconds:.2f}s")
+            return instance
+    
+    def is_loaded(self, name: str) -> bool:
+        """Check whether a model or service has been created."""
+        return name in self._instances
+    
+    def stats(self) -> Dict[str, Any]:
+        """
+        Get per-model load statistics.
+        
+        Returns:
+            Dictionary with the process RSS and, per registered name, whether
+            it is loaded, its load time and the RSS growth while loading
+        """
+        with self._lock:
+            names = sorted(self._factories)
+        
+        rss = get_process_rss()
+        return {
+            "process_rss_mb": round(rss / (1024 * 1024), 1) if rss is not None else None,
+            "models": {
+                name: dict(self._stats.get(name, {"loaded": False}))
+                for name in names
+            }
+        }
+
+
+# Process-wide registry instance
+model_registry = ModelRegistry()
@@ -1,12 +1,88 @@
+from contextlib import asynccontextmanager
+from concurrent.futures import ThreadPoolExecutor
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 from app.core.config import settings
+from app.core.registry import model_registry
 from app.api import api_router
+from app.services.casual_chat import get_casual_chat_service
+from app.services.emotion_detection import get_emotion_service
+from app.services.intent_classification import get_intent_service
+from app.services.multitask_inference import get_multitask_service
+from app.services.reflection_generation import get_reflection_service
+from app.services.vector_search import get_vector_service
+from app.services.verse_catalog import get_verse_catalog
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+# Warmup state reported by /ready
+warmup_state = {"ready": False, "started_at": None, "duration_seconds": None, "models": {}}
+
+# Model warmups: each loads a model through its registry getter and runs one
+# inference so ONNX Runtime / torch graph setup happens before real traffic
+WARMUP_TASKS = {
+    "verse_catalog": lambda: get_verse_catalog().get("BG2.47"),
+    "vector_search": lambda: get_vector_service().search_verses("How do I act without attachment to results?", top_k=1),
+    "emotion_detection": lambda: get_emotion_service().detect_emotion("I feel anxious about tomorrow"),
+    "intent_classification": lambda: get_intent_service().warm_up(),
+    "casual_chat": get_casual_chat_service,
+    "reflection_generation": get_reflection_service,
+}
+if settings.MULTITASK_ENABLED:
+    # The single-task intent and emotion models are only loaded if the multi-task model fails
+    del WARMUP_TASKS["emotion_detection"], WARMUP_TASKS["intent_classification"]
+    WARMUP_TASKS["multitask_inference"] = lambda: get_multitask_service().analyze("I feel lost about my purpose")
+
+
+def _run_warmup_task(name: str, task) -> dict:
+    """Run one warmup task and report its outcome."""
+    start = time.perf_counter()
+    try:
+        task()
+        return {"status": "ready", "seconds": round(time.perf_counter() - start, 3)}
+    except Exception as e:
+        logger.warning(f"Warmup of {name} failed: {e}")
+        return {"status": "failed", "seconds": round(time.perf_counter() - start, 3), "error": str(e)}
+
+
+def warm_up_models() -> None:
+    """Load and exercise all models concurrently, then mark the app ready."""
+    warmup_state["started_at"] = time.time()
+    start = time.perf_counter()
+    
+    with ThreadPoolExecutor(max_workers=len(WARMUP_TASKS), thread_name_prefix="warmup") as executor:
+        futures = {
+            name: executor.submit(_run_warmup_task, name, task)
+            for name, task in WARMUP_TASKS.items()
+        }
+        for name, future in futures.items():
+            warmup_state["models"][name] = future.result()
+    
+    warmup_state["duration_seconds"] = round(time.perf_counter() - start, 3)
+    warmup_state["ready"] = True
+    logger.info(f"Model warmup finished in {warmup_state['duration_seconds']}s")
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start model warmup in the background; /ready flips once it is done."""
+    if settings.MODEL_WARMUP:
+        asyncio.get_running_loop().run_in_executor(None, warm_up_models)
+    else:
+        warmup_state["ready"] = True
+    
+    yield
+
 
 app = FastAPI(
     title="GeetaManthan+ API",
     description="Emotionally intelligent spiritual companion API",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 # Configure CORS
@@ -28,3 +104,17 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 503 until all models are loaded and warmed up."""
+    if not warmup_state["ready"]:
+        return JSONResponse(status_code=503, content={"status": "warming_up", **warmup_state})
+    
+    failed = [name for name, result in warmup_state["models"].items() if result["status"] != "ready"]
+    return {"status": "degraded" if failed else "ready", "failed": failed, **warmup_state}
+
+@app.get("/health/models")
+async def model_health():
+    """Report which models are loaded, their load times and memory growth."""
+    return model_registry.stats()
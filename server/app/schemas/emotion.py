@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import List
+from typing import Annotated, List
 
 
 class EmotionData(BaseModel):
@@ -45,4 +45,17 @@ class EmotionResponse(BaseModel):
                     "color": "#FEF3C7"
                 }
             }
-        }
\ No newline at end of file
+        }
+
+
+class EmotionBatchRequest(BaseModel):
+    """Request model for batch emotion detection."""
+    texts: List[Annotated[str, Field(min_length=1, max_length=5000)]] = Field(
+        ..., min_length=1, max_length=256, description="Texts to analyze for emotions (1-256 texts)"
+    )
+    threshold: float = Field(0.3, ge=0.0, le=1.0, description="Minimum confidence threshold")
+
+
+class EmotionBatchResponse(BaseModel):
+    """Response model for batch emotion detection."""
+    results: List[EmotionResponse] = Field(..., description="Detection result per text, in request order")
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field
-from typing import Optional, List
+from typing import Annotated, Optional, List, Literal
 
 
 class VerseMetadataBase(BaseModel):
@@ -21,15 +21,28 @@ class VerseMetadataResponse(VerseMetadataBase):
 
 class VerseSearchResult(VerseMetadataBase):
     similarity_score: Optional[float] = None
+    rrf_score: Optional[float] = Field(None, description="Hybrid mode only: fused rank score the results are sorted by (similarity_score is then not monotonic)")
 
 
 class VerseSearchRequest(BaseModel):
     query: str = Field(..., min_length=1, max_length=5000, description="Text to search for relevant verses")
     emotion: Optional[str] = Field(None, description="Detected emotion for re-ranking")
     top_k: int = Field(5, ge=1, le=20, description="Number of verses to return")
+    mode: Optional[Literal["semantic", "lexical", "hybrid"]] = Field(None, description="Retrieval mode (defaults to the server's VECTOR_SEARCH_MODE)")
 
 
 class VerseSearchResponse(BaseModel):
     verses: List[VerseSearchResult]
     query: str
-    emotion: Optional[str] = None
\ No newline at end of file
+    emotion: Optional[str] = None
+
+
+class VerseBatchSearchRequest(BaseModel):
+    queries: List[Annotated[str, Field(min_length=1, max_length=5000)]] = Field(..., min_length=1, max_length=100, description="Texts to search for relevant verses")
+    emotions: Optional[List[Optional[str]]] = Field(None, description="Detected emotion per query for re-ranking (same length as queries)")
+    top_k: int = Field(5, ge=1, le=20, description="Number of verses to return per query")
+    mode: Optional[Literal["semantic", "lexical", "hybrid"]] = Field(None, description="Retrieval mode (defaults to the server's VECTOR_SEARCH_MODE)")
+
+
+class VerseBatchSearchResponse(BaseModel):
+    results: List[VerseSearchResponse]
@@ -0,0 +1,150 @@
+"""
+Per-request analysis of a user message.
+
+The /chat pipeline used to hand the raw text to every stage, so each stage
+normalized, hashed and encoded it again. AnalyzedInput does that work once
+per request and lazily: the normalized text and fingerprint are computed
+up front, while the sentence embedding and token count are computed on
+first access and then shared by intent classification, verse search,
+caches and logging.
+"""
+from typing import Callable, Dict, Optional
+import numpy as np
+import hashlib
+import re
+import unicodedata
+
+
+def normalize_query_text(text: str) -> str:
+    """
+    Normalize a query so trivial differences don't matter.
+    
+    Unicode form, case, repeated whitespace and leading/trailing punctuation
+    are normalized.
+    
+    Args:
+        text: Raw query text
+    
+    Returns:
+        Normalized text
+    """
+    normalized = unicodedata.normalize("NFKC", text).lower()
+    normalized = re.sub(r"\s+", " ", normalized)
+    return normalized.strip(" \t\n.,!?;:'\"")
+
+
+def fingerprint_normalized(normalized_text: str) -> str:
+    """
+    Hash already-normalized query text into a cache key.
+    
+    Args:
+        normalized_text: Output of normalize_query_text
+    
+    Returns:
+        Hex digest of the text
+    """
+    return hashlib.sha1(normalized_text.encode("utf-8")).hexdigest()
+
+
+def query_fingerprint(text: str) -> str:
+    """
+    Build a cache key for a query that ignores trivial differences.
+    
+    "I feel anxious about my exams!" and "i feel  anxious about my exams"
+    share a fingerprint.
+    
+    Args:
+        text: Raw query text
+    
+    Returns:
+        Hex digest of the normalized text
+    """
+    return fingerprint_normalized(normalize_query_text(text))
+
+
+class AnalyzedInput:
+    """
+    A user message with its shared, lazily computed features.
+    
+    Attributes:
+        text: Original message
+        normalized_text: Normalized message (see normalize_query_text)
+        fingerprint: Cache key of the message (see query_fingerprint)
+        word_count: Number of whitespace-separated words
+    """
+    
+    def __init__(
+        self,
+        text: str,
+        embed: Optional[Callable[[str, str], np.ndarray]] = None,
+        tokenizer=None
+    ):
+        """
+        Analyze a message.
+        
+        Args:
+            text: User message
+            embed: Function mapping (text, fingerprint) to a sentence embedding,
+                usually VectorSearchService.embed_query (optional)
+            tokenizer: Encoder tokenizer used for token_count (optional)
+        """
+        self.text = text
+        self.normalized_text = normalize_query_text(text)
+        self.fingerprint = fingerprint_normalized(self.normalized_text)
+        self.word_count = len(text.split())
+        
+        self._embed = embed
+        self._tokenizer = tokenizer
+        self._embedding: Optional[np.ndarray] = None
+        self._token_count: Optional[int] = None
+    
+    @property
+    def has_embedding(self) -> bool:
+        """Whether the embedding has already been computed."""
+        return self._embedding is not None
+    
+    @property
+    def can_embed(self) -> bool:
+        """Whether an embedding is available or can be computed."""
+        return self._embedding is not None or self._embed is not None
+    
+    @property
+    def embedding(self) -> np.ndarray:
+        """
+        Sentence embedding of the message, computed on first access.
+        
+        Raises:
+            RuntimeError: If no embedding function was provided
+        """
+        if self._embedding is None:
+            if self._embed is None:
+                raise RuntimeError("No sentence encoder available for this input")
+            self._embedding = np.asarray(self._embed(self.text, self.fingerprint), dtype=np.float32)
+        return self._embedding
+    
+    @property
+    def token_count(self) -> int:
+        """Number of encoder tokens (falls back to the word count without a tokenizer)."""
+        if self._token_count is None:
+            self._token_count = self.word_count
+            if self._tokenizer is not None:
+                try:
+                    self._token_count = len(self._tokenizer(self.text)["input_ids"])
+                except Exception:
+                    pass
+        return self._token_count
+    
+    def log_summary(self) -> Dict:
+        """
+        Describe the message for logs without including its text.
+        
+        Returns:
+            Dictionary with a short fingerprint, word and token counts and
+            whether the embedding was computed
+        """
+        return {
+            "fingerprint": self.fingerprint[:12],
+            "words": self.word_count,
+            "tokens": self.token_count,
+            "embedded": self.has_embedding
+        }
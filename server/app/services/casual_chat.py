@@ -5,8 +5,9 @@ Provides direct conversational responses without emotion detection
 or verse retrieval for greetings, small talk, and general questions.
 """
 import google.generativeai as genai
-from typing import Optional, List, Dict
+from typing import Iterator, Optional, List, Dict
 from app.core.config import settings
+from app.core.registry import model_registry
 
 
 class CasualChatService:
@@ -89,18 +90,41 @@ Keep your tone warm, humble, spiritually grounded, and divinely inviting."""
         Raises:
             Exception: If Gemini API fails
         """
+        # Same prompt and error handling as the streamed response
+        return "".join(self.stream_response(user_input, conversation_history)).strip()
+    
+    def stream_response(
+        self,
+        user_input: str,
+        conversation_history: Optional[List[Dict]] = None
+    ) -> Iterator[str]:
+        """
+        Generate casual conversational response as it is produced.
+        
+        Args:
+            user_input: User's message
+            conversation_history: Recent conversation context
+            
+        Yields:
+            Text chunks in order; joined and stripped they form the response
+            
+        Raises:
+            Exception: If Gemini API fails, possibly after some chunks
+        """
         try:
             # Build prompt with context
             prompt = self._build_prompt(user_input, conversation_history or [])
             
             # Generate response using Gemini
-            response = self.model.generate_content(prompt)
+            produced = False
+            for chunk in self.model.generate_content(prompt, stream=True):
+                if chunk.text:
+                    produced = True
+                    yield chunk.text
             
-            if not response.text:
+            if not produced:
                 raise Exception("Empty response from Gemini API")
                 
-            return response.text.strip()
-            
         except Exception as e:
             # Re-raise for caller to handle with fallback
             raise Exception(f"Gemini API error: {str(e)}")
@@ -192,13 +216,10 @@ aturally and conversationally."""
         return "🙏 Beloved seeker, I am here as your eternal companion, just as I was for Arjuna in his moment of need. Whether your heart carries joy like the morning sun or sorrow like the evening clouds, share what stirs within you. Together, we shall find the perfect verses from our sacred Gita to illuminate your path forward."
 
 
-# Singleton instance
-_casual_chat_service = None
+# Singleton instance (owned by the process-wide model registry)
+model_registry.register("casual_chat", CasualChatService)
 
 
 def get_casual_chat_service() -> CasualChatService:
     """Get or create singleton casual chat service instance."""
-    global _casual_chat_service
-    if _casual_chat_service is None:
-        _casual_chat_service = CasualChatService()
-    return _casual_chat_service
+    return model_registry.get("casual_chat")
@@ -1,7 +1,15 @@
 from transformers import AutoTokenizer, pipeline
 from optimum.onnxruntime import ORTModelForSequenceClassification
-from typing import List, Dict
+from huggingface_hub import hf_hub_download
+from typing import List, Dict, Optional, Tuple
+from pathlib import Path
+import numpy as np
+import onnxruntime as ort
+import json
+from app.core.batching import MicroBatcher
 from app.core.config import settings
+from app.core.registry import model_registry
+from app.services.emotion_lexicon import EmotionLexicon, DEFAULT_LEXICON
 
 
 class EmotionDetectionService:
@@ -10,13 +18,136 @@ class EmotionDetectionService:
     
     Uses the quantized ONNX version of SamLowe/roberta-base-go_emotions
     for significantly faster inference (~10-20x speedup for small batches).
+    By default the ONNX model runs directly on an onnxruntime
+    InferenceSession (fast tokenizer, NumPy sigmoid and thresholding);
+    the transformers pipeline is used as a fallback.
     """
     
+    # Comprehensive emotion-to-emoji-color mapping for all 28 GoEmotions
+    EMOTION_EMOJI_MAP = {
+        # Positive emotions
+        "joy": {"emoji": "😊", "color": "#FEF3C7"},
+        "admiration": {"emoji": "🤩", "color": "#FEF3C7"},
+        "approval": {"emoji": "👍", "color": "#D1FAE5"},
+        "gratitude": {"emoji": "🙏", "color": "#FEF3C7"},
+        "love": {"emoji": "❤️", "color": "#FECACA"},
+        "optimism": {"emoji": "😊", "color": "#D1FAE5"},
+        "caring": {"emoji": "🤗", "color": "#D1FAE5"},
+        "excitement": {"emoji": "🎉", "color": "#FEF3C7"},
+        "amusement": {"emoji": "😄", "color": "#FEF3C7"},
+        "pride": {"emoji": "😌", "color": "#FEF3C7"},
+        "relief": {"emoji": "😌", "color": "#D1FAE5"},
+        
+        # Ambiguous emotions
+        "desire": {"emoji": "🤔", "color": "#E0E7FF"},
+        "realization": {"emoji": "💡", "color": "#FEF3C7"},
+        "curiosity": {"emoji": "🤔", "color": "#E0E7FF"},
+        "neutral": {"emoji": "😐", "color": "#F3F4F6"},
+        
+        # Negative emotions - sadness (enhanced detection)
+        "sadness": {"emoji": "😢", "color": "#DBEAFE"},
+        "disappointment": {"emoji": "😞", "color": "#DBEAFE"},
+        "grief": {"emoji": "😭", "color": "#DBEAFE"},
+        "remorse": {"emoji": "😔", "color": "#DBEAFE"},
+        "embarrassment": {"emoji": "😳", "color": "#FEE2E2"},
+        
+        # Negative emotions - anger (enhanced detection)
+        "anger": {"emoji": "😠", "color": "#FEE2E2"},
+        "annoyance": {"emoji": "😒", "color": "#FEE2E2"},
+        "disapproval": {"emoji": "👎", "color": "#FEE2E2"},
+        "disgust": {"emoji": "🤢", "color": "#FEE2E2"},
+        
+        # Negative emotions - fear/anxiety
+        "fear": {"emoji": "😰", "color": "#EDE9FE"},
+        "nervousness": {"emoji": "😰", "color": "#E0E7FF"},
+        
+        # Confusion
+        "confusion": {"emoji": "😕", "color": "#F3F4F6"},
+        "surprise": {"emoji": "😲", "color": "#E0E7FF"},
+    }
+    
     def __init__(self):
         # Load ONNX-optimized model with fallback
         model_id = settings.EMOTION_MODEL
         file_name = settings.EMOTION_MODEL_FILE
         
+        self.session = None
+        self.classifier = None
+        self.labels: List[str] = []
+        
+        if settings.EMOTION_BACKEND == "onnxruntime":
+            try:
+                self._load_onnx_session(model_id, file_name)
+                print("✅ Loaded ONNX Runtime emotion model")
+            except Exception as e:
+                print(f"⚠️ Failed to load ONNX Runtime session: {e}")
+                print("🔄 Falling back to transformers pipeline...")
+        
+        if self.session is None:
+            self._load_pipeline(model_id, file_name)
+        
+        # Initialize fallback flag if not set
+        if not hasattr(self, 'use_sentiment_fallback'):
+            self.use_sentiment_fallback = False
+        
+        # Label order of the score matrix columns
+        if not self.labels:
+            id2label = getattr(getattr(getattr(self.classifier, 'model', None), 'config', None), 'id2label', None) or {}
+            self.labels = [id2label[i] for i in sorted(id2label)]
+        self._set_label_columns(self.labels)
+        
+        # Opt-in micro-batching of concurrent detect_emotion_async() calls
+        self.batcher = MicroBatcher(
+            self._detect_batch,
+            max_batch_size=settings.EMOTION_BATCH_MAX_SIZE,
+            max_wait_ms=settings.EMOTION_BATCH_MAX_WAIT_MS
+        ) if settings.EMOTION_BATCHING else None
+    
+    def _load_onnx_session(self, model_id: str, file_name: str) -> None:
+        """
+        Load the ONNX model into a tuned onnxruntime InferenceSession.
+        
+        Args:
+            model_id: Hub model ID or local model directory
+            file_name: ONNX file inside the model repository, or a local path
+        """
+        model_path = file_name if Path(file_name).exists() else self._get_model_file(model_id, file_name)
+        with open(self._get_model_file(model_id, "config.json")) as f:
+            id2label = json.load(f)["id2label"]
+        
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        session_options.inter_op_num_threads = 1
+        if settings.EMOTION_ORT_THREADS > 0:
+            session_options.intra_op_num_threads = settings.EMOTION_ORT_THREADS
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(model_id, use_fast=True)
+        self.session = ort.InferenceSession(
+            str(model_path),
+            sess_options=session_options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self.max_length = min(self.tokenizer.model_max_length, 512)
+        self.labels = [id2label[str(i)] for i in range(len(id2label))]
+    
+    @staticmethod
+    def _get_model_file(model_id: str, file_name: str) -> str:
+        """Get a file from a local model directory or the Hugging Face Hub."""
+        local_path = Path(model_id) / file_name
+        if local_path.exists():
+            return str(local_path)
+        return hf_hub_download(model_id, file_name)
+    
+    def _load_pipeline(self, model_id: str, file_name: str) -> None:
+        """
+        Load the emotion model as a transformers pipeline (with fallbacks).
+        
+        Args:
+            model_id: Hub model ID
+            file_name: ONNX file inside the model repository
+        """
         try:
             # Try to load ONNX model first
             model = ORTModelForSequenceClassification.from_pretrained(
@@ -57,66 +188,12 @@ class EmotionDetectionService:
                 )
                 print("✅ Loaded basic sentiment model as last resort")
                 self.use_sentiment_fallback = True
-        
-        # Initialize fallback flag if not set
-        if not hasattr(self, 'use_sentiment_fallback'):
-            self.use_sentiment_fallback = False
-            
-
-        
-        # Comprehensive emotion-to-emoji-color mapping for all 28 GoEmotions
-        self.emotion_emoji_map = {
-            # Positive emotions
-            "joy": {"emoji": "😊", "color": "#FEF3C7"},
-            "admiration": {"emoji": "🤩", "color": "#FEF3C7"},
-            "approval": {"emoji": "👍", "color": "#D1FAE5"},
-            "gratitude": {"emoji": "🙏", "color": "#FEF3C7"},
-            "love": {"emoji": "❤️", "color": "#FECACA"},
-            "optimism": {"emoji": "😊", "color": "#D1FAE5"},
-            "caring": {"emoji": "🤗", "color": "#D1FAE5"},
-            "excitement": {"emoji": "🎉", "color": "#FEF3C7"},
-            "amusement": {"emoji": "😄", "color": "#FEF3C7"},
-            "pride": {"emoji": "😌", "color": "#FEF3C7"},
-            "relief": {"emoji": "😌", "color": "#D1FAE5"},
-            
-            # Ambiguous emotions
-            "desire": {"emoji": "🤔", "color": "#E0E7FF"},
-            "realization": {"emoji": "💡", "color": "#FEF3C7"},
-            "curiosity": {"emoji": "🤔", "color": "#E0E7FF"},
-            "neutral": {"emoji": "😐", "color": "#F3F4F6"},
-            
-            # Negative emotions - sadness (enhanced detection)
-            "sadness": {"emoji": "😢", "color": "#DBEAFE"},
-            "disappointment": {"emoji": "😞", "color": "#DBEAFE"},
-            "grief": {"emoji": "😭", "color": "#DBEAFE"},
-            "remorse": {"emoji": "😔", "color": "#DBEAFE"},
-            "embarrassment": {"emoji": "😳", "color": "#FEE2E2"},
-            
-            # Negative emotions - anger (enhanced detection)
-            "anger": {"emoji": "😠", "color": "#FEE2E2"},
-            "annoyance": {"emoji": "😒", "color": "#FEE2E2"},
-            "disapproval": {"emoji": "👎", "color": "#FEE2E2"},
-            "disgust": {"emoji": "🤢", "color": "#FEE2E2"},
-            
-            # Negative emotions - fear/anxiety
-            "fear": {"emoji": "😰", "color": "#EDE9FE"},
-            "nervousness": {"emoji": "😰", "color": "#E0E7FF"},
-            
-            # Confusion
-            "confusion": {"emoji": "😕", "color": "#F3F4F6"},
-            "surprise": {"emoji": "😲", "color": "#E0E7FF"},
-        }
-        
-        # Enhanced emotion detection for grief/loss keywords
-        self.grief_keywords = [
-            'lost', 'death', 'died', 'father', 'mother', 'pet', 'grief', 'mourning',
-            'funeral', 'passed away', 'gone', 'miss', 'lonely', 'empty', 'devastated'
-        ]
-        
-        self.anger_keywords = [
-            'angry', 'mad', 'furious', 'rage', 'hate', 'frustrated', 'annoyed',
-            'pissed', 'irritated', 'upset', 'livid', 'outraged'
-        ]
+    
+    def _set_label_columns(self, labels: List[str]) -> None:
+        """Precompute per-label metadata and the keyword lexicon for the label order."""
+        # Enhanced emotion detection for grief/loss and anger keywords
+        self.lexicon = load_emotion_lexicon(labels)
+        self._label_meta = label_metadata(labels)
     
     def detect_emotion(
         self, 
@@ -152,91 +229,249 @@ class EmotionDetectionService:
         """
         try:
             # Run inference
-            results = self.classifier([text])[0]
+            labels, scores = self._predict_scores([text])
+            return self._build_emotions(text, labels, scores[0], threshold)
             
-            # Enhanced emotion detection with keyword boosting
-            text_lower = text.lower()
+        except Exception as e:
+            # Fallback to neutral emotion on error
+            print(f"Error in emotion detection: {e}")
+            return [self._neutral_emotion()]
+    
+    def detect_emotions(
+        self,
+        texts: List[str],
+        threshold: float = 0.15,
+        batch_size: int = 32
+    ) -> List[List[Dict[str, any]]]:
+        """
+        Detect emotions for many texts at once.
+        
+        Texts are sorted by length and split into batches of similar length,
+        so each padded model batch wastes little compute on padding tokens.
+        Results are returned in the original order. If a batch fails, its
+        texts are retried one by one (failures yield neutral).
+        
+        Args:
+            texts: Input texts to analyze
+            threshold: Minimum confidence threshold
+            batch_size: Number of texts per model call
             
-            # Handle different model outputs
-            if hasattr(self, 'use_sentiment_fallback') and self.use_sentiment_fallback:
-                # Convert sentiment to emotion format
-                emotions = []
-                for result in results:
-                    label = result['label']
-                    score = result['score']
-                    
-                    # Map sentiment labels to emotions
-                    if 'positive' in label.lower() or 'pos' in label.lower():
-                        emotion_label = "joy"
-                    elif 'negative' in label.lower() or 'neg' in label.lower():
-                        emotion_label = "sadness"
-                    else:
-                        emotion_label = "neutral"
-                    
-                    if score >= threshold:
-                        emotion_meta = self.emotion_emoji_map.get(
-                            emotion_label, 
-                            {"emoji": "😐", "color": "#F3F4F6"}
-                        )
-                        
-                        emotions.append({
-                            "label": emotion_label,
-                            "confidence": round(score, 3),
-                            "emoji": emotion_meta["emoji"],
-                            "color": emotion_meta["color"]
-                        })
-            else:
-                # Normal emotion detection with keyword boosting
-                emotions = []
-                for result in results:
-                    label = result['label']
-                    score = result['score']
-                    
-                    # Boost scores for grief/anger keywords
-                    if any(keyword in text_lower for keyword in self.grief_keywords):
-                        if label in ['sadness', 'grief', 'disappointment']:
-                            score = min(0.95, score + 0.3)  # Boost grief-related emotions
-                    
-                    if any(keyword in text_lower for keyword in self.anger_keywords):
-                        if label in ['anger', 'annoyance', 'disapproval']:
-                            score = min(0.95, score + 0.3)  # Boost anger-related emotions
-                    
-                    if score >= threshold:
-                        emotion_meta = self.emotion_emoji_map.get(
-                            label, 
-                            {"emoji": "😐", "color": "#F3F4F6"}
-                        )
-                        
-                        emotions.append({
-                            "label": label,
-                            "confidence": round(score, 3),
-                            "emoji": emotion_meta["emoji"],
-                            "color": emotion_meta["color"]
-                        })
+        Returns:
+            One emotion list per text (same format as detect_emotion())
+        """
+        # Character length is a cheap proxy for token count
+        order = sorted(range(len(texts)), key=lambda i: len(texts[i]))
+        results = [None] * len(texts)
+        
+        for start in range(0, len(order), max(1, batch_size)):
+            bucket = order[start:start + batch_size]
+            try:
+                labels, scores = self._predict_scores([texts[i] for i in bucket])
+                for i, row in zip(bucket, scores):
+                    results[i] = self._build_emotions(texts[i], labels, row, threshold)
+            except Exception as e:
+                print(f"Error in batch emotion detection, retrying texts one by one: {e}")
+                for i in bucket:
+                    results[i] = self.detect_emotion(texts[i], threshold)
+        
+        return results
+    
+    async def detect_emotion_async(
+        self,
+        text: str,
+        threshold: float = 0.15
+    ) -> List[Dict[str, any]]:
+        """
+        Detect emotions, batching concurrent calls into one model run.
+        
+        With EMOTION_BATCHING enabled, concurrent requests are collected for
+        up to EMOTION_BATCH_MAX_WAIT_MS (or EMOTION_BATCH_MAX_SIZE texts) and
+        classified in one padded batch off the event loop. Otherwise this is
+        the same as detect_emotion().
+        
+        Args:
+            text: Input text to analyze
+            threshold: Minimum confidence threshold
             
-            # Sort by confidence (highest first)
-            emotions.sort(key=lambda x: x['confidence'], reverse=True)
+        Returns:
+            List of emotion dictionaries with label, confidence, emoji, and color
+        """
+        if self.batcher is None:
+            return self.detect_emotion(text, threshold)
+        
+        try:
+            return await self.batcher.submit((text, threshold))
+        except Exception as e:
+            print(f"Error in batched emotion detection: {e}")
+            return [self._neutral_emotion()]
+    
+    def get_batching_stats(self) -> Dict[str, any]:
+        """Get micro-batching statistics (None if batching is disabled)."""
+        return self.batcher.stats() if self.batcher is not None else None
+    
+    def _detect_batch(self, items: List[Tuple[str, float]]) -> List[List[Dict[str, any]]]:
+        """
+        Classify a batch of (text, threshold) items in one model call.
+        
+        Args:
+            items: Texts with their confidence thresholds
             
-            # If no emotions above threshold, return neutral
-            if not emotions:
-                emotions = [{
-                    "label": "neutral",
-                    "confidence": 0.5,
-                    "emoji": "😐",
-                    "color": "#F3F4F6"
-                }]
+        Returns:
+            Emotion lists in the same order as items
+        """
+        texts = [text for text, _ in items]
+        labels, scores = self._predict_scores(texts)
+        return [
+            self._build_emotions(text, labels, row, threshold)
+            for (text, threshold), row in zip(items, scores)
+        ]
+    
+    def _predict_scores(self, texts: List[str]) -> Tuple[List[str], np.ndarray]:
+        """
+        Run the classifier on a batch of texts.
+        
+        Args:
+            texts: Input texts
             
-            return emotions
+        Returns:
+            Tuple of (labels, scores) where scores has one row per text and
+            one column per label
+        """
+        if self.session is not None:
+            return self.labels, self._predict_scores_onnx(texts)
+        
+        outputs = self.classifier(list(texts), batch_size=len(texts))
+        # Pipelines without top_k return a single dict per text
+        outputs = [output if isinstance(output, list) else [output] for output in outputs]
+        
+        if not self.labels:
+            # Pipelines without a label config: fix the column order on first use
+            self.labels = sorted({result['label'] for output in outputs for result in output})
+            self._set_label_columns(self.labels)
+        labels = self.labels
+        label_index = {label: i for i, label in enumerate(labels)}
+        
+        scores = np.zeros((len(texts), len(labels)), dtype=np.float32)
+        for row, output in enumerate(outputs):
+            for result in output:
+                column = label_index.get(result['label'])
+                if column is not None:
+                    scores[row, column] = result['score']
+        
+        return labels, scores
+    
+    def _predict_scores_onnx(self, texts: List[str]) -> np.ndarray:
+        """
+        Run texts through the ONNX session, chunking long inputs.
+        
+        With EMOTION_CHUNKING enabled, texts longer than the model's maximum
+        length are split into overlapping token windows (EMOTION_CHUNK_STRIDE
+        tokens of overlap) instead of being truncated. The windows of all
+        texts run in one batched call, and per-label scores are aggregated
+        back per text with EMOTION_CHUNK_AGGREGATION ("max" or "mean").
+        
+        Args:
+            texts: Input texts
             
-        except Exception as e:
-            # Fallback to neutral emotion on error
-            print(f"Error in emotion detection: {e}")
-            return [{
-                "label": "neutral",
-                "confidence": 0.5,
-                "emoji": "😐",
-                "color": "#F3F4F6"
-            }]
+        Returns:
+            float32 score matrix with one row per text
+        """
+        chunking = settings.EMOTION_CHUNKING
+        features = self.tokenizer(
+            list(texts),
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_overflowing_tokens=chunking,
+            stride=min(settings.EMOTION_CHUNK_STRIDE, self.max_length // 2) if chunking else 0,
+            return_tensors="np"
+        )
+        inputs = {
+            name: np.asarray(value, dtype=np.int64)
+            for name, value in features.items()
+            if name in self.input_names
+        }
+        logits = self.session.run(None, inputs)[0]
+        # Multi-label classification: independent sigmoid per label
+        window_scores = (1.0 / (1.0 + np.exp(-logits))).astype(np.float32)
+        
+        sample_mapping = features.get("overflow_to_sample_mapping") if chunking else None
+        if sample_mapping is None or len(sample_mapping) == len(texts):
+            return window_scores
+        
+        # Aggregate window scores back to one row per text
+        sample_mapping = np.asarray(sample_mapping, dtype=np.int64)
+        if settings.EMOTION_CHUNK_AGGREGATION == "mean":
+            scores = np.zeros((len(texts), window_scores.shape[1]), dtype=np.float32)
+            np.add.at(scores, sample_mapping, window_scores)
+            scores /= np.bincount(sample_mapping, minlength=len(texts))[:, np.newaxis]
+        else:
+            scores = np.zeros((len(texts), window_scores.shape[1]), dtype=np.float32)
+            np.maximum.at(scores, sample_mapping, window_scores)
+        return scores
+    
+    def _build_emotions(
+        self,
+        text: str,
+        labels: List[str],
+        scores: np.ndarray,
+        threshold: float
+    ) -> List[Dict[str, any]]:
+        """
+        Turn one row of label scores into the emotion list returned to callers.
+        
+        Args:
+            text: Input text (used for keyword boosting)
+            labels: Label of each score column
+            scores: Scores for one text
+            threshold: Minimum confidence threshold
+            
+        Returns:
+            Emotions above threshold sorted by confidence, or neutral
+        """
+        # Handle different model outputs
+        if hasattr(self, 'use_sentiment_fallback') and self.use_sentiment_fallback:
+            # Convert sentiment to emotion format
+            emotions = []
+            for label, score in zip(labels, scores):
+                score = float(score)
+                
+                # Map sentiment labels to emotions
+                if 'positive' in label.lower() or 'pos' in label.lower():
+                    emotion_label = "joy"
+                elif 'negative' in label.lower() or 'neg' in label.lower():
+                    emotion_label = "sadness"
+                else:
+                    emotion_label = "neutral"
+                
+                if score > 0 and score >= threshold:
+                    emotion_meta = self.EMOTION_EMOJI_MAP.get(
+                        emotion_label, 
+                        {"emoji": "😐", "color": "#F3F4F6"}
+                    )
+                    
+                    emotions.append({
+                        "label": emotion_label,
+                        "confidence": round(score, 3),
+                        "emoji": emotion_meta["emoji"],
+                        "color": emotion_meta["color"]
+                    })
+        else:
+            # Normal emotion detection with keyword boosting, vectorized over all labels
+            return build_emotions(text, labels, scores, threshold, self.lexicon, self._label_meta)
+        
+        # Sort by confidence (highest first)
+        emotions.sort(key=lambda x: x['confidence'], reverse=True)
+        
+        # If no emotions above threshold, return neutral
+        if not emotions:
+            emotions = [self._neutral_emotion()]
+        
+        return emotions
+    
+    def _neutral_emotion(self) -> Dict[str, any]:
+        """Neutral emotion used when nothing is detected or detection fails."""
+        return neutral_emotion()
     
     def get_dominant_emotion(self, emotions: List[Dict]) -> Dict:
         """
@@ -248,23 +483,88 @@ class EmotionDetectionService:
         Returns:
             Single emotion dictionary with highest confidence
         """
-        if not emotions:
-            return {
-                "label": "neutral",
-                "confidence": 0.5,
-                "emoji": "😐",
-                "color": "#F3F4F6"
-            }
-        
-        return emotions[0]  # Already sorted by confidence in detect_emotion()
+        return dominant_emotion(emotions)
+
+
+def neutral_emotion() -> Dict[str, any]:
+    """Neutral emotion used when nothing is detected or detection fails."""
+    return {
+        "label": "neutral",
+        "confidence": 0.5,
+        "emoji": "😐",
+        "color": "#F3F4F6"
+    }
+
+
+def dominant_emotion(emotions: List[Dict]) -> Dict:
+    """Get the first (highest-confidence) emotion, or neutral if there is none."""
+    if not emotions:
+        return neutral_emotion()
+    
+    return emotions[0]  # Already sorted by confidence in detect_emotion()
+
+
+def load_emotion_lexicon(labels: List[str]) -> EmotionLexicon:
+    """Compile EMOTION_LEXICON_PATH (or the built-in lexicon) for a label order."""
+    if settings.EMOTION_LEXICON_PATH:
+        return EmotionLexicon.from_file(settings.EMOTION_LEXICON_PATH, labels)
+    return EmotionLexicon(DEFAULT_LEXICON, labels)
+
+
+def label_metadata(labels: List[str]) -> List[Dict[str, str]]:
+    """Get the emoji and color of each label, in label order."""
+    return [
+        EmotionDetectionService.EMOTION_EMOJI_MAP.get(label, {"emoji": "😐", "color": "#F3F4F6"})
+        for label in labels
+    ]
+
+
+def build_emotions(
+    text: str,
+    labels: List[str],
+    scores: np.ndarray,
+    threshold: float,
+    lexicon: EmotionLexicon,
+    label_meta: List[Dict[str, str]]
+) -> List[Dict[str, any]]:
+    """
+    Turn one row of GoEmotions scores into the detect_emotion() result format.
+    
+    Shared by EmotionDetectionService and the multi-task model.
+    
+    Args:
+        text: Input text (used for keyword boosting)
+        labels: Label of each score column
+        scores: Scores for one text
+        threshold: Minimum confidence threshold
+        lexicon: Keyword lexicon compiled for labels
+        label_meta: Emoji and color per label (see label_metadata())
+    
+    Returns:
+        Emotions above threshold sorted by confidence, or neutral
+    """
+    scores = lexicon.apply(text, np.asarray(scores, dtype=np.float32))
+    
+    # Only labels above threshold are turned into dicts
+    emotions = []
+    for column in np.flatnonzero(scores >= threshold):
+        emotion_meta = label_meta[column]
+        emotions.append({
+            "label": labels[column],
+            "confidence": round(float(scores[column]), 3),
+            "emoji": emotion_meta["emoji"],
+            "color": emotion_meta["color"]
+        })
+    
+    # Sort by confidence (highest first)
+    emotions.sort(key=lambda x: x['confidence'], reverse=True)
+    return emotions or [neutral_emotion()]
+
 
+# Singleton instance (owned by the process-wide model registry)
+model_registry.register("emotion_detection", EmotionDetectionService)
 
-# Singleton instance
-_emotion_service = None
 
 def get_emotion_service() -> EmotionDetectionService:
     """Get or create singleton emotion detection service instance."""
-    global _emotion_service
-    if _emotion_service is None:
-        _emotion_service = EmotionDetectionService()
-    return _emotion_service
+    return model_registry.get("emotion_detection")
@@ -0,0 +1,146 @@
+"""
+Keyword lexicon boosting for emotion detection.
+
+Keyword groups (e.g., grief words) boost related emotion labels when they
+appear in the text. Keywords are compiled once: single words into a hash
+table probed with the text's word set, multi-word phrases into one
+case-insensitive regex with word boundaries. Each text is scanned once and
+"gone" no longer matches inside "undergone". The matches produce a boost
+vector over the model's labels that is added to the scores in NumPy.
+"""
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+import json
+import re
+
+# Built-in lexicon: keyword group -> keywords, boosted labels and boost amount
+DEFAULT_LEXICON = {
+    "grief": {
+        "keywords": [
+            "lost", "death", "died", "father", "mother", "pet", "grief", "mourning",
+            "funeral", "passed away", "gone", "miss", "lonely", "empty", "devastated"
+        ],
+        "labels": ["sadness", "grief", "disappointment"],
+        "boost": 0.3
+    },
+    "anger": {
+        "keywords": [
+            "angry", "mad", "furious", "rage", "hate", "frustrated", "annoyed",
+            "pissed", "irritated", "upset", "livid", "outraged"
+        ],
+        "labels": ["anger", "annoyance", "disapproval"],
+        "boost": 0.3
+    }
+}
+
+# Boosted scores are capped here so keywords alone never produce certainty
+MAX_BOOSTED_SCORE = 0.95
+
+WORD_PATTERN = re.compile(r"\w+")
+
+
+def _normalize_keyword(keyword: str) -> str:
+    return " ".join(keyword.lower().split())
+
+
+class EmotionLexicon:
+    """
+    Compiled keyword -> label boost table.
+    
+    Each keyword group contributes its boost to its labels at most once per
+    text, however many of its keywords match.
+    """
+    
+    def __init__(
+        self,
+        groups: Dict[str, Dict],
+        labels: Sequence[str],
+        max_score: float = MAX_BOOSTED_SCORE
+    ):
+        """
+        Compile the lexicon for a label order.
+        
+        Args:
+            groups: Keyword groups, each with "keywords", "labels" and "boost"
+            labels: Label of each model score column
+            max_score: Cap for boosted scores
+        """
+        self.max_score = max_score
+        label_index = {label: i for i, label in enumerate(labels)}
+        
+        self.group_names = list(groups)
+        self._group_boosts = np.zeros((len(groups), len(labels)), dtype=np.float32)
+        self._keyword_groups: Dict[str, List[int]] = {}
+        
+        for group_id, (name, group) in enumerate(groups.items()):
+            for label in group.get("labels", []):
+                if label in label_index:
+                    self._group_boosts[group_id, label_index[label]] += float(group.get("boost", 0.0))
+            for keyword in group.get("keywords", []):
+                self._keyword_groups.setdefault(_normalize_keyword(keyword), []).append(group_id)
+        
+        # Single words are matched by set lookup; anything else (phrases,
+        # hyphenated words) goes into one regex, longest first
+        self._word_groups = {
+            keyword: group_ids for keyword, group_ids in self._keyword_groups.items()
+            if WORD_PATTERN.fullmatch(keyword)
+        }
+        phrases = sorted(set(self._keyword_groups) - set(self._word_groups), key=len, reverse=True)
+        alternatives = [r"\s+".join(re.escape(word) for word in phrase.split()) for phrase in phrases]
+        self._phrase_pattern = re.compile(rf"\b(?:{'|'.join(alternatives)})\b", re.IGNORECASE) if alternatives else None
+    
+    @classmethod
+    def from_file(cls, path: str, labels: Sequence[str], max_score: float = MAX_BOOSTED_SCORE) -> "EmotionLexicon":
+        """
+        Load a lexicon from a JSON file with the same layout as DEFAULT_LEXICON.
+        
+        Args:
+            path: JSON file path
+            labels: Label of each model score column
+            max_score: Cap for boosted scores
+        
+        Returns:
+            Compiled EmotionLexicon
+        """
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f), labels, max_score)
+    
+    def boost_vector(self, text: str) -> Optional[np.ndarray]:
+        """
+        Scan a text once and build its per-label boost vector.
+        
+        Args:
+            text: Input text
+        
+        Returns:
+            float32 boost per label, or None if no keyword matches
+        """
+        matched_groups = set()
+        for word in self._word_groups.keys() & set(WORD_PATTERN.findall(text.lower())):
+            matched_groups.update(self._word_groups[word])
+        
+        if self._phrase_pattern is not None:
+            for match in self._phrase_pattern.finditer(text):
+                matched_groups.update(self._keyword_groups[_normalize_keyword(match.group(0))])
+        
+        if not matched_groups:
+            return None
+        return self._group_boosts[sorted(matched_groups)].sum(axis=0)
+    
+    def apply(self, text: str, scores: np.ndarray) -> np.ndarray:
+        """
+        Add the text's keyword boosts to model scores.
+        
+        Boosted labels are capped at max_score; other labels are unchanged.
+        
+        Args:
+            text: Input text
+            scores: Model scores (one per label)
+        
+        Returns:
+            Boosted scores
+        """
+        boost = self.boost_vector(text)
+        if boost is None:
+            return scores
+        return np.where(boost > 0, np.minimum(self.max_score, scores + boost), scores)
@@ -0,0 +1,156 @@
+"""
+Calibration of the intent cascade's early-exit tiers.
+
+The lexical, head and embedding tiers produce raw scores (keyword strength,
+softmax maxima) that are not probabilities of being right. For each tier,
+scripts/compare_intent_classifiers.py --calibrate fits a Platt sigmoid
+mapping the raw score to P(tier's intent is correct) on a labelled set, and
+derives the tier's exit threshold as the lowest calibrated score at which
+the tier's answers still reached the target accuracy on that set.
+
+File layout (JSON): "version", "encoder" (signature of the embedding
+encoder the head and embedding tiers were calibrated with),
+"target_accuracy" and "tiers": tier -> {"a", "b", "exit_confidence",
+"support", "accuracy"}; exit_confidence is null when the tier never reached
+the target and must not exit.
+"""
+from typing import Dict, Optional, Sequence, Tuple
+import numpy as np
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+CALIBRATION_VERSION = 1
+
+
+class TierCalibration:
+    """Platt sigmoid and derived exit threshold for one cascade tier."""
+    
+    def __init__(self, a: float, b: float, exit_confidence: Optional[float]):
+        """
+        Args:
+            a: Sigmoid slope (applied to the raw score)
+            b: Sigmoid offset
+            exit_confidence: Calibrated score needed to exit, or None to never exit
+        """
+        self.a = float(a)
+        self.b = float(b)
+        self.exit_confidence = exit_confidence
+    
+    def calibrate(self, score: float) -> float:
+        """Map a raw tier score to P(correct)."""
+        return float(1.0 / (1.0 + np.exp(-(self.a * score + self.b))))
+    
+    def can_exit(self, calibrated: float) -> bool:
+        return self.exit_confidence is not None and calibrated >= self.exit_confidence
+
+
+def fit_platt(scores: Sequence[float], correct: Sequence[bool], iterations: int = 100) -> Tuple[float, float]:
+    """
+    Fit a Platt sigmoid P(correct) = 1 / (1 + exp(-(a * score + b))).
+    
+    Uses Platt's smoothed targets and Newton's method on the log loss.
+    
+    Args:
+        scores: Raw tier scores
+        correct: Whether the tier's intent was right for each score
+        iterations: Maximum Newton steps
+    
+    Returns:
+        Tuple of (a, b)
+    """
+    x = np.asarray(scores, dtype=np.float64)
+    y = np.asarray(correct, dtype=bool)
+    positives, negatives = y.sum(), (~y).sum()
+    targets = np.where(y, (positives + 1.0) / (positives + 2.0), 1.0 / (negatives + 2.0))
+    
+    a, b = 0.0, float(np.log((positives + 1.0) / (negatives + 1.0)))
+    for _ in range(iterations):
+        p = 1.0 / (1.0 + np.exp(-(a * x + b)))
+        gradient = np.array([((p - targets) * x).sum(), (p - targets).sum()])
+        weights = p * (1.0 - p) + 1e-9
+        hessian = np.array([
+            [(weights * x * x).sum() + 1e-6, (weights * x).sum()],
+            [(weights * x).sum(), weights.sum() + 1e-6]
+        ])
+        step = np.linalg.solve(hessian, gradient)
+        a, b = a - step[0], b - step[1]
+        if np.abs(step).max() < 1e-8:
+            break
+    return float(a), float(b)
+
+
+def derive_exit_confidence(
+    calibrated: Sequence[float],
+    correct: Sequence[bool],
+    target_accuracy: float,
+    min_support: int
+) -> Optional[float]:
+    """
+    Find the lowest calibrated score at which exiting stays accurate enough.
+    
+    Args:
+        calibrated: Calibrated score of each of the tier's answers
+        correct: Whether each answer was right
+        target_accuracy: Accuracy required of the answers the tier exits on
+        min_support: Minimum number of answers above the threshold
+    
+    Returns:
+        Exit threshold, or None if no threshold reaches the target
+    """
+    calibrated = np.asarray(calibrated, dtype=np.float64)
+    correct = np.asarray(correct, dtype=bool)
+    for threshold in np.unique(calibrated):
+        exits = calibrated >= threshold
+        if exits.sum() < min_support:
+            break
+        if correct[exits].mean() >= target_accuracy:
+            # Never exit below the target itself, whatever the labelled set says
+            return float(max(threshold, target_accuracy))
+    return None
+
+
+def save_cascade_calibration(path: str, tiers: Dict[str, Dict], encoder: str, target_accuracy: float) -> None:
+    """Write a calibration file read by load_cascade_calibration()."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({
+            "version": CALIBRATION_VERSION,
+            "encoder": encoder,
+            "target_accuracy": target_accuracy,
+            "tiers": tiers
+        }, f, indent=2)
+
+
+def load_cascade_calibration(path: str, encoder: str) -> Optional[Dict[str, TierCalibration]]:
+    """
+    Load per-tier calibrations, or None if missing or incompatible.
+    
+    Args:
+        path: JSON file written by scripts/compare_intent_classifiers.py --calibrate
+        encoder: Signature of the encoder the service embeds messages with
+    
+    Returns:
+        Tier name -> TierCalibration, or None if the file could not be read
+        or was calibrated with a different encoder
+    """
+    try:
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+    except Exception as e:
+        logger.warning(f"Could not load intent cascade calibration from {path}: {e}")
+        return None
+    
+    if data.get("version") != CALIBRATION_VERSION or data.get("encoder") != encoder:
+        logger.warning(
+            f"Ignoring intent cascade calibration {path}: version {data.get('version')} for "
+            f"{data.get('encoder')}, service uses version {CALIBRATION_VERSION} for {encoder}"
+        )
+        return None
+    
+    calibrations = {
+        tier: TierCalibration(values["a"], values["b"], values.get("exit_confidence"))
+        for tier, values in data.get("tiers", {}).items()
+    }
+    logger.info(f"Intent cascade calibration loaded from {path} ({', '.join(calibrations) or 'no tiers'})")
+    return calibrations
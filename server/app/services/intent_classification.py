@@ -7,14 +7,159 @@ Classifies user input into three categories:
 - spiritual_guidance: Philosophical questions about Gita teachings
 """
 from transformers import pipeline
-from typing import Dict, Tuple
+from typing import Dict, List, Optional, Sequence, Tuple
 from app.core.config import settings
+from app.core.registry import model_registry
+from app.services.analyzed_input import AnalyzedInput
+from app.services.zero_shot_nli import load_zero_shot_classifier
+from app.services.intent_head import load_intent_head
+from app.services.intent_calibration import load_cascade_calibration
+from app.services.verse_artifact import encoder_signature
+import numpy as np
+import json
 import re
+import threading
+import time
+
+# INTENT_MODEL value selecting the embedding prototype classifier
+EMBEDDING_INTENT_MODEL = "embedding"
+
+# Labelled examples that, together with the label descriptions, form the
+# embedding classifier's intent prototypes
+INTENT_EXAMPLES = {
+    "casual_chat": [
+        "Hello, how are you today?",
+        "Good morning!",
+        "Who are you and what can you do?",
+        "How does this app work?",
+        "Thanks for the help, see you later",
+        "What time is it in India?",
+        "Tell me a little about yourself",
+        "Nice to meet you",
+    ],
+    "emotional_query": [
+        "I feel so anxious about my exams and can't sleep",
+        "I lost my job and I don't know what to do with my life",
+        "My father passed away and I feel empty",
+        "I'm stressed and overwhelmed at work",
+        "I feel guilty about hurting my friend",
+        "Nobody understands me and I feel lonely",
+        "I'm angry at my family all the time",
+        "I'm scared of failing and disappointing everyone",
+    ],
+    "spiritual_guidance": [
+        "What does Krishna say about dharma?",
+        "What is karma yoga?",
+        "How can I act without attachment to the results?",
+        "What is the nature of the soul according to the Gita?",
+        "What is the meaning of life?",
+        "How do I find my true purpose and duty?",
+        "What is the difference between the body and the atman?",
+        "How should I practice meditation according to the Bhagavad Gita?",
+    ],
+}
+
+
+class EmbeddingIntentClassifier:
+    """
+    Intent classifier scoring sentence embeddings against intent prototypes.
+    
+    Each intent's prototype is the normalized mean embedding of its
+    description and labelled examples. A message is encoded once by the
+    shared retrieval encoder and its cosine similarity to every prototype is
+    turned into probabilities with a temperature softmax, so one small
+    encoder pass replaces one NLI forward pass per candidate label.
+    """
+    
+    def __init__(
+        self,
+        encoder,
+        descriptions: Dict[str, str],
+        examples: Dict[str, Sequence[str]],
+        temperature: float = 0.05
+    ):
+        """
+        Build the intent prototypes.
+        
+        Args:
+            encoder: Sentence encoder exposing encode()
+            descriptions: Intent label -> description
+            examples: Intent label -> labelled example messages
+            temperature: Softmax temperature applied to cosine similarities
+        """
+        self.encoder = encoder
+        self.labels = list(descriptions)
+        self.temperature = max(temperature, 1e-6)
+        
+        texts, owners = [], []
+        for label_id, label in enumerate(self.labels):
+            for text in [descriptions[label], *examples.get(label, [])]:
+                texts.append(text)
+                owners.append(label_id)
+        
+        embeddings = self._normalize(np.asarray(encoder.encode(texts), dtype=np.float32))
+        owners = np.asarray(owners)
+        self.prototypes = self._normalize(np.stack([
+            embeddings[owners == label_id].mean(axis=0)
+            for label_id in range(len(self.labels))
+        ]))
+    
+    @staticmethod
+    def _normalize(matrix: np.ndarray) -> np.ndarray:
+        return matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+    
+    def probabilities(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Score precomputed message embeddings against the prototypes.
+        
+        Args:
+            embeddings: Message embedding matrix (one row per message)
+        
+        Returns:
+            Probability matrix of shape (messages, labels)
+        """
+        similarities = self._normalize(np.atleast_2d(np.asarray(embeddings, dtype=np.float32))) @ self.prototypes.T
+        logits = similarities / self.temperature
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+    
+    def classify_embedding(self, embedding: np.ndarray) -> Tuple[str, float]:
+        """
+        Classify one message from its precomputed embedding.
+        
+        Args:
+            embedding: Message embedding from the same encoder
+            
+        Returns:
+            Tuple of (intent_label, confidence)
+        """
+        probabilities = self.probabilities(embedding)[0]
+        label_id = int(probabilities.argmax())
+        return (self.labels[label_id], float(probabilities[label_id]))
+    
+    def classify(self, texts: List[str]) -> List[Tuple[str, float]]:
+        """
+        Classify messages with one batched encoder call.
+        
+        Args:
+            texts: Message texts
+        
+        Returns:
+            (intent_label, confidence) per message
+        """
+        probabilities = self.probabilities(self.encoder.encode(list(texts)))
+        best = probabilities.argmax(axis=1)
+        return [
+            (self.labels[label_id], float(row[label_id]))
+            for label_id, row in zip(best, probabilities)
+        ]
 
 
 class IntentClassificationService:
     """
-    Intent classification service using zero-shot classification.
+    Intent classification service using zero-shot classification, or an
+    embedding prototype classifier when INTENT_MODEL is "embedding".
     
     Routes user queries to appropriate processing pipelines:
     - casual_chat → Direct Gemini chat (no emotion/verse search)
@@ -36,32 +181,183 @@ class IntentClassificationService:
         r"^(thank you|thanks|bye|goodbye)\b",
     ]
     
-    def __init__(self):
-        """Initialize zero-shot classification pipeline."""
-        try:
-            # Use BART for zero-shot classification
-            model_name = getattr(settings, 'INTENT_MODEL', 'facebook/bart-large-mnli')
-            self.classifier = pipeline(
-                "zero-shot-classification",
-                model=model_name,
-                device=-1  # CPU
-            )
+    # Unambiguous keywords: the only ones that let the lexical tier answer
+    STRONG_EMOTIONAL_KEYWORDS = [
+        'anxious', 'worried', 'sad', 'depressed', 'stressed', 'guilty',
+        'angry', 'frustrated', 'overwhelmed', 'scared', 'afraid',
+        'upset', 'disappointed', 'hopeless', 'helpless'
+    ]
+    STRONG_SPIRITUAL_KEYWORDS = [
+        'dharma', 'karma', 'krishna', 'arjuna', 'gita', 'bhagavad',
+        'moksha', 'atman', 'brahman'
+    ]
+    
+    # All keywords, for the heuristic fallback; generic words ("life",
+    # "career", "duty", ...) only count as evidence against a lexical answer
+    EMOTIONAL_KEYWORDS = STRONG_EMOTIONAL_KEYWORDS + [
+        'feel', 'feeling', 'confused', 'hurt', 'pain', 'suffering',
+        'lost', 'don\'t know', 'dont know', 'career', 'life', 'future',
+        'problem', 'issue', 'struggle', 'difficult', 'hard', 'tough', 'stuck'
+    ]
+    SPIRITUAL_KEYWORDS = STRONG_SPIRITUAL_KEYWORDS + [
+        'yoga', 'meditation', 'enlightenment', 'duty', 'purpose',
+        'meaning', 'wisdom', 'teaching'
+    ]
+    
+    # A negation up to two words before a keyword ("not angry", "don't feel sad")
+    NEGATION_PATTERN = r"(?:\b(?:not|no|never|nor|without|hardly)\b|n't)(?:\s+\S+){0,2}\s*$"
+    
+    # Cascade tiers, cheapest first
+    CASCADE_TIERS = ("rules", "lexical", "head", "embedding", "zero_shot")
+    
+    # Compiled once per process
+    _CASUAL_REGEXES = [re.compile(pattern, re.IGNORECASE) for pattern in CASUAL_PATTERNS]
+    _KEYWORD_REGEXES = {
+        intent: re.compile(r"\b(?:" + "|".join(re.escape(keyword) for keyword in keywords) + r")\b")
+        for intent, keywords in (("emotional_query", EMOTIONAL_KEYWORDS), ("spiritual_guidance", SPIRITUAL_KEYWORDS))
+    }
+    _NEGATION_REGEX = re.compile(NEGATION_PATTERN)
+    _STRONG_KEYWORD_REGEXES = {
+        intent: re.compile(r"\b(?:" + "|".join(re.escape(keyword) for keyword in keywords) + r")\b")
+        for intent, keywords in (
+            ("emotional_query", STRONG_EMOTIONAL_KEYWORDS),
+            ("spiritual_guidance", STRONG_SPIRITUAL_KEYWORDS)
+        )
+    }
+    
+    def __init__(self, model_name: Optional[str] = None, cascade: Optional[bool] = None):
+        """
+        Initialize the zero-shot pipeline or the embedding classifier.
+        
+        Args:
+            model_name: Zero-shot model name, or "embedding" (defaults to settings.INTENT_MODEL)
+            cascade: Try the lexical, head and embedding tiers before the final model
+                (defaults to settings.INTENT_CASCADE)
+        """
+        self.model_name = model_name or getattr(settings, 'INTENT_MODEL', 'facebook/bart-large-mnli')
+        self.cascade = settings.INTENT_CASCADE if cascade is None else cascade
+        self.classifier = None
+        self.embedding_classifier = None
+        self.intent_head = None
+        self.calibration = None
+        self.encoder_signature = encoder_signature(
+            settings.EMBEDDING_MODEL, settings.EMBEDDING_BACKEND, settings.EMBEDDING_MODEL_FILE
+        )
+        
+        if self.model_name == EMBEDDING_INTENT_MODEL:
+            self.confidence_threshold = settings.INTENT_EMBEDDING_CONFIDENCE_THRESHOLD
+        else:
             self.confidence_threshold = getattr(settings, 'INTENT_CONFIDENCE_THRESHOLD', 0.6)
-            print(f"Intent classification service initialized with model: {model_name}")
+        
+        try:
+            if self.model_name != EMBEDDING_INTENT_MODEL and settings.INTENT_ZERO_SHOT_BACKEND == "onnx":
+                # Exported NLI model: all hypotheses in one batched ONNX call
+                self.classifier = load_zero_shot_classifier(
+                    settings.INTENT_NLI_ONNX_MODEL,
+                    settings.INTENT_NLI_ONNX_FILE,
+                    settings.INTENT_NLI_ORT_THREADS
+                )
+                if self.classifier is None:
+                    print("🔄 ONNX zero-shot model not available, falling back to transformers pipeline...")
+            if self.model_name != EMBEDDING_INTENT_MODEL and self.classifier is None:
+                # Use BART for zero-shot classification
+                self.classifier = pipeline(
+                    "zero-shot-classification",
+                    model=self.model_name,
+                    device=-1  # CPU
+                )
+            print(f"Intent classification service initialized with model: {self.model_name}")
         except Exception as e:
             print(f"Warning: Could not initialize intent classifier: {e}")
             self.classifier = None
+        
+        if self.model_name == EMBEDDING_INTENT_MODEL or self.cascade:
+            try:
+                # Reuses the retrieval encoder instead of loading another model
+                self.embedding_classifier = EmbeddingIntentClassifier(
+                    model_registry.get("sentence_encoder"),
+                    self.INTENT_LABELS,
+                    self._load_examples(),
+                    temperature=settings.INTENT_EMBEDDING_TEMPERATURE
+                )
+            except Exception as e:
+                print(f"Warning: Could not initialize embedding intent classifier: {e}")
+        
+        if self.cascade and settings.INTENT_HEAD_PATH:
+            # Distilled from this service's own labels (scripts/distill_intent_head.py)
+            try:
+                if self.embedding_classifier is not None:
+                    input_dim = self.embedding_classifier.prototypes.shape[1]
+                else:
+                    input_dim = len(np.atleast_2d(model_registry.get("sentence_encoder").encode(["intent head"]))[0])
+                self.intent_head = load_intent_head(
+                    settings.INTENT_HEAD_PATH, self.encoder_signature, self.INTENT_LABELS, input_dim
+                )
+            except Exception as e:
+                print(f"Warning: Could not initialize intent head: {e}")
+        
+        if self.cascade and settings.INTENT_CASCADE_CALIBRATION_PATH:
+            # Platt-calibrated tier scores and exit thresholds (scripts/compare_intent_classifiers.py --calibrate)
+            self.calibration = load_cascade_calibration(settings.INTENT_CASCADE_CALIBRATION_PATH, self.encoder_signature)
+        if self.cascade and self.calibration is None:
+            print("⚠️ Intent cascade is not calibrated; early exits use the raw INTENT_*_EXIT_CONFIDENCE thresholds")
+        
+        # Tiers in order; the last one always decides
+        final_tier = "embedding" if self.model_name == EMBEDDING_INTENT_MODEL else "zero_shot"
+        if self.cascade:
+            self.tiers = [
+                tier for tier in self.CASCADE_TIERS
+                if (tier != "zero_shot" or final_tier == "zero_shot") and (tier != "head" or self.intent_head is not None)
+            ]
+        else:
+            self.tiers = ["rules", final_tier]
+        
+        # Raw score a non-final tier needs to answer without asking later
+        # tiers (only without a calibration file)
+        self.exit_confidence = {
+            "rules": 0.0,
+            "lexical": settings.INTENT_LEXICAL_EXIT_CONFIDENCE,
+            "head": settings.INTENT_HEAD_EXIT_CONFIDENCE,
+            "embedding": settings.INTENT_EMBEDDING_EXIT_CONFIDENCE
+        }
+        
+        self._stats_lock = threading.Lock()
+        self._requests = 0
+        self._fallbacks = 0
+        self._tier_stats = {tier: {"calls": 0, "hits": 0, "total_ms": 0.0} for tier in self.tiers}
+    
+    @staticmethod
+    def _load_examples() -> Dict[str, List[str]]:
+        """
+        Get labelled intent examples for the embedding prototypes.
+        
+        Returns:
+            Built-in INTENT_EXAMPLES, extended with INTENT_EXAMPLES_PATH (JSON
+            mapping intent label -> list of messages) when configured
+        """
+        examples = {label: list(texts) for label, texts in INTENT_EXAMPLES.items()}
+        if settings.INTENT_EXAMPLES_PATH:
+            with open(settings.INTENT_EXAMPLES_PATH, encoding="utf-8") as f:
+                for label, texts in json.load(f).items():
+                    examples.setdefault(label, []).extend(texts)
+        return examples
     
-    def classify_intent(self, user_input: str) -> Tuple[str, float]:
+    def classify_intent(self, user_input: str, analyzed: Optional[AnalyzedInput] = None) -> Tuple[str, float]:
         """
         Classify user input into one of three intents.
         
+        Runs the tiers in order (compiled rules, lexical scorer, distilled
+        head, embedding classifier, zero-shot model) and stops at the first tier that is
+        confident enough, so clear-cut messages never reach the large model.
+        
         Args:
             user_input: User's message text
-            
+            analyzed: Shared analysis of user_input; the head and the embedding
+                classifier score its embedding instead of encoding the text again (optional)
+        
         Returns:
             Tuple of (intent_label, confidence_score)
-            
+        
         Example:
             >>> service.classify_intent("I'm feeling very anxious about my future")
             ('emotional_query', 0.89)
@@ -72,42 +368,201 @@ class IntentClassificationService:
             >>> service.classify_intent("Hello, how are you?")
             ('casual_chat', 0.95)
         """
-        # Quick rule-based check for common casual patterns
-        if self._is_casual_by_rules(user_input):
-            return ("casual_chat", 0.95)
+        model_result = None
+        with self._stats_lock:
+            self._requests += 1
         
-        # If classifier not available, use heuristics
-        if not self.classifier:
-            return self._classify_by_heuristics(user_input)
-        
-        try:
-            # Prepare candidate labels with descriptions
-            candidate_labels = list(self.INTENT_LABELS.keys())
-            
-            # Run zero-shot classification
-            result = self.classifier(
-                user_input,
-                candidate_labels,
-                hypothesis_template="This text is about {}",
-                multi_label=False
-            )
-            
-            # Extract top prediction
-            intent = result['labels'][0]
-            confidence = result['scores'][0]
+        for tier in self.tiers:
+            is_final = tier == self.tiers[-1]
+            start = time.perf_counter()
+            try:
+                result = self._run_tier(tier, user_input, analyzed)
+            except Exception as e:
+                print(f"Error in intent classification ({tier}): {e}")
+                result = None
+            self._record_call(tier, start)
             
-            # If confidence is below threshold, default to casual_chat
-            if confidence < self.confidence_threshold:
-                return ("casual_chat", confidence)
+            if result is None:
+                continue
+            if tier in ("head", "embedding", "zero_shot"):
+                model_result = (tier, result)
+            if is_final:
+                self._record_hit(tier)
+                return self._apply_threshold(tier, result)
+            exit_result = self._exit_result(tier, result)
+            if exit_result is not None:
+                self._record_hit(tier)
+                return self._apply_threshold(tier, exit_result)
+        
+        # The final model is unavailable or failed: use the last model answer
+        # from an earlier tier, else keyword heuristics
+        with self._stats_lock:
+            self._fallbacks += 1
+        if model_result is not None:
+            return self._apply_threshold(*model_result)
+        return self._classify_by_heuristics(user_input)
+    
+    def warm_up(self, text: str = "I feel lost about my purpose and my duties at work") -> None:
+        """
+        Run every loaded tier once, then the cascade.
+        
+        The cascade alone may exit before the zero-shot model, so each
+        tier is run directly to set up its graph before real traffic.
+        
+        Args:
+            text: Warmup message
+        """
+        for tier in self.tiers:
+            self._run_tier(tier, text, None)
+        self.classify_intent(text)
+    
+    def tier_scores(self, text: str) -> Dict[str, Optional[Tuple[str, float]]]:
+        """
+        Run every early-exit tier on text, without exiting or calibrating.
+        
+        Used to calibrate the cascade on a labelled set.
+        
+        Args:
+            text: Input text
             
-            return (intent, confidence)
+        Returns:
+            Tier name -> (intent, raw score), or None if the tier had no answer
+        """
+        return {
+            tier: self._run_tier(tier, text, None)
+            for tier in self.tiers[:-1] if tier != "rules"
+        }
+    
+    def _exit_result(self, tier: str, result: Tuple[str, float]) -> Optional[Tuple[str, float]]:
+        """
+        Decide whether a non-final tier's answer ends the cascade.
+        
+        Args:
+            tier: Tier name
+            result: Tier's (intent, raw score)
+        
+        Returns:
+            (intent, confidence) to answer with, with the calibrated
+            confidence when a calibration is loaded, or None to continue
+        """
+        if tier == "rules":
+            return result
+        
+        if self.calibration is None:
+            return result if result[1] >= self.exit_confidence[tier] else None
+        
+        calibration = self.calibration.get(tier)
+        if calibration is None:
+            # Tier not calibrated: it may inform the fallback but never exit
+            return None
+        confidence = calibration.calibrate(result[1])
+        return (result[0], confidence) if calibration.can_exit(confidence) else None
+    
+    def _run_tier(self, tier: str, text: str, analyzed: Optional[AnalyzedInput]) -> Optional[Tuple[str, float]]:
+        """
+        Run one cascade tier.
+        
+        Args:
+            tier: Tier name (see CASCADE_TIERS)
+            text: Input text
+            analyzed: Shared analysis of text (optional)
             
-        except Exception as e:
-            print(f"Error in intent classification: {e}")
-            # Fallback to heuristics
-            return self._classify_by_heuristics(user_input)
+        Returns:
+            Tuple of (intent, confidence), or None if the tier has no answer
+        """
+        if tier == "rules":
+            return ("casual_chat", 0.95) if self.is_casual_by_rules(text) else None
+        
+        if tier == "lexical":
+            return self._score_lexical(text)
+        
+        if tier == "head":
+            if analyzed is not None and analyzed.can_embed:
+                embedding = analyzed.embedding
+            else:
+                embedding = model_registry.get("sentence_encoder").encode([text])[0]
+            return self.intent_head.classify_embedding(embedding)
+        
+        if tier == "embedding":
+            if self.embedding_classifier is None:
+                return None
+            if analyzed is not None and analyzed.can_embed:
+                return self.embedding_classifier.classify_embedding(analyzed.embedding)
+            return self.embedding_classifier.classify([text])[0]
+        
+        if self.classifier is None:
+            return None
+        
+        # Prepare candidate labels with descriptions
+        candidate_labels = list(self.INTENT_LABELS.keys())
+        
+        # Run zero-shot classification
+        result = self.classifier(
+            text,
+            candidate_labels,
+            hypothesis_template="This text is about {}",
+            multi_label=False
+        )
+        
+        # Extract top prediction
+        return (result['labels'][0], result['scores'][0])
     
-    def _is_casual_by_rules(self, text: str) -> bool:
+    def _apply_threshold(self, tier: str, result: Tuple[str, float]) -> Tuple[str, float]:
+        """Default low-confidence model answers to casual_chat."""
+        intent, confidence = result
+        if tier == "embedding":
+            threshold = settings.INTENT_EMBEDDING_CONFIDENCE_THRESHOLD
+        elif tier == "head":
+            # The head imitates the zero-shot model's scores
+            threshold = settings.INTENT_CONFIDENCE_THRESHOLD
+        elif tier == "zero_shot":
+            threshold = self.confidence_threshold
+        else:
+            return result
+        
+        # If confidence is below threshold, default to casual_chat
+        if confidence < threshold:
+            return ("casual_chat", confidence)
+        return (intent, confidence)
+    
+    def _record_call(self, tier: str, start: float) -> None:
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with self._stats_lock:
+            stats = self._tier_stats[tier]
+            stats["calls"] += 1
+            stats["total_ms"] += elapsed_ms
+    
+    def _record_hit(self, tier: str) -> None:
+        with self._stats_lock:
+            self._tier_stats[tier]["hits"] += 1
+    
+    def get_cascade_stats(self) -> Dict:
+        """
+        Get per-tier hit and latency statistics.
+        
+        Returns:
+            Dictionary with the tier order, request and fallback counts and,
+            per tier, how often it ran, how often it decided (hit rate over
+            all requests) and its mean latency
+        """
+        with self._stats_lock:
+            requests = self._requests
+            return {
+                "tiers": list(self.tiers),
+                "requests": requests,
+                "fallbacks": self._fallbacks,
+                "per_tier": {
+                    tier: {
+                        "calls": stats["calls"],
+                        "hits": stats["hits"],
+                        "hit_rate": round(stats["hits"] / requests, 3) if requests else 0.0,
+                        "avg_ms": round(stats["total_ms"] / stats["calls"], 3) if stats["calls"] else 0.0
+                    }
+                    for tier, stats in self._tier_stats.items()
+                }
+            }
+    
+    def is_casual_by_rules(self, text: str) -> bool:
         """
         Check if text matches casual conversation patterns.
         
@@ -119,9 +574,9 @@ class IntentClassificationService:
         """
         text_lower = text.lower().strip()
         
-        # Check against regex patterns
-        for pattern in self.CASUAL_PATTERNS:
-            if re.match(pattern, text_lower, re.IGNORECASE):
+        # Check against compiled regex patterns
+        for pattern in self._CASUAL_REGEXES:
+            if pattern.match(text_lower):
                 return True
         
         # Check for very short inputs (likely greetings)
@@ -132,38 +587,73 @@ class IntentClassificationService:
         
         return False
     
-    def _classify_by_heuristics(self, text: str) -> Tuple[str, float]:
+    def _keyword_counts(self, text: str, strong_only: bool = False, negated: bool = False) -> Dict[str, int]:
         """
-        Fallback classification using keyword heuristics.
+        Count distinct intent keywords in text (whole words only).
         
         Args:
             text: Input text
-            
+            strong_only: Count only the strong keywords
+            negated: Count negated keywords ("not angry") instead of asserted ones
+        
         Returns:
-            Tuple of (intent, confidence)
+            Intent -> number of distinct keywords
         """
         text_lower = text.lower()
+        patterns = self._STRONG_KEYWORD_REGEXES if strong_only else self._KEYWORD_REGEXES
+        return {
+            intent: len({
+                match.group(0) for match in pattern.finditer(text_lower)
+                if bool(self._NEGATION_REGEX.search(text_lower[:match.start()])) == negated
+            })
+            for intent, pattern in patterns.items()
+        }
+    
+    def _score_lexical(self, text: str) -> Optional[Tuple[str, float]]:
+        """
+        Answer from unambiguous intent keywords.
         
-        # Emotional keywords
-        emotional_keywords = [
-            'feel', 'feeling', 'anxious', 'worried', 'sad', 'depressed',
-            'stressed', 'confused', 'guilty', 'angry', 'frustrated',
-            'overwhelmed', 'scared', 'afraid', 'hurt', 'pain', 'suffering',
-            'lost', 'don\'t know', 'dont know', 'career', 'life', 'future',
-            'problem', 'issue', 'struggle', 'difficult', 'hard', 'tough',
-            'upset', 'disappointed', 'hopeless', 'helpless', 'stuck'
-        ]
+        The tier only answers when text contains strong keywords of one
+        intent, no keyword (strong or generic) of the other and no negated
+        keyword; generic words like "life" or "career" never decide on
+        their own. The raw score grows with the number of distinct strong
+        keywords and is only a probability once calibrated.
         
-        # Spiritual keywords
-        spiritual_keywords = [
-            'dharma', 'karma', 'krishna', 'arjuna', 'gita', 'bhagavad',
-            'yoga', 'meditation', 'enlightenment', 'moksha', 'atman',
-            'brahman', 'duty', 'purpose', 'meaning', 'wisdom', 'teaching'
-        ]
+        Args:
+            text: Input text
+            
+        Returns:
+            Tuple of (intent, raw score), or None if the keywords are missing,
+            mixed or negated
+        """
+        if any(self._keyword_counts(text, negated=True).values()):
+            return None
         
+        strong = self._keyword_counts(text, strong_only=True)
+        matched = [intent for intent, count in strong.items() if count]
+        if len(matched) != 1:
+            return None
+        
+        intent = matched[0]
+        counts = self._keyword_counts(text)
+        if any(count for other, count in counts.items() if other != intent):
+            return None
+        return (intent, 1.0 - 0.5 ** strong[intent])
+    
+    def _classify_by_heuristics(self, text: str) -> Tuple[str, float]:
+        """
+        Fallback classification using keyword heuristics.
+        
+        Args:
+            text: Input text
+            
+        Returns:
+            Tuple of (intent, confidence)
+        """
         # Count keyword matches
-        emotional_score = sum(1 for kw in emotional_keywords if kw in text_lower)
-        spiritual_score = sum(1 for kw in spiritual_keywords if kw in text_lower)
+        counts = self._keyword_counts(text)
+        emotional_score = counts["emotional_query"]
+        spiritual_score = counts["spiritual_guidance"]
         
         # Determine intent based on scores
         if emotional_score > spiritual_score and emotional_score > 0:
@@ -179,7 +669,7 @@ class IntentClassificationService:
         
         Args:
             intent: Intent label
-            
+        
         Returns:
             Description string
         """
@@ -191,13 +681,13 @@ class IntentClassificationService:
         return descriptions.get(intent, "Unknown intent")
 
 
-# Singleton instance
-_intent_service = None
+# Singleton instance (owned by the process-wide model registry)
+model_registry.register("intent_classification", IntentClassificationService)
 
 
 def get_intent_service() -> IntentClassificationService:
     """Get or create singleton intent classification service instance."""
-    global _intent_service
-    if _intent_service is None:
-        _intent_service = IntentClassificationService()
-    return _intent_service
+    if settings.INTENT_MODEL == EMBEDDING_INTENT_MODEL or settings.INTENT_CASCADE:
+        # Load the encoder first so its memory is attributed to sentence_encoder
+        model_registry.get("sentence_encoder")
+    return model_registry.get("intent_classification")
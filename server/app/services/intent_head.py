@@ -0,0 +1,127 @@
+"""
+Distilled intent head on sentence embeddings.
+
+A tiny softmax-regression or one-hidden-layer MLP trained offline by
+scripts/distill_intent_head.py on historical user inputs labelled by the
+full intent classifier. It scores the retrieval encoder's embedding with
+one or two NumPy matrix products, so inference costs microseconds once
+the embedding exists.
+
+File layout (.npz): "labels" (intent labels), "encoder" (signature of the
+embedding encoder the head was trained on: model, backend and ONNX file,
+see encoder_signature()), and "weights_<i>" / "bias_<i>" per layer; hidden
+layers use ReLU and the last layer is softmaxed.
+"""
+from typing import List, Optional, Sequence, Tuple
+import numpy as np
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class IntentHead:
+    """Softmax classifier (optionally with ReLU hidden layers) over embeddings."""
+    
+    def __init__(self, layers: Sequence[Tuple[np.ndarray, np.ndarray]], labels: Sequence[str], encoder: str):
+        """
+        Create a head from trained weights.
+        
+        Args:
+            layers: (weights, bias) per layer, weights shaped (inputs, outputs)
+            labels: Intent label per output column
+            encoder: Signature of the embedding encoder the head was trained on
+        """
+        self.layers = [
+            (np.ascontiguousarray(weights, dtype=np.float32), np.asarray(bias, dtype=np.float32))
+            for weights, bias in layers
+        ]
+        self.labels: List[str] = list(labels)
+        self.encoder = encoder
+    
+    @classmethod
+    def load(cls, path: str) -> "IntentHead":
+        """Load a head saved with save()."""
+        with np.load(path, allow_pickle=False) as data:
+            layer_count = sum(1 for name in data.files if name.startswith("weights_"))
+            layers = [(data[f"weights_{i}"], data[f"bias_{i}"]) for i in range(layer_count)]
+            return cls(layers, [str(label) for label in data["labels"]], str(data["encoder"]))
+    
+    def save(self, path: str) -> None:
+        """Save the head as an uncompressed .npz file."""
+        arrays = {"labels": np.asarray(self.labels), "encoder": np.asarray(self.encoder)}
+        for i, (weights, bias) in enumerate(self.layers):
+            arrays[f"weights_{i}"] = weights
+            arrays[f"bias_{i}"] = bias
+        np.savez(path, **arrays)
+    
+    @property
+    def input_dim(self) -> int:
+        return self.layers[0][0].shape[0]
+    
+    def probabilities(self, embeddings: np.ndarray) -> np.ndarray:
+        """
+        Score message embeddings.
+        
+        Args:
+            embeddings: Embedding matrix from the head's encoder (one row per message)
+        
+        Returns:
+            Probability matrix of shape (messages, labels)
+        """
+        hidden = np.atleast_2d(np.asarray(embeddings, dtype=np.float32))
+        for weights, bias in self.layers[:-1]:
+            hidden = np.maximum(hidden @ weights + bias, 0.0)
+        weights, bias = self.layers[-1]
+        logits = hidden @ weights + bias
+        logits -= logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+    
+    def classify_embedding(self, embedding: np.ndarray) -> Tuple[str, float]:
+        """
+        Classify one message from its embedding.
+        
+        Args:
+            embedding: Message embedding from the head's encoder
+        
+        Returns:
+            Tuple of (intent_label, confidence)
+        """
+        probabilities = self.probabilities(embedding)[0]
+        label_id = int(probabilities.argmax())
+        return (self.labels[label_id], float(probabilities[label_id]))
+
+
+def load_intent_head(path: str, encoder: str, labels: Sequence[str], input_dim: int) -> Optional[IntentHead]:
+    """
+    Load the distilled intent head, or None if it is missing or incompatible.
+    
+    Args:
+        path: .npz file written by scripts/distill_intent_head.py
+        encoder: Signature of the encoder the service embeds messages with
+        labels: Intent labels the service routes on
+        input_dim: Embedding dimension of that encoder
+    
+    Returns:
+        IntentHead, or None if it could not be loaded or was trained for a
+        different encoder, embedding dimension or label set
+    """
+    try:
+        head = IntentHead.load(path)
+    except Exception as e:
+        logger.warning(f"Could not load intent head from {path}: {e}")
+        return None
+    
+    if head.encoder != encoder or set(head.labels) != set(labels):
+        logger.warning(
+            f"Ignoring intent head {path}: trained on {head.encoder} for {head.labels}, "
+            f"service uses {encoder} for {list(labels)}"
+        )
+        return None
+    
+    if head.input_dim != input_dim:
+        logger.warning(f"Ignoring intent head {path}: expects {head.input_dim}-d embeddings, encoder produces {input_dim}-d")
+        return None
+    
+    logger.info(f"Intent head loaded from {path} ({len(head.layers)} layer(s), {head.input_dim}-d input)")
+    return head
@@ -0,0 +1,205 @@
+"""
+Lexical (BM25) verse retrieval.
+
+An in-memory inverted index over verse text fields, used for keyword
+queries ("karma yoga", "sthitaprajna", quoted phrases) and as a
+model-free search path when the sentence encoder is unavailable.
+"""
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+import numpy as np
+import bisect
+import re
+import unicodedata
+
+# Common English words that carry no retrieval signal
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been before being
+below between both but by can did do does doing down during each few for from further had has
+have having he her here hers herself him himself his how i if in into is it its itself just me
+more most my myself no nor not now of off on once only or other our ours ourselves out over own
+same she should so some such than that the their theirs them themselves then there these they
+this those through to too under until up very was we were what when where which while who whom
+why will with you your yours yourself yourselves o thou thee thy thine unto
+""".split())
+
+TOKEN_PATTERN = re.compile(r"[\w\u0900-\u097F]+")
+PHRASE_PATTERN = re.compile(r'"([^"]+)"')
+
+
+def _fold_latin(token: str) -> str:
+    """Strip diacritics from romanized tokens (e.g. "sthitaprajña" -> "sthitaprajna")."""
+    if not any("a" <= char <= "z" for char in token):
+        # Devanagari vowel signs are combining marks, so leave those tokens alone
+        return token
+    decomposed = unicodedata.normalize("NFKD", token)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into normalized search terms.
+    
+    Text is lowercased, IAST diacritics are folded to ASCII and stopwords
+    are removed. Devanagari words are kept as-is.
+    
+    Args:
+        text: Text to tokenize
+    
+    Returns:
+        List of terms
+    """
+    tokens = TOKEN_PATTERN.findall(unicodedata.normalize("NFC", text).lower())
+    return [
+        folded for folded in (_fold_latin(token) for token in tokens)
+        if folded not in STOPWORDS and not folded.isdigit()
+    ]
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[Sequence[str]],
+    k: int = 60,
+    weights: Optional[Sequence[float]] = None
+) -> List[Tuple[str, float]]:
+    """
+    Fuse several rankings with (weighted) reciprocal rank fusion.
+    
+    Each item scores sum(weight / (k + rank)) over the rankings it appears in.
+    
+    Args:
+        rankings: Ranked lists of item IDs (best first)
+        k: Rank offset dampening the weight of top positions
+        weights: Weight per ranking (defaults to 1.0 for every ranking)
+    
+    Returns:
+        List of (item_id, fused_score) sorted by score (descending)
+    """
+    rankings = list(rankings)
+    weights = [1.0] * len(rankings) if weights is None else list(weights)
+    scores: Dict[str, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, item_id in enumerate(ranking, 1):
+            scores[item_id] = scores.get(item_id, 0.0) + weight / (k + rank)
+    return sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+
+class BM25Index:
+    """
+    Okapi BM25 inverted index over a fixed list of documents.
+    
+    Postings are stored as NumPy arrays so scoring a query is one vectorized
+    update per query term. Query terms of five or more characters also match
+    longer terms they prefix, which catches Sanskrit compounds and
+    inflections ("sthitaprajna" -> "sthitaprajnasya").
+    """
+    
+    # Minimum query term length for prefix matching, and max expansions per term
+    PREFIX_MIN_LENGTH = 5
+    MAX_PREFIX_EXPANSIONS = 20
+    
+    def __init__(self, documents: Sequence[str], k1: float = 1.5, b: float = 0.75):
+        """
+        Build the index.
+        
+        Args:
+            documents: Document texts (row i of the index is documents[i])
+            k1: Term frequency saturation
+            b: Document length normalization
+        """
+        self.k1 = k1
+        self.b = b
+        
+        tokenized = [tokenize(document) for document in documents]
+        # Space-padded token strings, so phrases match on token boundaries
+        self._texts = [f" {' '.join(tokens)} " for tokens in tokenized]
+        self.doc_lengths = np.array([len(tokens) for tokens in tokenized], dtype=np.float32)
+        self.avg_doc_length = float(self.doc_lengths.mean()) if len(tokenized) else 0.0
+        
+        term_counts: Dict[str, Dict[int, int]] = {}
+        for row, tokens in enumerate(tokenized):
+            for token in tokens:
+                counts = term_counts.setdefault(token, {})
+                counts[row] = counts.get(row, 0) + 1
+        
+        n_docs = len(tokenized)
+        self._postings: Dict[str, Tuple[np.ndarray, np.ndarray, float]] = {}
+        for term, counts in term_counts.items():
+            rows = np.fromiter(counts.keys(), dtype=np.int64, count=len(counts))
+            frequencies = np.fromiter(counts.values(), dtype=np.float32, count=len(counts))
+            idf = float(np.log(1 + (n_docs - len(counts) + 0.5) / (len(counts) + 0.5)))
+            self._postings[term] = (rows, frequencies, idf)
+        
+        self._vocabulary = sorted(self._postings)
+    
+    def __len__(self) -> int:
+        return len(self.doc_lengths)
+    
+    def _expand_term(self, term: str) -> List[str]:
+        """Get the indexed terms matching a query term (exact, plus prefix matches)."""
+        if len(term) < self.PREFIX_MIN_LENGTH:
+            return [term] if term in self._postings else []
+        
+        start = bisect.bisect_left(self._vocabulary, term)
+        matches = []
+        for candidate in self._vocabulary[start:start + self.MAX_PREFIX_EXPANSIONS]:
+            if not candidate.startswith(term):
+                break
+            matches.append(candidate)
+        return matches
+    
+    def score(self, query: str) -> np.ndarray:
+        """
+        Compute BM25 scores of all documents for a query.
+        
+        Documents containing a quoted phrase from the query are ranked above
+        all others.
+        
+        Args:
+            query: Query text
+        
+        Returns:
+            float32 array with one score per document
+        """
+        scores = np.zeros(len(self.doc_lengths), dtype=np.float32)
+        if not len(scores):
+            return scores
+        
+        terms = set()
+        for token in tokenize(query):
+            terms.update(self._expand_term(token))
+        
+        for term in terms:
+            rows, frequencies, idf = self._postings[term]
+            length_norm = 1 - self.b + self.b * self.doc_lengths[rows] / self.avg_doc_length
+            scores[rows] += idf * frequencies * (self.k1 + 1) / (frequencies + self.k1 * length_norm)
+        
+        for phrase in PHRASE_PATTERN.findall(query):
+            tokens = tokenize(phrase)
+            if not tokens:
+                continue
+            # " art " never matches inside " start "
+            normalized = f" {' '.join(tokens)} "
+            matches = np.array([normalized in text for text in self._texts])
+            if matches.any():
+                scores[matches] += scores.max() + 1.0
+        
+        return scores
+    
+    def search(self, query: str, top_k: int = 5) -> List[Tuple[int, float]]:
+        """
+        Get the best-matching documents for a query.
+        
+        Args:
+            query: Query text
+            top_k: Maximum number of documents to return
+        
+        Returns:
+            List of (row, score) for documents with a positive score, best first
+        """
+        scores = self.score(query)
+        top_k = min(top_k, int((scores > 0).sum()))
+        if top_k == 0:
+            return []
+        
+        top_rows = np.argpartition(-scores, top_k - 1)[:top_k]
+        top_rows = top_rows[np.argsort(-scores[top_rows])]
+        return [(int(row), float(scores[row])) for row in top_rows]
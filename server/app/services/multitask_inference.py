@@ -0,0 +1,138 @@
+"""
+Multi-task intent + emotion inference.
+
+Serves the model built by scripts/build_multitask_model.py: one RoBERTa
+backbone exported to ONNX with a 3-way intent head and the 28-way
+GoEmotions head. A single forward pass replaces the separate intent and
+emotion encoders for a chat turn.
+"""
+from transformers import AutoTokenizer
+from typing import Dict, List, Optional, Sequence, Tuple
+from pathlib import Path
+import numpy as np
+import onnxruntime as ort
+import json
+import logging
+from app.core.config import settings
+from app.core.registry import model_registry
+from app.services.emotion_detection import build_emotions, label_metadata, load_emotion_lexicon
+
+logger = logging.getLogger(__name__)
+
+# Written next to the ONNX file by the build script
+MULTITASK_CONFIG_FILE = "multitask_config.json"
+
+
+class MultiTaskInferenceService:
+    """
+    Intent classification and emotion detection from one ONNX call.
+    
+    The ONNX graph outputs "intent_logits" (softmax over intents) and
+    "emotion_logits" (independent sigmoid per GoEmotions label). Emotion
+    results go through the same keyword boosting, thresholding and
+    emoji/color mapping as EmotionDetectionService (build_emotions()).
+    """
+    
+    def __init__(self, model_dir: Optional[str] = None, file_name: Optional[str] = None):
+        """
+        Load the multi-task model.
+        
+        Args:
+            model_dir: Build output directory (defaults to settings.MULTITASK_MODEL)
+            file_name: ONNX file inside model_dir (defaults to settings.MULTITASK_MODEL_FILE)
+        """
+        model_dir = Path(model_dir or settings.MULTITASK_MODEL)
+        file_name = file_name or settings.MULTITASK_MODEL_FILE
+        
+        with open(model_dir / MULTITASK_CONFIG_FILE) as f:
+            config = json.load(f)
+        self.intent_labels: List[str] = config["intent_labels"]
+        self.emotion_labels: List[str] = config["emotion_labels"]
+        
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        session_options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+        session_options.inter_op_num_threads = 1
+        if settings.EMOTION_ORT_THREADS > 0:
+            session_options.intra_op_num_threads = settings.EMOTION_ORT_THREADS
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(str(model_dir), use_fast=True)
+        self.session = ort.InferenceSession(
+            str(model_dir / file_name),
+            sess_options=session_options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self.output_names = ["intent_logits", "emotion_logits"]
+        self.max_length = min(self.tokenizer.model_max_length, config.get("max_length", 512))
+        self.intent_threshold = settings.INTENT_CONFIDENCE_THRESHOLD
+        
+        self.lexicon = load_emotion_lexicon(self.emotion_labels)
+        self._label_meta = label_metadata(self.emotion_labels)
+        logger.info(f"Multi-task model loaded from {model_dir} ({file_name})")
+    
+    def predict(self, texts: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Run texts through the shared backbone and both heads.
+        
+        Args:
+            texts: Input texts
+        
+        Returns:
+            Tuple of (intent probabilities, emotion scores), one row per text
+        """
+        features = self.tokenizer(
+            list(texts),
+            padding=True,
+            truncation=True,
+            max_length=self.max_length,
+            return_tensors="np"
+        )
+        inputs = {
+            name: np.asarray(value, dtype=np.int64)
+            for name, value in features.items()
+            if name in self.input_names
+        }
+        intent_logits, emotion_logits = self.session.run(self.output_names, inputs)
+        
+        intent_logits = intent_logits - intent_logits.max(axis=1, keepdims=True)
+        intent_probabilities = np.exp(intent_logits)
+        intent_probabilities /= intent_probabilities.sum(axis=1, keepdims=True)
+        
+        # Multi-label classification: independent sigmoid per label
+        emotion_scores = (1.0 / (1.0 + np.exp(-emotion_logits))).astype(np.float32)
+        return intent_probabilities.astype(np.float32), emotion_scores
+    
+    def analyze(self, text: str, threshold: float = 0.15) -> Tuple[str, float, List[Dict]]:
+        """
+        Classify intent and detect emotions for one message.
+        
+        Args:
+            text: User message
+            threshold: Minimum emotion confidence
+        
+        Returns:
+            Tuple of (intent, intent confidence, emotions). Low-confidence
+            intents default to casual_chat, as in IntentClassificationService;
+            emotions match the EmotionDetectionService.detect_emotion format
+        """
+        intent_probabilities, emotion_scores = self.predict([text])
+        
+        label_id = int(intent_probabilities[0].argmax())
+        intent, confidence = self.intent_labels[label_id], float(intent_probabilities[0, label_id])
+        if confidence < self.intent_threshold:
+            intent = "casual_chat"
+        
+        emotions = build_emotions(
+            text, self.emotion_labels, emotion_scores[0], threshold, self.lexicon, self._label_meta
+        )
+        return intent, confidence, emotions
+
+
+# Singleton instance (owned by the process-wide model registry)
+model_registry.register("multitask_inference", MultiTaskInferenceService)
+
+
+def get_multitask_service() -> MultiTaskInferenceService:
+    """Get or create singleton multi-task inference service instance."""
+    return model_registry.get("multitask_inference")
@@ -1,6 +1,7 @@
 import google.generativeai as genai
-from typing import Dict, List, Optional
+from typing import Dict, Iterator, List, Optional
 from app.core.config import settings
+from app.core.registry import model_registry
 
 
 class ReflectionGenerationService:
@@ -55,6 +56,46 @@ class ReflectionGenerationService:
             ValueError: If interaction_mode is invalid
             Exception: If Gemini API fails (should be handled by caller)
         """
+        # Same prompt, validation and error handling as the streamed reflection
+        chunks = self.stream_reflection(
+            user_input=user_input,
+            emotion_data=emotion_data,
+            verses=verses,
+            interaction_mode=interaction_mode,
+            conversation_history=conversation_history,
+            user_context=user_context
+        )
+        return self.clean_reflection("".join(chunks))
+    
+    def stream_reflection(
+        self,
+        user_input: str,
+        emotion_data: Dict,
+        verses: List[Dict],
+        interaction_mode: str = "wisdom",
+        conversation_history: Optional[List[Dict]] = None,
+        user_context: Optional[List[str]] = None
+    ) -> Iterator[str]:
+        """
+        Generate the reflection as Gemini produces it.
+        
+        Chunks are raw model output; clean_reflection() applied to the
+        joined chunks gives the same text as generate_reflection().
+        
+        Args:
+            user_input: User's original message
+            emotion_data: Detected emotion with confidence, emoji, color
+            verses: List of relevant verses from vector search
+            interaction_mode: One of 'socratic', 'wisdom', 'story'
+            conversation_history: Recent conversation context
+            
+        Yields:
+            Text chunks in order
+            
+        Raises:
+            ValueError: If interaction_mode is invalid (before any chunk)
+            Exception: If Gemini API fails, possibly after some chunks
+        """
         if interaction_mode not in self.prompts:
             raise ValueError(f"Invalid interaction mode: {interaction_mode}. Must be one of: {list(self.prompts.keys())}")
         
@@ -73,19 +114,31 @@ class ReflectionGenerationService:
             )
             
             # Generate reflection using Gemini
-            response = self.model.generate_content(prompt)
+            produced = False
+            for chunk in self.model.generate_content(prompt, stream=True):
+                if chunk.text:
+                    produced = True
+                    yield chunk.text
             
-            if not response.text:
+            if not produced:
                 raise Exception("Empty response from Gemini API")
             
-            # Clean up the response for better markdown rendering
-            cleaned_response = self._clean_markdown_response(response.text.strip())
-            return cleaned_response
-            
         except Exception as e:
             # Re-raise for caller to handle with fallback
             raise Exception(f"Gemini API error: {str(e)}")
     
+    def clean_reflection(self, text: str) -> str:
+        """
+        Clean up a complete streamed reflection for markdown rendering.
+        
+        Args:
+            text: Joined chunks from stream_reflection()
+            
+        Returns:
+            Cleaned markdown reflection
+        """
+        return self._clean_markdown_response(text.strip())
+    
     def _build_prompt(
         self,
         user_input: str,
@@ -720,12 +773,10 @@ The Bhagavad Gita teaches us that all experiences - joy and sorrow, gain and los
 *All of this is indeed the Divine - including your pain, your questions, and your journey toward peace.*"""
 
 
-# Singleton instance
-_reflection_service = None
+# Singleton instance (owned by the process-wide model registry)
+model_registry.register("reflection_generation", ReflectionGenerationService)
+
 
 def get_reflection_service() -> ReflectionGenerationService:
     """Get or create singleton reflection generation service instance."""
-    global _reflection_service
-    if _reflection_service is None:
-        _reflection_service = ReflectionGenerationService()
-    return _reflection_service
\ No newline at end of file
+    return model_registry.get("reflection_generation")
@@ -0,0 +1,224 @@
+"""
+Sentence encoder backends for verse retrieval.
+
+Provides a PyTorch SentenceTransformer backend and an ONNX Runtime backend
+(optionally int8-quantized) that reproduces sentence-transformers mean
+pooling and normalization without importing torch.
+"""
+from transformers import AutoTokenizer
+from huggingface_hub import hf_hub_download
+from typing import List, Optional, Union
+from pathlib import Path
+import numpy as np
+import onnxruntime as ort
+import json
+import logging
+from app.core.config import settings
+from app.core.registry import model_registry
+
+logger = logging.getLogger(__name__)
+
+
+def resolve_model_id(model_name: str) -> str:
+    """
+    Resolve short sentence-transformers model names to their Hub repository.
+    
+    Args:
+        model_name: Model name (e.g., "all-mpnet-base-v2")
+    
+    Returns:
+        Hub model ID (e.g., "sentence-transformers/all-mpnet-base-v2")
+    """
+    if "/" in model_name or Path(model_name).exists():
+        return model_name
+    return f"sentence-transformers/{model_name}"
+
+
+class OnnxSentenceEncoder:
+    """
+    Sentence encoder running a transformer exported to ONNX.
+    
+    Produces the same embeddings as SentenceTransformer: token embeddings are
+    mean-pooled over the attention mask and L2-normalized when the model
+    pipeline includes a Normalize module. Exposes the subset of the
+    SentenceTransformer.encode() API used by the services.
+    """
+    
+    def __init__(self, model_name: str, file_name: str = "onnx/model.onnx"):
+        """
+        Load the tokenizer and ONNX Runtime session.
+        
+        Args:
+            model_name: Hub model ID, short sentence-transformers name or local directory
+            file_name: ONNX file inside the model repository, or a local path
+                (e.g., "onnx/model_qint8_avx512_vnni.onnx" for int8)
+        """
+        self.model_id = resolve_model_id(model_name)
+        self.tokenizer = AutoTokenizer.from_pretrained(self.model_id)
+        
+        model_path = Path(file_name)
+        if not model_path.exists():
+            downloaded = self._get_model_file(file_name)
+            if downloaded is None:
+                raise FileNotFoundError(
+                    f"ONNX file '{file_name}' not found for {self.model_id}. "
+                    "Export one with: python -m scripts.export_sentence_encoder"
+                )
+            model_path = Path(downloaded)
+        
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        self.session = ort.InferenceSession(
+            str(model_path),
+            sess_options=session_options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        
+        self.max_seq_length = self._load_max_seq_length()
+        self.normalize_embeddings = self._uses_normalize_module()
+        logger.info(f"ONNX sentence encoder loaded from {self.model_id} ({model_path.name})")
+    
+    def _get_model_file(self, file_name: str) -> Optional[str]:
+        """
+        Get a file from the model directory or the Hugging Face Hub.
+        
+        Args:
+            file_name: Path relative to the model root
+        
+        Returns:
+            Local file path, or None if the file does not exist
+        """
+        local_path = Path(self.model_id) / file_name
+        if local_path.exists():
+            return str(local_path)
+        try:
+            return hf_hub_download(self.model_id, file_name)
+        except Exception:
+            return None
+    
+    def _load_max_seq_length(self) -> int:
+        """Read max_seq_length from sentence_bert_config.json (as SentenceTransformer does)."""
+        max_length = self.tokenizer.model_max_length
+        config_path = self._get_model_file("sentence_bert_config.json")
+        if config_path:
+            with open(config_path) as f:
+                max_length = json.load(f).get("max_seq_length", max_length)
+        return min(max_length, self.tokenizer.model_max_length)
+    
+    def _uses_normalize_module(self) -> bool:
+        """Check whether the sentence-transformers pipeline ends with a Normalize module."""
+        modules_path = self._get_model_file("modules.json")
+        if not modules_path:
+            return True
+        with open(modules_path) as f:
+            modules = json.load(f)
+        return any(module.get("type", "").endswith("Normalize") for module in modules)
+    
+    def encode(
+        self,
+        sentences: Union[str, List[str]],
+        batch_size: int = 32,
+        show_progress_bar: bool = False,
+        **kwargs
+    ) -> np.ndarray:
+        """
+        Encode sentences into embeddings.
+        
+        Args:
+            sentences: Sentence or list of sentences
+            batch_size: Number of sentences per ONNX call
+            show_progress_bar: Log progress per batch
+        
+        Returns:
+            float32 array of shape (n, dim), or (dim,) for a single string
+        """
+        single_input = isinstance(sentences, str)
+        if single_input:
+            sentences = [sentences]
+        
+        # Sort by length so each batch needs minimal padding
+        order = np.argsort([-len(sentence) for sentence in sentences], kind="stable")
+        embeddings = [None] * len(sentences)
+        
+        for start in range(0, len(sentences), batch_size):
+            batch_indices = order[start:start + batch_size]
+            batch_embeddings = self._encode_batch([sentences[i] for i in batch_indices])
+            for i, embedding in zip(batch_indices, batch_embeddings):
+                embeddings[i] = embedding
+            if show_progress_bar:
+                logger.info(f"Encoded {min(start + batch_size, len(sentences))}/{len(sentences)} sentences")
+        
+        result = np.stack(embeddings) if embeddings else np.zeros((0, 0), dtype=np.float32)
+        return result[0] if single_input else result
+    
+    def _encode_batch(self, sentences: List[str]) -> np.ndarray:
+        """
+        Run one padded batch through the ONNX model with mean pooling.
+        
+        Args:
+            sentences: Sentences in the batch
+        
+        Returns:
+            float32 array of shape (len(sentences), dim)
+        """
+        features = self.tokenizer(
+            sentences,
+            padding=True,
+            truncation=True,
+            max_length=self.max_seq_length,
+            return_tensors="np"
+        )
+        inputs = {
+            name: np.asarray(value, dtype=np.int64)
+            for name, value in features.items()
+            if name in self.input_names
+        }
+        token_embeddings = self.session.run(None, inputs)[0]
+        
+        # Mean pooling over non-padding tokens
+        mask = features["attention_mask"][..., np.newaxis].astype(np.float32)
+        summed = (token_embeddings * mask).sum(axis=1)
+        counts = np.clip(mask.sum(axis=1), 1e-9, None)
+        embeddings = (summed / counts).astype(np.float32)
+        
+        if self.normalize_embeddings:
+            norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+            embeddings /= np.maximum(norms, 1e-12)
+        
+        return embeddings
+
+
+def load_sentence_encoder(
+    model_name: Optional[str] = None,
+    backend: Optional[str] = None,
+    file_name: Optional[str] = None
+):
+    """
+    Create the sentence encoder for the configured backend.
+    
+    Args:
+        model_name: Embedding model (defaults to settings.EMBEDDING_MODEL)
+        backend: "torch" or "onnx" (defaults to settings.EMBEDDING_BACKEND)
+        file_name: ONNX file for the onnx backend (defaults to settings.EMBEDDING_MODEL_FILE)
+    
+    Returns:
+        Encoder exposing a SentenceTransformer-compatible encode()
+    """
+    model_name = model_name or settings.EMBEDDING_MODEL
+    backend = (backend or settings.EMBEDDING_BACKEND).lower()
+    
+    if backend == "onnx":
+        return OnnxSentenceEncoder(model_name, file_name or settings.EMBEDDING_MODEL_FILE)
+    
+    if backend != "torch":
+        raise ValueError(f"Unknown embedding backend: {backend}. Must be 'torch' or 'onnx'")
+    
+    # Imported lazily so the ONNX backend never loads torch
+    from sentence_transformers import SentenceTransformer
+    return SentenceTransformer(model_name)
+
+
+# Singleton instance (owned by the process-wide model registry), shared by
+# verse retrieval and the embedding intent classifier
+model_registry.register("sentence_encoder", load_sentence_encoder)
@@ -1,16 +1,76 @@
-from sentence_transformers import SentenceTransformer
 import chromadb
-from typing import List, Dict, Optional
-import pandas as pd
+from fastapi import HTTPException
+from typing import List, Dict, Optional, Sequence, Tuple
+import numpy as np
+import hashlib
+import json
 import logging
 from pathlib import Path
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.registry import model_registry
+from app.services.analyzed_input import AnalyzedInput, query_fingerprint
+from app.services.sentence_encoder import load_sentence_encoder
+from app.services.lexical_search import BM25Index, reciprocal_rank_fusion
+from app.services.verse_artifact import load_verse_artifact, csv_content_hash, encoder_signature
+from app.services.verse_catalog import load_verses_from_csv
+from app.services.verse_reference import parse_verse_reference
 
 logger = logging.getLogger(__name__)
 
 
+def verse_content_hash(document: str, metadata: Dict) -> str:
+    """
+    Hash the indexed content of a verse to detect edits between CSV versions.
+    
+    Args:
+        document: Text that gets embedded
+        metadata: Verse metadata (without content_hash)
+        
+    Returns:
+        Hex digest of the document and metadata
+    """
+    payload = json.dumps(
+        {key: value for key, value in metadata.items() if key != "content_hash"},
+        sort_keys=True,
+        ensure_ascii=False,
+        default=str
+    )
+    return hashlib.sha256(f"{document}\n{payload}".encode("utf-8")).hexdigest()
+
+
+def compute_theme_affinities(encoder, embeddings: np.ndarray, theme_names: List[str]) -> np.ndarray:
+    """
+    Score every verse against embedded theme prototypes.
+    
+    Each theme (e.g. "self-control") is embedded and compared to every verse
+    embedding. Scores are min-max scaled per theme to [0, 1] so they can be
+    blended with cosine similarity.
+    
+    Args:
+        encoder: Sentence encoder used for the verse embeddings
+        embeddings: Verse embedding matrix
+        theme_names: Themes to score against (one output column each)
+        
+    Returns:
+        float32 matrix of shape (verses, themes)
+    """
+    prototypes = [theme.replace("_", " ").replace("-", " ") for theme in theme_names]
+    theme_embeddings = np.asarray(encoder.encode(prototypes), dtype=np.float32)
+    theme_embeddings /= np.maximum(np.linalg.norm(theme_embeddings, axis=1, keepdims=True), 1e-12)
+    
+    embeddings = np.asarray(embeddings, dtype=np.float32)
+    embeddings = embeddings / np.maximum(np.linalg.norm(embeddings, axis=1, keepdims=True), 1e-12)
+    
+    affinities = embeddings @ theme_embeddings.T
+    low = affinities.min(axis=0, keepdims=True)
+    high = affinities.max(axis=0, keepdims=True)
+    return ((affinities - low) / np.maximum(high - low, 1e-12)).astype(np.float32)
+
+
 class VectorSearchService:
     """
-    Service for semantic verse search using ChromaDB and SentenceTransformers.
+    Service for semantic verse search using ChromaDB and sentence embeddings.
     Handles initialization, verse search, and emotion-based re-ranking.
     """
     
@@ -56,90 +116,319 @@ class VectorSearchService:
         "surprise": ["acceptance", "adaptability", "learning"],
     }
     
-    def __init__(self, db_path: str = "./chroma_db"):
+    # Weight of emotion-theme alignment when re-ranking (rest is semantic similarity)
+    THEME_WEIGHT = 0.3
+    
+    # Number of best-matching themes reported per verse
+    VERSE_THEME_COUNT = 3
+    
+    # Retrieval modes: dense only, BM25 only, or both fused by reciprocal rank fusion
+    SEARCH_MODES = ("semantic", "lexical", "hybrid")
+    
+    def __init__(
+        self,
+        db_path: str = "./chroma_db",
+        search_engine: Optional[str] = None,
+        encoder=None,
+        csv_path: Optional[str] = None,
+        artifact_dir: Optional[str] = None
+    ):
         """
-        Initialize the VectorSearchService with SentenceTransformer model and ChromaDB client.
+        Initialize the VectorSearchService with a sentence encoder and ChromaDB client.
         
         Args:
             db_path: Path to ChromaDB persistent storage
+            search_engine: "numpy" for in-memory exact search or "chroma" for HNSW
+                queries (defaults to settings.VECTOR_SEARCH_ENGINE)
+            encoder: Pre-loaded sentence encoder (defaults to the configured
+                settings.EMBEDDING_MODEL / settings.EMBEDDING_BACKEND encoder)
+            csv_path: Verse CSV used to match precomputed embedding artifacts
+                (defaults to settings.VERSE_CSV_PATH)
+            artifact_dir: Directory with precomputed embedding artifacts
+                (defaults to settings.VERSE_ARTIFACT_DIR)
         """
+        self.search_engine = (search_engine or settings.VECTOR_SEARCH_ENGINE).lower()
+        self.db_path = db_path
+        self.csv_path = csv_path or settings.VERSE_CSV_PATH
+        self.artifact_dir = artifact_dir or settings.VERSE_ARTIFACT_DIR
+        
+        # ChromaDB client and collection are opened lazily on first use
+        self._client = None
+        self._collection = None
+        
+        # In-memory exact-search index (from an embedding artifact or ChromaDB)
+        self._artifact_csv_hash: Optional[str] = None
+        self._verse_matrix: Optional[np.ndarray] = None
+        self._verse_metadatas: List[Dict] = []
+        self._verse_ids: List[str] = []
+        self._id_to_row: Dict[str, int] = {}
+        
+        # Verse x theme affinity matrix (in [0, 1]) used for emotion re-ranking,
+        # with theme prototypes taken from EMOTION_THEME_MAP
+        self._theme_names: List[str] = self.get_theme_names()
+        theme_columns = {theme: column for column, theme in enumerate(self._theme_names)}
+        self._emotion_theme_columns: Dict[str, np.ndarray] = {
+            emotion: np.array([theme_columns[theme] for theme in themes])
+            for emotion, themes in self.EMOTION_THEME_MAP.items()
+        }
+        self._theme_matrix: Optional[np.ndarray] = None
+        self._verse_themes: List[List[str]] = []
+        
+        # BM25 index over EngMeaning, WordMeaning and Transliteration
+        self._lexical_index: Optional[BM25Index] = None
+        
+        # Query embedding cache (by fingerprint) and final result cache
+        # (by fingerprint, emotion, top_k)
+        self.embedding_cache = TTLCache(
+            max_size=settings.QUERY_EMBEDDING_CACHE_SIZE,
+            ttl_seconds=settings.QUERY_EMBEDDING_CACHE_TTL
+        )
+        self.result_cache = TTLCache(
+            max_size=settings.SEARCH_RESULT_CACHE_SIZE,
+            ttl_seconds=settings.SEARCH_RESULT_CACHE_TTL
+        )
+        
         try:
-            # Initialize SentenceTransformer model for embeddings
-            self.encoder = SentenceTransformer('all-mpnet-base-v2')
-            logger.info("SentenceTransformer model loaded successfully")
+            # Initialize sentence encoder for embeddings
+            self.encoder = encoder or load_sentence_encoder()
+            logger.info(f"Sentence encoder loaded successfully ({settings.EMBEDDING_BACKEND} backend)")
             
-            # Initialize ChromaDB persistent client
-            self.client = chromadb.PersistentClient(path=db_path)
+            # Prefer the memory-mapped artifact, which needs neither encoding nor ChromaDB.
+            # The chroma engine still loads the in-memory index for theme affinities.
+            if self.search_engine != "numpy" or not self._load_artifact_index():
+                self._load_in_memory_index()
             
+        except Exception as e:
+            logger.error(f"Failed to initialize VectorSearchService: {e}")
+            raise
+    
+    @property
+    def client(self):
+        """ChromaDB persistent client (opened on first access)."""
+        if self._client is None:
+            self._client = chromadb.PersistentClient(path=self.db_path)
+        return self._client
+    
+    @property
+    def collection(self):
+        """ChromaDB collection for Geeta verses (opened on first access)."""
+        if self._collection is None:
             # Get or create collection for Geeta verses
-            self.collection = self.client.get_or_create_collection(
+            self._collection = self.client.get_or_create_collection(
                 name="geeta_verses",
                 metadata={"hnsw:space": "cosine"}
             )
-            logger.info(f"ChromaDB collection initialized at {db_path}")
-            
+            logger.info(f"ChromaDB collection initialized at {self.db_path}")
+        return self._collection
+    
+    def _load_artifact_index(self) -> bool:
+        """
+        Memory-map the precomputed embedding artifact for the current CSV and encoder.
+        
+        Returns:
+            bool: True if a matching artifact was loaded
+        """
+        try:
+            artifact = load_verse_artifact(
+                self.artifact_dir,
+                self.csv_path,
+                settings.EMBEDDING_MODEL,
+                encoder_signature(settings.EMBEDDING_MODEL, settings.EMBEDDING_BACKEND, settings.EMBEDDING_MODEL_FILE)
+            )
         except Exception as e:
-            logger.error(f"Failed to initialize VectorSearchService: {e}")
-            raise
+            logger.warning(f"Could not load verse embedding artifact: {e}")
+            return False
+        
+        if artifact is None:
+            return False
+        
+        self._set_index(
+            artifact["ids"],
+            artifact["metadatas"],
+            artifact["embeddings"],
+            theme_matrix=self._align_theme_matrix(artifact["theme_names"], artifact["theme_affinities"])
+        )
+        self._artifact_csv_hash = csv_content_hash(self.csv_path)
+        logger.info(f"Loaded {len(artifact['ids'])} verses from embedding artifact in {self.artifact_dir}")
+        return True
     
-    def initialize_database(self, csv_path: str) -> bool:
+    def _set_index(
+        self,
+        ids: List[str],
+        metadatas: List[Dict],
+        matrix: Optional[np.ndarray],
+        theme_matrix: Optional[np.ndarray] = None
+    ) -> None:
         """
-        Load verses from CSV file and create embeddings in ChromaDB.
+        Replace the in-memory index.
+        
+        Args:
+            ids: Verse IDs (one per matrix row)
+            metadatas: Verse metadata (one per matrix row)
+            matrix: L2-normalized float32 embedding matrix, or None to clear the index
+            theme_matrix: Precomputed verse x theme affinities (computed from
+                matrix if not provided)
+        """
+        self._verse_matrix = matrix
+        self._verse_metadatas = list(metadatas)
+        self._verse_ids = list(ids)
+        self._id_to_row = {verse_id: row for row, verse_id in enumerate(self._verse_ids)}
+        
+        self._lexical_index = BM25Index([
+            " ".join(str(metadata.get(field) or "") for field in ("eng_meaning", "word_meaning", "transliteration"))
+            for metadata in self._verse_metadatas
+        ]) if self._verse_metadatas else None
+        
+        if matrix is None:
+            self._theme_matrix = None
+            self._verse_themes = []
+            return
+        
+        if theme_matrix is None:
+            theme_matrix = compute_theme_affinities(self.encoder, matrix, self._theme_names)
+        self._theme_matrix = theme_matrix
+        
+        top_columns = np.argsort(-theme_matrix, axis=1)[:, :self.VERSE_THEME_COUNT]
+        self._verse_themes = [
+            [self._theme_names[column] for column in columns]
+            for columns in top_columns
+        ]
+    
+    @classmethod
+    def get_theme_names(cls) -> List[str]:
+        """Get the sorted, de-duplicated themes of EMOTION_THEME_MAP."""
+        return sorted({theme for themes in cls.EMOTION_THEME_MAP.values() for theme in themes})
+    
+    def _align_theme_matrix(
+        self,
+        theme_names: Optional[List[str]],
+        theme_matrix: Optional[np.ndarray]
+    ) -> Optional[np.ndarray]:
+        """
+        Reorder stored theme affinity columns to the current theme order.
+        
+        Returns None (so affinities get recomputed) if the stored themes don't
+        cover the current EMOTION_THEME_MAP.
+        """
+        if theme_matrix is None or not theme_names:
+            return None
+        stored_columns = {theme: column for column, theme in enumerate(theme_names)}
+        if any(theme not in stored_columns for theme in self._theme_names):
+            return None
+        return np.asarray(theme_matrix, dtype=np.float32)[:, [stored_columns[theme] for theme in self._theme_names]]
+    
+    def get_theme_index(self) -> Tuple[List[str], Optional[np.ndarray]]:
+        """
+        Get the theme names and verse x theme affinity matrix.
+        
+        Returns:
+            Tuple of (theme names, affinity matrix or None if no index is loaded)
+        """
+        return self._theme_names, self._theme_matrix
+    
+    def _load_in_memory_index(self) -> None:
+        """
+        Load all verse embeddings and metadata from ChromaDB into memory.
+        
+        Embeddings are stored as an L2-normalized float32 matrix so that cosine
+        similarity against a normalized query is a single matrix-vector product.
+        """
+        results = self.collection.get(include=["embeddings", "metadatas"])
+        
+        if not results['ids']:
+            logger.info("ChromaDB collection is empty, in-memory index not loaded")
+            self._set_index([], [], None)
+            return
+        
+        matrix = np.asarray(results['embeddings'], dtype=np.float32)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.maximum(norms, 1e-12)
+        
+        self._set_index(results['ids'], results['metadatas'], matrix)
+        self._artifact_csv_hash = None
+        logger.info(f"Loaded {len(self._verse_ids)} verses into in-memory search index")
+    
+    def _use_in_memory_index(self) -> bool:
+        """Check whether searches should be served from the in-memory index."""
+        return self.search_engine == "numpy" and self._verse_matrix is not None
+    
+    def initialize_database(self, csv_path: str, batch_size: int = 64) -> bool:
+        """
+        Sync verses from CSV file into ChromaDB incrementally.
+        
+        Each verse's content hash is stored in its metadata. Only new or
+        changed verses are re-embedded (in batches) and upserted, and verses
+        no longer in the CSV are deleted, so editing one translation costs
+        one encode.
         
         Args:
             csv_path: Path to the Bhagavad Gita CSV file
+            batch_size: Number of verses to encode and upsert per batch
             
         Returns:
             bool: True if successful, False otherwise
         """
         try:
-            # Check if collection already has data
-            if self.collection.count() > 0:
-                logger.info(f"Collection already contains {self.collection.count()} verses")
+            # A matching embedding artifact already holds this CSV's verses
+            if (
+                self.search_engine == "numpy"
+                and self._artifact_csv_hash is not None
+                and self._artifact_csv_hash == csv_content_hash(csv_path)
+            ):
+                logger.info("Verses served from precomputed embedding artifact, skipping ChromaDB")
                 return True
             
-            # Read CSV file
-            df = pd.read_csv(csv_path)
-            logger.info(f"Loaded {len(df)} verses from {csv_path}")
+            # Read CSV file and hash each verse's content
+            ids, documents, metadatas = load_verses_from_csv(csv_path)
+            for document, metadata in zip(documents, metadatas):
+                metadata["content_hash"] = verse_content_hash(document, metadata)
             
-            # Prepare data for ChromaDB
-            documents = []
-            metadatas = []
-            ids = []
+            # Diff against the hashes already stored in ChromaDB
+            existing = self.collection.get(include=["metadatas"])
+            existing_hashes = {
+                verse_id: (metadata or {}).get("content_hash")
+                for verse_id, metadata in zip(existing['ids'], existing['metadatas'])
+            }
             
-            for _, row in df.iterrows():
-                # Concatenate Shloka and EngMeaning for embedding
-                document = f"{row['Shloka']} {row['EngMeaning']}"
-                documents.append(document)
-                
-                # Prepare metadata (ChromaDB only supports str, int, float, bool)
-                metadata = {
-                    "id": row['ID'],
-                    "chapter": int(row['Chapter']),
-                    "verse": int(row['Verse']),
-                    "shloka": row['Shloka'],
-                    "transliteration": row.get('Transliteration', ''),
-                    "eng_meaning": row['EngMeaning'],
-                    "hin_meaning": row.get('HinMeaning', ''),
-                    "word_meaning": row.get('WordMeaning', ''),
-                    # Remove themes array as ChromaDB doesn't support lists in metadata
-                }
-                metadatas.append(metadata)
-                ids.append(row['ID'])
-            
-            # Generate embeddings and add to collection
-            logger.info("Generating embeddings...")
-            embeddings = self.encoder.encode(documents, show_progress_bar=True)
-            
-            # Add to ChromaDB collection
-            self.collection.add(
-                documents=documents,
-                embeddings=embeddings.tolist(),
-                metadatas=metadatas,
-                ids=ids
+            changed = [
+                i for i, verse_id in enumerate(ids)
+                if existing_hashes.get(verse_id) != metadatas[i]["content_hash"]
+            ]
+            csv_ids = set(ids)
+            removed = [verse_id for verse_id in existing_hashes if verse_id not in csv_ids]
+            
+            if not changed and not removed:
+                logger.info(f"Collection is up to date ({len(ids)} verses)")
+                return True
+            
+            new_count = sum(1 for i in changed if ids[i] not in existing_hashes)
+            logger.info(
+                f"Re-indexing verses: {new_count} new, {len(changed) - new_count} changed, "
+                f"{len(removed)} removed"
             )
             
-            logger.info(f"Successfully added {len(documents)} verses to ChromaDB")
+            # Re-embed only new or changed verses, in batches
+            for start in range(0, len(changed), batch_size):
+                batch = changed[start:start + batch_size]
+                batch_documents = [documents[i] for i in batch]
+                embeddings = self.encoder.encode(batch_documents)
+                
+                self.collection.upsert(
+                    documents=batch_documents,
+                    embeddings=np.asarray(embeddings).tolist(),
+                    metadatas=[metadatas[i] for i in batch],
+                    ids=[ids[i] for i in batch]
+                )
+            
+            if removed:
+                self.collection.delete(ids=removed)
+            
+            logger.info(f"Successfully synced {len(ids)} verses to ChromaDB")
+            
+            # Cached results may refer to the previous index contents
+            self.result_cache.clear()
+            self._load_in_memory_index()
+            
             return True
             
         except Exception as e:
@@ -150,7 +439,9 @@ class VectorSearchService:
         self,
         query: str,
         emotion: Optional[str] = None,
-        top_k: int = 5
+        top_k: int = 5,
+        mode: Optional[str] = None,
+        analyzed: Optional[AnalyzedInput] = None
     ) -> List[Dict]:
         """
         Search for relevant verses based on semantic similarity.
@@ -160,52 +451,460 @@ class VectorSearchService:
             query: User input text to search for
             emotion: Detected emotion for re-ranking (optional)
             top_k: Number of verses to return
+            mode: "semantic", "lexical" or "hybrid" (defaults to settings.VECTOR_SEARCH_MODE)
+            analyzed: Shared analysis of query whose fingerprint and embedding are reused (optional)
             
         Returns:
             List of verse dictionaries with similarity scores
         """
+        return self.search_verses_batch([query], [emotion], top_k, mode, [analyzed])[0]
+    
+    def search_verses_batch(
+        self,
+        queries: List[str],
+        emotions: Optional[List[Optional[str]]] = None,
+        top_k: int = 5,
+        mode: Optional[str] = None,
+        analyzed: Optional[Sequence[Optional[AnalyzedInput]]] = None
+    ) -> List[List[Dict]]:
+        """
+        Search for relevant verses for several queries at once.
+        
+        All queries are encoded in a single encoder batch and scored
+        against the verse matrix in one matrix product. In hybrid mode the
+        dense ranking is fused with a BM25 ranking by reciprocal rank fusion
+        and results are sorted by "rrf_score" rather than "similarity_score";
+        lexical mode (also used when the encoder fails) needs no model at all.
+        
+        Args:
+            queries: User input texts to search for
+            emotions: Detected emotion per query for re-ranking (optional,
+                must have the same length as queries)
+            top_k: Number of verses to return per query
+            mode: "semantic", "lexical" or "hybrid" (defaults to settings.VECTOR_SEARCH_MODE)
+            analyzed: Shared analysis per query (optional, same length as
+                queries); their fingerprints and embeddings are reused
+            
+        Returns:
+            One list of verse dictionaries with similarity scores per query
+        """
+        if not queries:
+            return []
+        
+        if emotions is None:
+            emotions = [None] * len(queries)
+        if len(emotions) != len(queries):
+            raise ValueError("emotions must have the same length as queries")
+        if analyzed is None:
+            analyzed = [None] * len(queries)
+        if len(analyzed) != len(queries):
+            raise ValueError("analyzed must have the same length as queries")
+        
+        mode = (mode or settings.VECTOR_SEARCH_MODE).lower()
+        if mode not in self.SEARCH_MODES:
+            raise ValueError(f"Invalid search mode: {mode}. Must be one of: {list(self.SEARCH_MODES)}")
+        if mode != "semantic" and self._lexical_index is None:
+            mode = "semantic"
+        
         try:
-            # Generate query embedding
-            query_embedding = self.encoder.encode([query])
-            
-            # Search in ChromaDB
-            results = self.collection.query(
-                query_embeddings=query_embedding.tolist(),
-                n_results=top_k * 2 if emotion else top_k,  # Get more results if we'll re-rank
-                include=["metadatas", "distances"]
-            )
+            # Direct references ("BG 2.47") are resolved by ID without any model
+            results = [self.find_verses_by_reference(query) for query in queries]
+            results = [verses[:top_k] if verses else None for verses in results]
             
-            # Convert results to list of dictionaries
-            verses = []
-            for i in range(len(results['ids'][0])):
-                metadata = results['metadatas'][0][i]
-                distance = results['distances'][0][i]
-                similarity_score = 1 - distance  # Convert distance to similarity
-                
-                verse = {
-                    "id": metadata["id"],
-                    "chapter": metadata["chapter"],
-                    "verse": metadata["verse"],
-                    "shloka": metadata["shloka"],
-                    "transliteration": metadata["transliteration"],
-                    "eng_meaning": metadata["eng_meaning"],
-                    "hin_meaning": metadata["hin_meaning"],
-                    "word_meaning": metadata["word_meaning"],
-                    "themes": [],  # Empty list for compatibility
-                    "similarity_score": similarity_score
-                }
-                verses.append(verse)
+            fingerprints = [
+                analysis.fingerprint if analysis is not None else query_fingerprint(query)
+                for query, analysis in zip(queries, analyzed)
+            ]
+            cache_keys = [
+                (fingerprint, emotion.lower() if emotion else None, top_k, mode)
+                for fingerprint, emotion in zip(fingerprints, emotions)
+            ]
+            results = [
+                verses if verses is not None else self.result_cache.get(key)
+                for verses, key in zip(results, cache_keys)
+            ]
+            pending = [i for i, cached in enumerate(results) if cached is None]
             
-            # Apply emotion-based re-ranking if emotion is provided
-            if emotion:
-                verses = self._rerank_by_emotion(verses, emotion)
+            if pending:
+                pending_queries = [queries[i] for i in pending]
+                pending_emotions = [emotions[i] for i in pending]
+                search_mode = mode
+                
+                # Get more results for queries we'll re-rank
+                n_results = top_k * 2 if any(pending_emotions) else top_k
+                
+                query_embeddings = None
+                if search_mode != "lexical":
+                    try:
+                        # Generate query embeddings in one batch (cached per fingerprint)
+                        query_embeddings = self._encode_queries(
+                            pending_queries,
+                            [fingerprints[i] for i in pending],
+                            [analyzed[i] for i in pending]
+                        )
+                    except Exception as e:
+                        if self._lexical_index is None:
+                            raise
+                        logger.warning(f"Query encoding failed, falling back to lexical search: {e}")
+                        search_mode = "lexical"
+                
+                if search_mode == "lexical":
+                    candidates = [
+                        self._rerank_by_emotion(verses, emotion) if emotion else verses
+                        for verses, emotion in zip(self._search_lexical(pending_queries, n_results), pending_emotions)
+                    ]
+                else:
+                    if self._use_in_memory_index():
+                        # Emotion re-ranking is blended into the candidate scores directly
+                        candidates = self._search_in_memory(query_embeddings, n_results, pending_emotions)
+                    else:
+                        candidates = self._search_chroma(query_embeddings, n_results)
+                        candidates = [
+                            self._rerank_by_emotion(verses, emotion) if emotion else verses
+                            for verses, emotion in zip(candidates, pending_emotions)
+                        ]
+                    
+                    if search_mode == "hybrid":
+                        candidates = self._fuse_with_lexical(
+                            candidates, pending_queries, query_embeddings, pending_emotions, n_results
+                        )
+                
+                for i, verses in zip(pending, candidates):
+                    # Keep top_k results (degraded fallback results are not cached)
+                    results[i] = verses[:top_k]
+                    if results[i] and search_mode == mode:
+                        self.result_cache.set(cache_keys[i], [dict(verse) for verse in results[i]])
             
-            # Return top_k results
-            return verses[:top_k]
+            # Return copies so callers can't mutate cached entries
+            return [[dict(verse) for verse in verses] for verses in results]
             
         except Exception as e:
             logger.error(f"Failed to search verses: {e}")
+            return [[] for _ in queries]
+    
+    def _encode_queries(
+        self,
+        queries: List[str],
+        fingerprints: List[str],
+        analyzed: Optional[Sequence[Optional[AnalyzedInput]]] = None
+    ) -> np.ndarray:
+        """
+        Encode queries, reusing cached embeddings for known fingerprints.
+        
+        Queries with an AnalyzedInput use (and, if needed, compute) its
+        shared embedding. Only the remaining queries whose fingerprint is not
+        cached are sent to the encoder, in a single batch.
+        
+        Args:
+            queries: Query texts
+            fingerprints: Fingerprint of each query (see query_fingerprint)
+            analyzed: Shared analysis per query (optional)
+            
+        Returns:
+            Query embedding matrix (one row per query)
+        """
+        embeddings: Dict[str, np.ndarray] = {}
+        to_encode: Dict[str, str] = {}
+        
+        for query, fingerprint, analysis in zip(queries, fingerprints, analyzed or [None] * len(queries)):
+            if fingerprint in embeddings or fingerprint in to_encode:
+                continue
+            if analysis is not None and analysis.can_embed:
+                # Computed at most once per request and kept for later stages
+                embeddings[fingerprint] = analysis.embedding
+                continue
+            cached = self.embedding_cache.get(fingerprint)
+            if cached is None:
+                to_encode[fingerprint] = query
+            else:
+                embeddings[fingerprint] = cached
+        
+        if to_encode:
+            encoded = self.encoder.encode(list(to_encode.values()))
+            for fingerprint, embedding in zip(to_encode.keys(), encoded):
+                embedding = np.asarray(embedding, dtype=np.float32)
+                self.embedding_cache.set(fingerprint, embedding)
+                embeddings[fingerprint] = embedding
+        
+        return np.stack([embeddings[fingerprint] for fingerprint in fingerprints])
+    
+    def embed_query(self, query: str, fingerprint: Optional[str] = None) -> np.ndarray:
+        """
+        Encode one query through the query embedding cache.
+        
+        Args:
+            query: Query text
+            fingerprint: Precomputed fingerprint of query (optional)
+            
+        Returns:
+            Query embedding
+        """
+        return self._encode_queries([query], [fingerprint or query_fingerprint(query)])[0]
+    
+    def analyze(self, text: str) -> AnalyzedInput:
+        """
+        Create the shared per-request analysis of a user message.
+        
+        Its embedding comes from this service's encoder and query embedding
+        cache, so it is computed at most once per request (and not at all
+        for recently seen messages).
+        
+        Args:
+            text: User message
+            
+        Returns:
+            AnalyzedInput for text
+        """
+        return AnalyzedInput(text, embed=self.embed_query, tokenizer=getattr(self.encoder, "tokenizer", None))
+    
+    def get_cache_stats(self) -> Dict[str, Dict]:
+        """
+        Get hit/miss/eviction statistics for the query caches.
+        
+        Returns:
+            Dictionary with stats for the embedding and result caches
+        """
+        return {
+            "query_embeddings": self.embedding_cache.stats(),
+            "search_results": self.result_cache.stats()
+        }
+    
+    def _search_in_memory(
+        self,
+        query_embeddings: np.ndarray,
+        n_results: int,
+        emotions: Optional[List[Optional[str]]] = None
+    ) -> List[List[Dict]]:
+        """
+        Exact cosine search against the in-memory verse matrix.
+        
+        Args:
+            query_embeddings: Query embedding matrix (one row per query)
+            n_results: Number of verses to return per query
+            emotions: Detected emotion per query; candidates of queries with an
+                emotion are re-ranked by theme alignment
+            
+        Returns:
+            One list of verse dictionaries per query, sorted by score (descending)
+        """
+        queries = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+        norms = np.linalg.norm(queries, axis=1, keepdims=True)
+        queries = queries / np.maximum(norms, 1e-12)
+        
+        scores = queries @ self._verse_matrix.T
+        n_results = min(n_results, scores.shape[1])
+        
+        # Partial selection of the top candidates, then sort only those
+        top_rows = np.argpartition(-scores, n_results - 1, axis=1)[:, :n_results]
+        top_scores = np.take_along_axis(scores, top_rows, axis=1)
+        order = np.argsort(-top_scores, axis=1)
+        top_rows = np.take_along_axis(top_rows, order, axis=1)
+        top_scores = np.take_along_axis(top_scores, order, axis=1)
+        
+        if emotions is None:
+            emotions = [None] * len(top_rows)
+        
+        all_verses = []
+        for rows, row_scores, emotion in zip(top_rows, top_scores, emotions):
+            alignment = self._theme_alignment(rows, emotion) if emotion else None
+            
+            if alignment is None:
+                all_verses.append([
+                    self._format_verse(self._verse_metadatas[row], float(score), self._verse_themes[row])
+                    for row, score in zip(rows, row_scores)
+                ])
+                continue
+            
+            combined = (1 - self.THEME_WEIGHT) * row_scores + self.THEME_WEIGHT * alignment
+            reranked = np.argsort(-combined, kind="stable")
+            verses = []
+            for i in reranked:
+                verse = self._format_verse(
+                    self._verse_metadatas[rows[i]], float(combined[i]), self._verse_themes[rows[i]]
+                )
+                verse["theme_alignment_score"] = float(alignment[i])
+                verses.append(verse)
+            all_verses.append(verses)
+        
+        return all_verses
+    
+    def _search_lexical(self, queries: List[str], n_results: int) -> List[List[Dict]]:
+        """
+        BM25 search over the verse text fields (no neural model involved).
+        
+        Args:
+            queries: Query texts
+            n_results: Number of verses to return per query
+            
+        Returns:
+            One list of verse dictionaries per query; similarity_score is the
+            BM25 score scaled to [0, 1] by the best match
+        """
+        all_verses = []
+        for query in queries:
+            matches = self._lexical_index.search(query, n_results)
+            best_score = matches[0][1] if matches else 1.0
+            verses = []
+            for row, score in matches:
+                verse = self._format_verse(self._verse_metadatas[row], score / best_score, self._themes_for_id(self._verse_ids[row]))
+                verse["lexical_score"] = score
+                verses.append(verse)
+            all_verses.append(verses)
+        return all_verses
+    
+    def _fuse_with_lexical(
+        self,
+        dense_results: List[List[Dict]],
+        queries: List[str],
+        query_embeddings: np.ndarray,
+        emotions: List[Optional[str]],
+        n_results: int
+    ) -> List[List[Dict]]:
+        """
+        Fuse dense results with BM25 results by weighted reciprocal rank fusion.
+        
+        Verses found only lexically get their similarity score (and theme
+        blend) computed from the in-memory verse matrix. Fused lists are
+        sorted by "rrf_score", so "similarity_score" is not monotonic in them.
+        
+        Args:
+            dense_results: Dense search results per query (best first)
+            queries: Query texts
+            query_embeddings: Query embedding matrix
+            emotions: Detected emotion per query
+            n_results: Number of verses to return per query
+            
+        Returns:
+            One fused list of verse dictionaries per query
+        """
+        queries_matrix = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+        queries_matrix = queries_matrix / np.maximum(np.linalg.norm(queries_matrix, axis=1, keepdims=True), 1e-12)
+        
+        fused_results = []
+        for dense, query, query_vector, emotion in zip(dense_results, queries, queries_matrix, emotions):
+            lexical_rows = [row for row, _ in self._lexical_index.search(query, n_results)]
+            fused = reciprocal_rank_fusion(
+                [[verse["id"] for verse in dense], [self._verse_ids[row] for row in lexical_rows]],
+                k=settings.HYBRID_RRF_K,
+                weights=[1.0, settings.HYBRID_LEXICAL_WEIGHT]
+            )
+            
+            dense_by_id = {verse["id"]: verse for verse in dense}
+            verses = []
+            for verse_id, rrf_score in fused[:n_results]:
+                verse = dense_by_id.get(verse_id)
+                if verse is None:
+                    verse = self._score_row(self._id_to_row[verse_id], query_vector, emotion)
+                verse["rrf_score"] = rrf_score
+                verses.append(verse)
+            fused_results.append(verses)
+        
+        return fused_results
+    
+    def _score_row(self, row: int, query_vector: np.ndarray, emotion: Optional[str]) -> Dict:
+        """
+        Score a single verse row against a normalized query vector.
+        
+        Args:
+            row: Verse row index
+            query_vector: L2-normalized query embedding
+            emotion: Detected emotion for theme blending (optional)
+            
+        Returns:
+            Verse dictionary with similarity (and theme alignment) scores
+        """
+        similarity = float(self._verse_matrix[row] @ query_vector) if self._verse_matrix is not None else 0.0
+        alignment = self._theme_alignment(np.array([row]), emotion) if emotion else None
+        
+        if alignment is None:
+            return self._format_verse(self._verse_metadatas[row], similarity, self._themes_for_id(self._verse_ids[row]))
+        
+        combined = (1 - self.THEME_WEIGHT) * similarity + self.THEME_WEIGHT * float(alignment[0])
+        verse = self._format_verse(self._verse_metadatas[row], combined, self._themes_for_id(self._verse_ids[row]))
+        verse["theme_alignment_score"] = float(alignment[0])
+        return verse
+    
+    def _theme_alignment(self, rows: np.ndarray, emotion: str) -> Optional[np.ndarray]:
+        """
+        Mean affinity of the given verse rows to the themes of an emotion.
+        
+        Args:
+            rows: Verse row indices
+            emotion: Detected emotion
+            
+        Returns:
+            Alignment score per row in [0, 1], or None if the emotion has no themes
+        """
+        columns = self._emotion_theme_columns.get(emotion.lower())
+        if columns is None or self._theme_matrix is None:
+            return None
+        return self._theme_matrix[np.ix_(rows, columns)].mean(axis=1)
+    
+    def _themes_for_id(self, verse_id: str) -> List[str]:
+        """Get the best-matching themes of a verse (empty if no index is loaded)."""
+        row = self._id_to_row.get(verse_id)
+        if row is None or row >= len(self._verse_themes):
             return []
+        return self._verse_themes[row]
+    
+    def _search_chroma(self, query_embeddings: np.ndarray, n_results: int) -> List[List[Dict]]:
+        """
+        Approximate search through the ChromaDB HNSW index.
+        
+        Args:
+            query_embeddings: Query embedding matrix (one row per query)
+            n_results: Number of verses to return per query
+            
+        Returns:
+            One list of verse dictionaries per query, sorted by similarity (descending)
+        """
+        results = self.collection.query(
+            query_embeddings=np.atleast_2d(query_embeddings).tolist(),
+            n_results=n_results,
+            include=["metadatas", "distances"]
+        )
+        
+        all_verses = []
+        for metadatas, distances in zip(results['metadatas'], results['distances']):
+            verses = []
+            for metadata, distance in zip(metadatas, distances):
+                similarity_score = 1 - distance  # Convert distance to similarity
+                verses.append(self._format_verse(metadata, similarity_score, self._themes_for_id(metadata["id"])))
+            all_verses.append(verses)
+        
+        return all_verses
+    
+    def _format_verse(
+        self,
+        metadata: Dict,
+        similarity_score: Optional[float] = None,
+        themes: Optional[List[str]] = None
+    ) -> Dict:
+        """
+        Convert stored verse metadata into the verse dictionary used by the API.
+        
+        Args:
+            metadata: Verse metadata as stored in ChromaDB
+            similarity_score: Similarity to the query (omitted for direct lookups)
+            themes: Best-matching themes of the verse
+            
+        Returns:
+            Verse dictionary
+        """
+        verse = {
+            "id": metadata["id"],
+            "chapter": metadata["chapter"],
+            "verse": metadata["verse"],
+            "shloka": metadata["shloka"],
+            "transliteration": metadata["transliteration"],
+            "eng_meaning": metadata["eng_meaning"],
+            "hin_meaning": metadata["hin_meaning"],
+            "word_meaning": metadata["word_meaning"],
+            "themes": list(themes or [])
+        }
+        if similarity_score is not None:
+            verse["similarity_score"] = similarity_score
+        return verse
     
     def get_verse_by_id(self, verse_id: str) -> Optional[Dict]:
         """
@@ -218,24 +917,19 @@ class VectorSearchService:
             Verse dictionary or None if not found
         """
         try:
+            if self._use_in_memory_index():
+                row = self._id_to_row.get(verse_id)
+                if row is None:
+                    return None
+                return self._format_verse(self._verse_metadatas[row], themes=self._verse_themes[row])
+            
             results = self.collection.get(
                 ids=[verse_id],
                 include=["metadatas"]
             )
             
             if results['ids'] and len(results['ids']) > 0:
-                metadata = results['metadatas'][0]
-                return {
-                    "id": metadata["id"],
-                    "chapter": metadata["chapter"],
-                    "verse": metadata["verse"],
-                    "shloka": metadata["shloka"],
-                    "transliteration": metadata["transliteration"],
-                    "eng_meaning": metadata["eng_meaning"],
-                    "hin_meaning": metadata["hin_meaning"],
-                    "word_meaning": metadata["word_meaning"],
-                    "themes": []  # Empty list for compatibility
-                }
+                return self._format_verse(results['metadatas'][0], themes=self._themes_for_id(verse_id))
             
             return None
             
@@ -243,10 +937,46 @@ class VectorSearchService:
             logger.error(f"Failed to get verse by ID {verse_id}: {e}")
             return None
     
+    def find_verses_by_reference(self, text: str) -> Optional[List[Dict]]:
+        """
+        Resolve a message that is a direct verse reference.
+        
+        Accepts forms like "BG 2.47-50", "verse 2.47", "chapter 2 verse 47" and
+        Devanagari numerals (see verse_reference.parse_verse_reference).
+        
+        Args:
+            text: User input
+            
+        Returns:
+            Referenced verses in order (similarity_score 1.0), or None if the
+            text is not a reference or names no existing verse
+        """
+        reference = parse_verse_reference(text)
+        if reference is None:
+            return None
+        
+        verses = []
+        for verse_id in reference.verse_ids:
+            row = self._id_to_row.get(verse_id)
+            if row is not None:
+                verse = self._format_verse(self._verse_metadatas[row], themes=self._themes_for_id(verse_id))
+            else:
+                verse = None if self._id_to_row else self.get_verse_by_id(verse_id)
+            if verse is None:
+                # Ranges may run past the end of the chapter
+                break
+            verse["similarity_score"] = 1.0
+            verses.append(verse)
+        
+        return verses or None
+    
     def _rerank_by_emotion(self, verses: List[Dict], emotion: str) -> List[Dict]:
         """
         Re-rank verses based on emotion-theme alignment.
         
+        Alignment is read from the precomputed verse x theme matrix and blended
+        with semantic similarity in one vectorized step.
+        
         Args:
             verses: List of verse dictionaries
             emotion: Detected emotion
@@ -254,61 +984,84 @@ class VectorSearchService:
         Returns:
             Re-ranked list of verses
         """
-        # Get themes for the emotion
-        emotion_themes = self.EMOTION_THEME_MAP.get(emotion.lower(), [])
-        
-        if not emotion_themes:
+        if emotion.lower() not in self._emotion_theme_columns or self._theme_matrix is None or not verses:
             # If no themes found for emotion, return original order
             return verses
         
-        # Calculate theme alignment scores for each verse
-        for verse in verses:
-            verse_themes = verse.get("themes", [])
-            
-            # Calculate alignment score based on theme overlap
-            alignment_score = 0
-            if verse_themes:
-                # Count matching themes
-                matching_themes = set(emotion_themes) & set(verse_themes)
-                alignment_score = len(matching_themes) / len(emotion_themes)
-            
-            # Combine semantic similarity with theme alignment
-            # Weight: 70% semantic similarity + 30% theme alignment
-            original_score = verse.get("similarity_score", 0)
-            combined_score = (0.7 * original_score) + (0.3 * alignment_score)
-            verse["similarity_score"] = combined_score
-            verse["theme_alignment_score"] = alignment_score
+        rows = np.array([self._id_to_row.get(verse["id"], -1) for verse in verses])
+        known = rows >= 0
+        alignment = np.zeros(len(verses), dtype=np.float32)
+        if known.any():
+            alignment[known] = self._theme_alignment(rows[known], emotion)
         
-        # Sort by combined score (descending)
-        return sorted(verses, key=lambda x: x.get("similarity_score", 0), reverse=True)
+        # Combine semantic similarity with theme alignment
+        similarity = np.array([verse.get("similarity_score", 0) for verse in verses], dtype=np.float32)
+        combined = (1 - self.THEME_WEIGHT) * similarity + self.THEME_WEIGHT * alignment
+        
+        reranked = []
+        for i in np.argsort(-combined, kind="stable"):
+            verse = verses[i]
+            verse["similarity_score"] = float(combined[i])
+            verse["theme_alignment_score"] = float(alignment[i])
+            reranked.append(verse)
+        
+        return reranked
     
     def get_random_verse(self) -> Optional[Dict]:
         """
         Get a random verse from the collection.
         
+        Picks from the cached verse ID array, so no database round trip is
+        needed once the index is loaded.
+        
         Returns:
             Random verse dictionary or None if collection is empty
         """
         try:
             import random
             
-            # Get total count
-            total_count = self.collection.count()
-            if total_count == 0:
-                return None
+            if self._verse_ids:
+                row = random.randrange(len(self._verse_ids))
+                return self._format_verse(self._verse_metadatas[row], themes=self._themes_for_id(self._verse_ids[row]))
             
-            # Get all IDs and pick a random one
-            all_results = self.collection.get(include=["metadatas"])
-            if not all_results['ids']:
+            # No in-memory index: fetch IDs only, then the chosen verse
+            all_ids = self.collection.get(include=[])['ids']
+            if not all_ids:
                 return None
             
-            # Pick a random index
-            random_index = random.randint(0, len(all_results['ids']) - 1)
-            random_id = all_results['ids'][random_index]
-            
-            # Get the verse by ID
-            return self.get_verse_by_id(random_id)
+            return self.get_verse_by_id(random.choice(all_ids))
             
         except Exception as e:
             logger.error(f"Failed to get random verse: {e}")
-            return None
\ No newline at end of file
+            return None
+
+
+def _create_vector_service() -> VectorSearchService:
+    """Create the vector search service on the shared encoder and sync it with the CSV."""
+    service = VectorSearchService(encoder=model_registry.get("sentence_encoder"))
+    # Initialize database if CSV file exists
+    try:
+        service.initialize_database(settings.VERSE_CSV_PATH)
+    except Exception as e:
+        logger.warning(f"Could not initialize database from CSV: {e}")
+    return service
+
+
+# Singleton instance (owned by the process-wide model registry)
+model_registry.register("vector_search", _create_vector_service)
+
+
+def get_vector_service() -> VectorSearchService:
+    """
+    Get or create singleton vector search service instance (shared by all routers).
+    
+    Raises:
+        HTTPException: 500 if the service (or its encoder) cannot be loaded
+    """
+    try:
+        # Load the encoder first so its memory is attributed to sentence_encoder
+        model_registry.get("sentence_encoder")
+        return model_registry.get("vector_search")
+    except Exception as e:
+        logger.error(f"Failed to initialize VectorSearchService: {e}")
+        raise HTTPException(status_code=500, detail="Vector search service unavailable")
@@ -0,0 +1,219 @@
+"""
+Precomputed verse embedding artifacts.
+
+A build step writes the verse embeddings (and the verse x theme affinity
+matrix used for emotion re-ranking) as versioned .npy files plus a JSON
+metadata sidecar, keyed by a content hash of the verse CSV and the
+encoder (embedding model, backend and ONNX file). At startup VectorSearchService memory-maps the .npy
+file instead of encoding verses or opening ChromaDB, so every worker shares
+the same pages through the OS page cache.
+"""
+from typing import Any, Dict, List, Optional, Tuple
+from pathlib import Path
+import numpy as np
+import hashlib
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Bump when the artifact layout changes
+ARTIFACT_VERSION = 3
+
+
+def csv_content_hash(csv_path: str) -> str:
+    """
+    Compute the SHA-256 hash of the verse CSV contents.
+    
+    Args:
+        csv_path: Path to the Bhagavad Gita CSV file
+    
+    Returns:
+        Hex digest of the file contents
+    """
+    digest = hashlib.sha256()
+    with open(csv_path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def encoder_signature(model_name: str, backend: str = "torch", model_file: Optional[str] = None) -> str:
+    """
+    Identify the encoder that produced (or will query) verse embeddings.
+    
+    The torch, fp32 ONNX and int8 ONNX encoders of one model produce
+    slightly different embeddings, so each gets its own artifact.
+    
+    Args:
+        model_name: Embedding model name
+        backend: "torch" or "onnx"
+        model_file: ONNX file (ignored for the torch backend)
+    
+    Returns:
+        Signature string, e.g. "all-mpnet-base-v2:onnx:onnx/model.onnx"
+    """
+    backend = backend.lower()
+    if backend == "onnx":
+        return f"{model_name}:onnx:{model_file}"
+    return f"{model_name}:{backend}"
+
+
+def artifact_paths(artifact_dir: str, csv_hash: str, model_name: str, encoder: Optional[str] = None) -> Tuple[Path, Path]:
+    """
+    Get the .npy and sidecar paths for a CSV hash and encoder.
+    
+    Args:
+        artifact_dir: Directory holding the artifacts
+        csv_hash: Content hash of the verse CSV
+        model_name: Embedding model name
+        encoder: Encoder signature (defaults to the torch backend of model_name)
+    
+    Returns:
+        Tuple of (embeddings_path, metadata_path)
+    """
+    encoder = encoder or encoder_signature(model_name)
+    key = hashlib.sha256(f"{ARTIFACT_VERSION}:{csv_hash}:{encoder}".encode("utf-8")).hexdigest()[:16]
+    base = Path(artifact_dir) / f"verse_embeddings-v{ARTIFACT_VERSION}-{key}"
+    return base.with_suffix(".npy"), base.with_suffix(".json")
+
+
+def theme_matrix_path(embeddings_path: Path) -> Path:
+    """Get the path of the verse x theme affinity matrix stored next to the embeddings."""
+    return embeddings_path.with_name(f"{embeddings_path.stem}-themes.npy")
+
+
+def save_verse_artifact(
+    artifact_dir: str,
+    csv_path: str,
+    model_name: str,
+    ids: List[str],
+    metadatas: List[Dict],
+    embeddings: np.ndarray,
+    dtype: str = "float32",
+    theme_names: Optional[List[str]] = None,
+    theme_affinities: Optional[np.ndarray] = None,
+    encoder: Optional[str] = None
+) -> Path:
+    """
+    Write verse embeddings and their metadata sidecar.
+    
+    Embeddings are L2-normalized before saving so they can be memory-mapped
+    and searched without any further processing.
+    
+    Args:
+        artifact_dir: Output directory
+        csv_path: Verse CSV the embeddings were built from
+        model_name: Embedding model name
+        ids: Verse IDs (one per embedding row)
+        metadatas: Verse metadata (one per embedding row)
+        embeddings: Embedding matrix
+        dtype: "float32" (zero-copy memory mapping) or "float16" (half the size)
+        theme_names: Theme names (one per affinity column)
+        theme_affinities: Verse x theme affinity matrix
+        encoder: Encoder signature (see encoder_signature; defaults to the
+            torch backend of model_name)
+    
+    Returns:
+        Path of the written .npy file
+    """
+    if dtype not in ("float32", "float16"):
+        raise ValueError(f"Unsupported artifact dtype: {dtype}. Must be 'float32' or 'float16'")
+    
+    csv_hash = csv_content_hash(csv_path)
+    encoder = encoder or encoder_signature(model_name)
+    embeddings_path, metadata_path = artifact_paths(artifact_dir, csv_hash, model_name, encoder)
+    embeddings_path.parent.mkdir(parents=True, exist_ok=True)
+    
+    matrix = np.asarray(embeddings, dtype=np.float32)
+    matrix = matrix / np.maximum(np.linalg.norm(matrix, axis=1, keepdims=True), 1e-12)
+    np.save(embeddings_path, matrix.astype(dtype))
+    
+    if theme_affinities is not None:
+        np.save(theme_matrix_path(embeddings_path), np.asarray(theme_affinities, dtype=np.float32))
+    
+    sidecar = {
+        "version": ARTIFACT_VERSION,
+        "model": model_name,
+        "encoder": encoder,
+        "csv_sha256": csv_hash,
+        "dtype": dtype,
+        "count": int(matrix.shape[0]),
+        "dim": int(matrix.shape[1]),
+        "ids": list(ids),
+        "metadatas": list(metadatas),
+        "theme_names": list(theme_names) if theme_affinities is not None and theme_names else []
+    }
+    with open(metadata_path, "w", encoding="utf-8") as f:
+        json.dump(sidecar, f, ensure_ascii=False)
+    
+    logger.info(f"Wrote verse embedding artifact {embeddings_path} ({matrix.shape[0]} verses, {dtype})")
+    return embeddings_path
+
+
+def load_verse_artifact(
+    artifact_dir: str,
+    csv_path: str,
+    model_name: str,
+    encoder: Optional[str] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Memory-map the verse embedding artifact matching the CSV and model.
+    
+    float32 artifacts are returned as a read-only memory map; float16
+    artifacts are upcast to float32 in memory.
+    
+    Args:
+        artifact_dir: Directory holding the artifacts
+        csv_path: Verse CSV the service is configured with
+        model_name: Embedding model the service uses for queries
+        encoder: Signature of the query encoder (see encoder_signature;
+            defaults to the torch backend of model_name)
+    
+    Returns:
+        Dictionary with "embeddings", "ids", "metadatas", "theme_names" and
+        "theme_affinities" (None if not stored), or None if no matching
+        artifact exists
+    """
+    try:
+        csv_hash = csv_content_hash(csv_path)
+    except OSError:
+        return None
+    
+    encoder = encoder or encoder_signature(model_name)
+    embeddings_path, metadata_path = artifact_paths(artifact_dir, csv_hash, model_name, encoder)
+    if not embeddings_path.exists() or not metadata_path.exists():
+        return None
+    
+    with open(metadata_path, encoding="utf-8") as f:
+        sidecar = json.load(f)
+    
+    if (
+        sidecar.get("version") != ARTIFACT_VERSION
+        or sidecar.get("csv_sha256") != csv_hash
+        or sidecar.get("model") != model_name
+        or sidecar.get("encoder") != encoder
+    ):
+        logger.warning(f"Ignoring stale verse embedding artifact {embeddings_path}")
+        return None
+    
+    matrix = np.load(embeddings_path, mmap_mode="r")
+    if matrix.shape[0] != len(sidecar["ids"]):
+        logger.warning(f"Ignoring corrupt verse embedding artifact {embeddings_path}")
+        return None
+    
+    if matrix.dtype != np.float32:
+        matrix = np.asarray(matrix, dtype=np.float32)
+    
+    theme_affinities = None
+    themes_path = theme_matrix_path(embeddings_path)
+    if sidecar.get("theme_names") and themes_path.exists():
+        theme_affinities = np.load(themes_path, mmap_mode="r")
+    
+    return {
+        "embeddings": matrix,
+        "ids": sidecar["ids"],
+        "metadatas": sidecar["metadatas"],
+        "theme_names": sidecar.get("theme_names", []),
+        "theme_affinities": theme_affinities
+    }
@@ -0,0 +1,202 @@
+"""
+In-process verse catalog.
+
+The Bhagavad Gita text is static, so it is read from the CSV once and kept
+in memory with an ID index and per-chapter ordered tuples. Lookups by ID or
+chapter never touch ChromaDB, Supabase or any model.
+"""
+from datetime import date
+from types import MappingProxyType
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+import pandas as pd
+import hashlib
+import logging
+import random
+from app.core.config import settings
+from app.core.registry import model_registry
+
+logger = logging.getLogger(__name__)
+
+
+def load_verses_from_csv(csv_path: str) -> Tuple[List[str], List[str], List[Dict]]:
+    """
+    Read verses from the Bhagavad Gita CSV file.
+    
+    Args:
+        csv_path: Path to the Bhagavad Gita CSV file
+    
+    Returns:
+        Tuple of (ids, documents, metadatas) where documents are the texts to embed
+    """
+    df = pd.read_csv(csv_path)
+    logger.info(f"Loaded {len(df)} verses from {csv_path}")
+    
+    documents = []
+    metadatas = []
+    ids = []
+    
+    for _, row in df.iterrows():
+        # Concatenate Shloka and EngMeaning for embedding
+        document = f"{row['Shloka']} {row['EngMeaning']}"
+        documents.append(document)
+        
+        # Prepare metadata (ChromaDB only supports str, int, float, bool)
+        metadata = {
+            "id": row['ID'],
+            "chapter": int(row['Chapter']),
+            "verse": int(row['Verse']),
+            "shloka": row['Shloka'],
+            "transliteration": row.get('Transliteration', ''),
+            "eng_meaning": row['EngMeaning'],
+            "hin_meaning": row.get('HinMeaning', ''),
+            "word_meaning": row.get('WordMeaning', ''),
+            # Remove themes array as ChromaDB doesn't support lists in metadata
+        }
+        metadatas.append(metadata)
+        ids.append(row['ID'])
+    
+    return ids, documents, metadatas
+
+
+def normalize_verse_id(verse_id: str) -> str:
+    """Normalize user-supplied verse IDs (e.g., " bg2.47" -> "BG2.47")."""
+    return verse_id.strip().upper()
+
+
+class VerseCatalog:
+    """
+    Immutable in-memory index of all verses.
+    
+    Verses are stored once as read-only mappings, indexed by ID (dict) and
+    by chapter (tuples ordered by verse number). Accessors return plain dict
+    copies so callers can't modify the catalog.
+    """
+    
+    def __init__(self, metadatas: Sequence[Dict]):
+        """
+        Build the catalog.
+        
+        Args:
+            metadatas: Verse metadata dictionaries (as returned by load_verses_from_csv)
+        """
+        verses = tuple(MappingProxyType(dict(metadata)) for metadata in metadatas)
+        
+        by_id: Dict[str, Mapping] = {}
+        by_chapter: Dict[int, List[Mapping]] = {}
+        for verse in verses:
+            by_id[verse["id"]] = verse
+            by_chapter.setdefault(verse["chapter"], []).append(verse)
+        
+        self._verses = verses
+        self._by_id = MappingProxyType(by_id)
+        self._by_chapter = MappingProxyType({
+            chapter: tuple(sorted(chapter_verses, key=lambda verse: verse["verse"]))
+            for chapter, chapter_verses in sorted(by_chapter.items())
+        })
+        self._ids = tuple(verse["id"] for verse in verses)
+    
+    @classmethod
+    def from_csv(cls, csv_path: str) -> "VerseCatalog":
+        """
+        Load the catalog from the Bhagavad Gita CSV file.
+        
+        Args:
+            csv_path: Path to the Bhagavad Gita CSV file
+        
+        Returns:
+            VerseCatalog with every verse in the file
+        """
+        _, _, metadatas = load_verses_from_csv(csv_path)
+        return cls(metadatas)
+    
+    def __len__(self) -> int:
+        return len(self._verses)
+    
+    def __contains__(self, verse_id: str) -> bool:
+        return normalize_verse_id(verse_id) in self._by_id
+    
+    @property
+    def ids(self) -> Tuple[str, ...]:
+        """All verse IDs in CSV order."""
+        return self._ids
+    
+    @property
+    def chapters(self) -> Tuple[int, ...]:
+        """Chapter numbers in ascending order."""
+        return tuple(self._by_chapter)
+    
+    def get(self, verse_id: str) -> Optional[Dict]:
+        """
+        Get a verse by ID.
+        
+        Args:
+            verse_id: Verse identifier (e.g., "BG2.47", case-insensitive)
+        
+        Returns:
+            Verse dictionary or None if not found
+        """
+        verse = self._by_id.get(normalize_verse_id(verse_id))
+        return dict(verse) if verse is not None else None
+    
+    def get_by_index(self, index: int) -> Dict:
+        """
+        Get the verse at a position in CSV order.
+        
+        Args:
+            index: Position (0 <= index < len(catalog))
+        
+        Returns:
+            Verse dictionary
+        """
+        return dict(self._verses[index])
+    
+    def get_chapter(self, chapter: int) -> List[Dict]:
+        """
+        Get all verses of a chapter ordered by verse number.
+        
+        Args:
+            chapter: Chapter number
+        
+        Returns:
+            List of verse dictionaries (empty if the chapter does not exist)
+        """
+        return [dict(verse) for verse in self._by_chapter.get(chapter, ())]
+    
+    def random_verse(self) -> Optional[Dict]:
+        """
+        Pick a uniformly random verse.
+        
+        Returns:
+            Verse dictionary or None if the catalog is empty
+        """
+        if not self._verses:
+            return None
+        return dict(random.choice(self._verses))
+    
+    def daily_verse(self, day: date, seed: Optional[str] = None) -> Optional[Dict]:
+        """
+        Pick the verse of the day.
+        
+        The choice depends only on the date, the seed and the catalog, so
+        every worker (and every cache) agrees on it for the whole day.
+        
+        Args:
+            day: Date to pick the verse for
+            seed: Optional seed (e.g., a user ID) for a personal verse of the day
+        
+        Returns:
+            Verse dictionary or None if the catalog is empty
+        """
+        if not self._verses:
+            return None
+        digest = hashlib.sha256(f"{day.isoformat()}:{seed or ''}".encode("utf-8")).digest()
+        return dict(self._verses[int.from_bytes(digest[:8], "big") % len(self._verses)])
+
+
+# Singleton instance (owned by the process-wide model registry)
+model_registry.register("verse_catalog", lambda: VerseCatalog.from_csv(settings.VERSE_CSV_PATH))
+
+
+def get_verse_catalog() -> VerseCatalog:
+    """Get or create singleton verse catalog instance."""
+    return model_registry.get("verse_catalog")
@@ -0,0 +1,91 @@
+"""
+Direct verse reference parsing.
+
+Recognizes messages that are just a chapter/verse reference ("BG 2.47",
+"Gita 2:47-50", "verse 2.47", "chapter 2 verse 47", "अध्याय २ श्लोक ४७") so
+they can be answered with an ID lookup instead of intent classification,
+emotion detection and an embedding search. Bare numbers ("2.47", "10:30")
+are not references: they are as likely to be times, prices or versions.
+"""
+from typing import List, NamedTuple, Optional
+import re
+import unicodedata
+
+# Chapters in the Bhagavad Gita
+CHAPTER_COUNT = 18
+
+# Longest verse range resolved from a single reference
+MAX_REFERENCE_VERSES = 10
+
+DEVANAGARI_DIGITS = str.maketrans("०१२३४५६७८९", "0123456789")
+
+_PREFIX = r"(?:(?:please\s+)?(?:show(?:\s+me)?|read|open|recite|explain|give\s+me|what\s+is|what\s+does)\s+)?"
+_GITA_NAME = r"(?:(?:shrimad\s+)?(?:bhagavad|bhagwad|bhagavat)\s*gita|gita|bg)\.?\s*"
+_GITA = rf"(?:{_GITA_NAME})?"
+_VERSE_WORD = r"(?:verses?|shlokas?|slokas?)\s+"
+_RANGE = r"\s*(?:-|–|—|to)\s*"
+_SUFFIX = r"(?:\s+(?:say|says|mean|means))?"
+
+# "BG 2:47", "verse 2.47-50", "gita 2.47 to 2.50"; the Gita name or a verse
+# word is required, so "10:30" or "4.20" alone is not a reference
+DOTTED_REFERENCE = re.compile(
+    rf"{_PREFIX}(?:{_GITA_NAME}(?:{_VERSE_WORD})?|{_VERSE_WORD})"
+    rf"(\d{{1,2}})\s*[.:]\s*(\d{{1,3}})(?:{_RANGE}(?:(\d{{1,2}})\s*[.:]\s*)?(\d{{1,3}}))?{_SUFFIX}"
+)
+
+# "chapter 2 verse 47", "ch 2 v 47-50", "अध्याय २ श्लोक ४७"
+WORDED_REFERENCE = re.compile(
+    rf"{_PREFIX}{_GITA}(?:chapter|ch|adhyay|adhyaya|अध्याय)\.?\s*(\d{{1,2}})\s*,?\s*"
+    rf"(?:verses?|v|vs|shlokas?|slokas?|श्लोक)\.?\s*(\d{{1,3}})(?:{_RANGE}(\d{{1,3}}))?{_SUFFIX}"
+)
+
+
+class VerseReference(NamedTuple):
+    """A chapter and an inclusive verse range."""
+    chapter: int
+    start_verse: int
+    end_verse: int
+    
+    @property
+    def verse_ids(self) -> List[str]:
+        """Verse IDs covered by the reference (e.g., ["BG2.47", "BG2.48"])."""
+        return [f"BG{self.chapter}.{verse}" for verse in range(self.start_verse, self.end_verse + 1)]
+
+
+def parse_verse_reference(text: str) -> Optional[VerseReference]:
+    """
+    Parse a message consisting only of a verse reference.
+    
+    References embedded in longer sentences are not matched, so messages
+    that merely mention a verse still go through the normal pipeline.
+    
+    Args:
+        text: User input
+    
+    Returns:
+        VerseReference, or None if the text is not a valid reference
+    """
+    normalized = unicodedata.normalize("NFKC", text).translate(DEVANAGARI_DIGITS).lower()
+    normalized = " ".join(normalized.split()).strip(" ?!.।॥\"'")
+    if not normalized or len(normalized) > 80:
+        return None
+    
+    match = DOTTED_REFERENCE.fullmatch(normalized)
+    if match:
+        chapter, start, end_chapter, end = match.groups()
+        if end_chapter is not None and int(end_chapter) != int(chapter):
+            # Ranges across chapters are not supported
+            return None
+    else:
+        match = WORDED_REFERENCE.fullmatch(normalized)
+        if not match:
+            return None
+        chapter, start, end = match.groups()
+    
+    chapter, start = int(chapter), int(start)
+    end = int(end) if end is not None else start
+    
+    if not 1 <= chapter <= CHAPTER_COUNT or start < 1 or end < start:
+        return None
+    
+    return VerseReference(chapter, start, min(end, start + MAX_REFERENCE_VERSES - 1))
@@ -0,0 +1,175 @@
+"""
+Zero-shot classification on an NLI model exported to ONNX.
+
+Replaces the transformers "zero-shot-classification" pipeline for intent
+routing. The pipeline runs one PyTorch forward pass per candidate label;
+here each premise is tokenized once per call, hypothesis tokens are cached
+per label, and all (premise, hypothesis) pairs of one or more texts run as
+one padded batch on ONNX Runtime (optionally int8-quantized).
+"""
+from transformers import AutoTokenizer
+from huggingface_hub import hf_hub_download
+from typing import Dict, List, Optional, Sequence, Tuple, Union
+from pathlib import Path
+import numpy as np
+import onnxruntime as ort
+import json
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class OnnxZeroShotClassifier:
+    """
+    NLI zero-shot classifier with the transformers pipeline's call signature.
+    
+    Scores match the pipeline: with multi_label=False the entailment logits
+    are softmaxed across labels, with multi_label=True each label gets the
+    softmax of entailment against contradiction.
+    """
+    
+    def __init__(self, model_dir: str, file_name: str = "model.onnx", intra_op_threads: int = 0):
+        """
+        Load the tokenizer, label mapping and ONNX Runtime session.
+        
+        Args:
+            model_dir: Directory (or Hub ID) with the exported model, tokenizer and config.json
+            file_name: ONNX file inside model_dir, or a local path
+                (e.g., "model_quantized.onnx" for int8)
+            intra_op_threads: ONNX Runtime intra-op threads (0 = onnxruntime default)
+        """
+        self.model_dir = model_dir
+        model_path = file_name if Path(file_name).exists() else self._get_model_file(file_name)
+        with open(self._get_model_file("config.json")) as f:
+            label2id = {label.lower(): int(i) for label, i in json.load(f)["label2id"].items()}
+        
+        self.entailment_id = next((i for label, i in label2id.items() if label.startswith("entail")), 2)
+        self.contradiction_id = next((i for label, i in label2id.items() if label.startswith("contradict")), 0)
+        
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if intra_op_threads > 0:
+            session_options.intra_op_num_threads = intra_op_threads
+        
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir, use_fast=True)
+        self.session = ort.InferenceSession(
+            str(model_path),
+            sess_options=session_options,
+            providers=["CPUExecutionProvider"]
+        )
+        self.input_names = {model_input.name for model_input in self.session.get_inputs()}
+        self.max_length = min(self.tokenizer.model_max_length, 512)
+        self.pair_special_tokens = self.tokenizer.num_special_tokens_to_add(pair=True)
+        
+        # Hypothesis token IDs per (template, label); labels are a small fixed set
+        self._hypothesis_ids: Dict[Tuple[str, str], List[int]] = {}
+        logger.info(f"ONNX zero-shot classifier loaded from {model_dir} ({Path(model_path).name})")
+    
+    def _get_model_file(self, file_name: str) -> str:
+        """Get a file from the model directory or the Hugging Face Hub."""
+        local_path = Path(self.model_dir) / file_name
+        if local_path.exists():
+            return str(local_path)
+        return hf_hub_download(self.model_dir, file_name)
+    
+    def _hypothesis(self, template: str, label: str) -> List[int]:
+        key = (template, label)
+        if key not in self._hypothesis_ids:
+            self._hypothesis_ids[key] = self.tokenizer(template.format(label), add_special_tokens=False)["input_ids"]
+        return self._hypothesis_ids[key]
+    
+    def __call__(
+        self,
+        sequences: Union[str, Sequence[str]],
+        candidate_labels: Sequence[str],
+        hypothesis_template: str = "This example is {}.",
+        multi_label: bool = False
+    ) -> Union[Dict, List[Dict]]:
+        """
+        Classify texts against candidate labels in one batched ONNX call.
+        
+        Args:
+            sequences: Text to classify (the NLI premise), or a list of texts;
+                all (text, label) pairs run as one batch
+            candidate_labels: Labels to score
+            hypothesis_template: Template turning a label into a hypothesis
+            multi_label: Score labels independently instead of as one distribution
+        
+        Returns:
+            Dictionary with "sequence", "labels" and "scores", sorted by score
+            (same format as the transformers pipeline), or one per text for
+            a list input
+        """
+        single = isinstance(sequences, str)
+        texts = [sequences] if single else list(sequences)
+        labels = list(candidate_labels)
+        hypotheses = [self._hypothesis(hypothesis_template, label) for label in labels]
+        
+        # Tokenize each premise once and share it across its pairs
+        budget = self.max_length - self.pair_special_tokens - max(len(ids) for ids in hypotheses)
+        premises = [
+            self.tokenizer(text, add_special_tokens=False)["input_ids"][:max(budget, 1)]
+            for text in texts
+        ]
+        
+        pairs = [(premise, ids) for premise in premises for ids in hypotheses]
+        pair_ids = [self.tokenizer.build_inputs_with_special_tokens(premise, ids) for premise, ids in pairs]
+        width = max(len(ids) for ids in pair_ids)
+        input_ids = np.full((len(pair_ids), width), self.tokenizer.pad_token_id, dtype=np.int64)
+        attention_mask = np.zeros((len(pair_ids), width), dtype=np.int64)
+        for row, ids in enumerate(pair_ids):
+            input_ids[row, :len(ids)] = ids
+            attention_mask[row, :len(ids)] = 1
+        
+        inputs = {"input_ids": input_ids, "attention_mask": attention_mask}
+        if "token_type_ids" in self.input_names:
+            token_type_ids = np.zeros((len(pair_ids), width), dtype=np.int64)
+            for row, (premise, ids) in enumerate(pairs):
+                token_types = self.tokenizer.create_token_type_ids_from_sequences(premise, ids)
+                token_type_ids[row, :len(token_types)] = token_types
+            inputs["token_type_ids"] = token_type_ids
+        
+        logits = self.session.run(None, {name: value for name, value in inputs.items() if name in self.input_names})[0]
+        logits = np.asarray(logits, dtype=np.float64).reshape(len(texts), len(labels), -1)
+        
+        results = []
+        for text, text_logits in zip(texts, logits):
+            scores = self._scores(text_logits, multi_label)
+            order = np.argsort(-scores, kind="stable")
+            results.append({
+                "sequence": text,
+                "labels": [labels[i] for i in order],
+                "scores": [float(scores[i]) for i in order]
+            })
+        return results[0] if single else results
+    
+    def _scores(self, logits: np.ndarray, multi_label: bool) -> np.ndarray:
+        """Turn per-pair NLI logits into per-label scores."""
+        if multi_label:
+            pair_logits = logits[:, [self.contradiction_id, self.entailment_id]]
+            pair_logits -= pair_logits.max(axis=1, keepdims=True)
+            exp = np.exp(pair_logits)
+            return exp[:, 1] / exp.sum(axis=1)
+        
+        entailment = logits[:, self.entailment_id]
+        exp = np.exp(entailment - entailment.max())
+        return exp / exp.sum()
+
+
+def load_zero_shot_classifier(model_dir: str, file_name: str, intra_op_threads: int = 0) -> Optional[OnnxZeroShotClassifier]:
+    """
+    Load the ONNX zero-shot classifier, or None if the export is missing.
+    
+    Args:
+        model_dir: Export directory (see scripts/export_intent_nli.py)
+        file_name: ONNX file inside model_dir
+        intra_op_threads: ONNX Runtime intra-op threads (0 = onnxruntime default)
+    
+    Returns:
+        OnnxZeroShotClassifier, or None if it could not be loaded
+    """
+    try:
+        return OnnxZeroShotClassifier(model_dir, file_name, intra_op_threads)
+    except Exception as e:
+        logger.warning(f"Could not load ONNX zero-shot model from {model_dir}: {e}")
+        return None
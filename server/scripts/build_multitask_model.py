@@ -0,0 +1,196 @@
+#!/usr/bin/env python3
+"""
+Build the multi-task intent + emotion ONNX model
+Run from the server directory: python -m scripts.build_multitask_model [--from-db] [--quantize]
+
+The GoEmotions RoBERTa model is the shared backbone and keeps its emotion
+head unchanged. A 3-way intent head is distilled on the backbone's <s>
+features from the current intent classifier's score distribution (soft
+labels) over the built-in intent examples, an optional text file and,
+with --from-db, historical emotion_logs inputs. Both heads are exported
+as one ONNX graph (outputs intent_logits and emotion_logits) and compared
+against the current two-model setup on held-out texts. Use --report-only
+to rerun the agreement report on an existing build.
+"""
+
+import argparse
+import json
+import random
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+import numpy as np
+import torch
+from transformers import AutoModelForSequenceClassification, AutoTokenizer
+from app.core.config import settings
+from app.services.intent_classification import IntentClassificationService
+from app.services.emotion_detection import EmotionDetectionService
+from app.services.multitask_inference import MultiTaskInferenceService, MULTITASK_CONFIG_FILE
+from scripts.intent_teacher import load_training_texts, teacher_intent_probabilities
+
+
+class MultiTaskModel(torch.nn.Module):
+    """Shared backbone with the intent head and the original emotion head."""
+    
+    def __init__(self, emotion_model, intent_head: torch.nn.Module):
+        super().__init__()
+        self.backbone = emotion_model.base_model
+        self.emotion_head = emotion_model.classifier
+        self.intent_head = intent_head
+    
+    def forward(self, input_ids, attention_mask):
+        hidden_states = self.backbone(input_ids=input_ids, attention_mask=attention_mask)[0]
+        return self.intent_head(hidden_states[:, 0]), self.emotion_head(hidden_states)
+
+
+@torch.no_grad()
+def backbone_features(model, tokenizer, texts, batch_size=32):
+    """Get the <s> hidden state of every text from the frozen backbone."""
+    features = []
+    for start in range(0, len(texts), batch_size):
+        batch = tokenizer(texts[start:start + batch_size], padding=True, truncation=True, max_length=512, return_tensors="pt")
+        hidden_states = model.base_model(input_ids=batch["input_ids"], attention_mask=batch["attention_mask"])[0]
+        features.append(hidden_states[:, 0])
+    return torch.cat(features)
+
+
+def train_intent_head(features, targets, epochs, learning_rate):
+    """Fit a linear intent head to soft teacher labels (cross-entropy with soft targets)."""
+    head = torch.nn.Linear(features.shape[1], targets.shape[1])
+    optimizer = torch.optim.Adam(head.parameters(), lr=learning_rate, weight_decay=1e-4)
+    targets = torch.from_numpy(targets)
+    for _ in range(epochs):
+        optimizer.zero_grad()
+        loss = -(targets * torch.log_softmax(head(features), dim=1)).sum(dim=1).mean()
+        loss.backward()
+        optimizer.step()
+    print(f"   Final distillation loss: {loss.item():.4f}")
+    return head
+
+
+def export_model(model, tokenizer, output_dir: Path, quantize: bool) -> str:
+    """Export the multi-task model to ONNX and return the file name to serve."""
+    sample = tokenizer(["I feel lost about my purpose"], return_tensors="pt")
+    torch.onnx.export(
+        model.eval(),
+        (sample["input_ids"], sample["attention_mask"]),
+        str(output_dir / "model.onnx"),
+        input_names=["input_ids", "attention_mask"],
+        output_names=["intent_logits", "emotion_logits"],
+        dynamic_axes={
+            "input_ids": {0: "batch", 1: "sequence"},
+            "attention_mask": {0: "batch", 1: "sequence"},
+            "intent_logits": {0: "batch"},
+            "emotion_logits": {0: "batch"},
+        },
+        opset_version=14,
+    )
+    print(f"   ✅ Saved ONNX model to {output_dir / 'model.onnx'}")
+    if not quantize:
+        return "model.onnx"
+    
+    from onnxruntime.quantization import quantize_dynamic, QuantType
+    quantize_dynamic(str(output_dir / "model.onnx"), str(output_dir / "model_quantized.onnx"), weight_type=QuantType.QInt8)
+    print(f"   ✅ Saved quantized model to {output_dir / 'model_quantized.onnx'}")
+    return "model_quantized.onnx"
+
+
+def agreement_report(output_dir: Path, file_name: str, texts) -> float:
+    """Compare the multi-task model with the separate intent and emotion services."""
+    multitask = MultiTaskInferenceService(str(output_dir), file_name)
+    intent_service = IntentClassificationService(cascade=False)
+    emotion_service = EmotionDetectionService()
+    
+    intent_agree = emotion_agree = 0
+    two_model_seconds = multitask_seconds = 0.0
+    for text in texts:
+        start = time.perf_counter()
+        intent, _ = intent_service.classify_intent(text)
+        emotion = emotion_service.detect_emotion(text)[0]["label"]
+        two_model_seconds += time.perf_counter() - start
+        
+        start = time.perf_counter()
+        multitask_intent, _, multitask_emotions = multitask.analyze(text)
+        multitask_seconds += time.perf_counter() - start
+        
+        intent_agree += intent == multitask_intent
+        emotion_agree += emotion == multitask_emotions[0]["label"]
+    
+    count = max(len(texts), 1)
+    print(f"   Texts:                      {len(texts)}")
+    print(f"   Intent agreement:           {intent_agree / count:.1%}")
+    print(f"   Dominant emotion agreement: {emotion_agree / count:.1%}")
+    print(f"   Two models:                 {two_model_seconds / count * 1000:.1f} ms/text")
+    print(f"   Multi-task:                 {multitask_seconds / count * 1000:.1f} ms/text")
+    return intent_agree / count
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the multi-task intent + emotion ONNX model")
+    parser.add_argument("--emotion-model", default="SamLowe/roberta-base-go_emotions", help="PyTorch GoEmotions backbone")
+    parser.add_argument("--output-dir", default=settings.MULTITASK_MODEL, help="Output directory")
+    parser.add_argument("--texts", default=None, help="Extra training texts (one per line)")
+    parser.add_argument("--from-db", action="store_true", help="Also train on emotion_logs.user_input")
+    parser.add_argument("--limit", type=int, default=20000, help="Maximum texts read from the database")
+    parser.add_argument("--epochs", type=int, default=300, help="Intent head training steps (full batch)")
+    parser.add_argument("--learning-rate", type=float, default=1e-2, help="Intent head learning rate")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fraction of texts held out for the report")
+    parser.add_argument("--quantize", action="store_true", help="Also write an int8-quantized model")
+    parser.add_argument("--report-only", action="store_true", help="Only run the agreement report")
+    args = parser.parse_args()
+    
+    output_dir = Path(args.output_dir)
+    texts = load_training_texts(args.texts, args.from_db, args.limit)
+    random.Random(0).shuffle(texts)
+    holdout_size = max(1, int(len(texts) * args.holdout))
+    train_texts, holdout_texts = texts[holdout_size:], texts[:holdout_size]
+    
+    print("🕉️ Multi-task intent + emotion model")
+    print("=" * 50)
+    
+    try:
+        if args.report_only:
+            print("1. Agreement report (existing build, all texts)...")
+            agreement_report(output_dir, settings.MULTITASK_MODEL_FILE, texts)
+            sys.exit(0)
+        
+        output_dir.mkdir(parents=True, exist_ok=True)
+        intent_labels = list(IntentClassificationService.INTENT_LABELS)
+        
+        print(f"1. Labelling {len(train_texts)} texts with the current intent classifier...")
+        targets = teacher_intent_probabilities(IntentClassificationService(cascade=False), train_texts, intent_labels)
+        
+        print(f"2. Extracting backbone features from {args.emotion_model}...")
+        tokenizer = AutoTokenizer.from_pretrained(args.emotion_model)
+        emotion_model = AutoModelForSequenceClassification.from_pretrained(args.emotion_model).eval()
+        features = backbone_features(emotion_model, tokenizer, train_texts)
+        
+        print("3. Distilling the intent head...")
+        intent_head = train_intent_head(features, targets, args.epochs, args.learning_rate)
+        
+        print("4. Exporting to ONNX...")
+        file_name = export_model(MultiTaskModel(emotion_model, intent_head), tokenizer, output_dir, args.quantize)
+        tokenizer.save_pretrained(output_dir)
+        id2label = emotion_model.config.id2label
+        with open(output_dir / MULTITASK_CONFIG_FILE, "w") as f:
+            json.dump({
+                "intent_labels": intent_labels,
+                "emotion_labels": [id2label[i] for i in sorted(id2label)],
+                "max_length": 512,
+                "backbone": args.emotion_model,
+                "intent_teacher": settings.INTENT_MODEL,
+                "training_texts": len(train_texts),
+                "built_at": datetime.now(timezone.utc).isoformat()
+            }, f, indent=2)
+        
+        print(f"5. Agreement report ({len(holdout_texts)} held-out texts)...")
+        agreement_report(output_dir, file_name, holdout_texts)
+    except Exception as e:
+        print(f"❌ Build failed: {e}")
+        sys.exit(1)
+    
+    print("\n🎉 Build completed! Configure the server with:")
+    print(f"   MULTITASK_ENABLED=true")
+    print(f"   MULTITASK_MODEL={args.output_dir}")
+    print(f"   MULTITASK_MODEL_FILE={file_name}")
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Build the precomputed verse embedding artifact
+Run from the server directory: python -m scripts.build_verse_embeddings [--dtype float16]
+
+Writes a versioned .npy file plus a JSON sidecar keyed by the CSV content hash
+and encoder (EMBEDDING_MODEL, EMBEDDING_BACKEND and EMBEDDING_MODEL_FILE). VectorSearchService memory-maps it at startup, so
+workers boot without encoding verses or opening ChromaDB.
+"""
+
+import argparse
+import sys
+import time
+from app.core.config import settings
+from app.services.sentence_encoder import load_sentence_encoder
+from app.services.vector_search import VectorSearchService, compute_theme_affinities
+from app.services.verse_catalog import load_verses_from_csv
+from app.services.verse_artifact import save_verse_artifact, encoder_signature
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the verse embedding artifact")
+    parser.add_argument("--csv", default=settings.VERSE_CSV_PATH, help="Bhagavad Gita CSV file")
+    parser.add_argument("--output-dir", default=settings.VERSE_ARTIFACT_DIR, help="Artifact directory")
+    parser.add_argument("--dtype", choices=["float32", "float16"], default="float32", help="Stored embedding dtype")
+    parser.add_argument("--batch-size", type=int, default=64, help="Encoder batch size")
+    args = parser.parse_args()
+    
+    print("🕉️ Building verse embedding artifact")
+    print("=" * 50)
+    
+    try:
+        ids, documents, metadatas = load_verses_from_csv(args.csv)
+        print(f"1. Loaded {len(ids)} verses from {args.csv}")
+        
+        encoder = load_sentence_encoder()
+        start = time.perf_counter()
+        embeddings = encoder.encode(documents, batch_size=args.batch_size, show_progress_bar=True)
+        print(f"2. Encoded verses with {settings.EMBEDDING_MODEL} ({settings.EMBEDDING_BACKEND}) in {time.perf_counter() - start:.1f}s")
+        
+        # Precompute verse x theme affinities for emotion re-ranking
+        theme_names = VectorSearchService.get_theme_names()
+        theme_affinities = compute_theme_affinities(encoder, embeddings, theme_names)
+        print(f"3. Scored verses against {len(theme_names)} theme prototypes")
+        
+        path = save_verse_artifact(
+            args.output_dir,
+            args.csv,
+            settings.EMBEDDING_MODEL,
+            ids,
+            metadatas,
+            embeddings,
+            dtype=args.dtype,
+            theme_names=theme_names,
+            theme_affinities=theme_affinities,
+            encoder=encoder_signature(settings.EMBEDDING_MODEL, settings.EMBEDDING_BACKEND, settings.EMBEDDING_MODEL_FILE)
+        )
+        print(f"4. Wrote {path} and {path.with_suffix('.json')}")
+    except Exception as e:
+        print(f"❌ Failed to build artifact: {e}")
+        sys.exit(1)
+    
+    print("\n🎉 Artifact ready! Servers using the same CSV and encoder settings will load it at startup.")
+    sys.exit(0)
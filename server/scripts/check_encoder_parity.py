@@ -0,0 +1,77 @@
+#!/usr/bin/env python3
+"""
+Parity check between the PyTorch and ONNX sentence encoder backends
+Run from the server directory: python -m scripts.check_encoder_parity
+"""
+
+import argparse
+import sys
+import time
+import numpy as np
+import pandas as pd
+from app.core.config import settings
+from app.services.sentence_encoder import load_sentence_encoder
+
+SAMPLE_QUERIES = [
+    "I feel anxious about my exams",
+    "What does Krishna say about dharma?",
+    "I lost my father last month and I can't stop crying",
+    "How do I stay calm when my boss is unfair to me?",
+    "karma yoga",
+]
+
+
+def timed_encode(encoder, texts):
+    """Encode texts and return (embeddings, seconds)."""
+    start = time.perf_counter()
+    embeddings = np.asarray(encoder.encode(texts), dtype=np.float32)
+    return embeddings, time.perf_counter() - start
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare PyTorch and ONNX sentence embeddings")
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL, help="Reference (PyTorch) model name")
+    parser.add_argument("--onnx-model", default=None, help="ONNX model name or directory (defaults to --model)")
+    parser.add_argument("--onnx-file", default=settings.EMBEDDING_MODEL_FILE, help="ONNX file to compare")
+    parser.add_argument("--csv", default="Bhagwad_Gita.csv", help="Verse CSV used as extra inputs")
+    parser.add_argument("--verses", type=int, default=100, help="Number of verses to include")
+    parser.add_argument("--min-cosine", type=float, default=0.99, help="Minimum cosine similarity per text")
+    args = parser.parse_args()
+    
+    texts = list(SAMPLE_QUERIES)
+    try:
+        df = pd.read_csv(args.csv).head(args.verses)
+        texts += [f"{row['Shloka']} {row['EngMeaning']}" for _, row in df.iterrows()]
+    except Exception as e:
+        print(f"⚠️ Could not load verses from {args.csv}: {e}")
+    
+    print(f"🕉️ Encoder parity check on {len(texts)} texts")
+    print("=" * 50)
+    
+    torch_encoder = load_sentence_encoder(args.model, backend="torch")
+    onnx_encoder = load_sentence_encoder(args.onnx_model or args.model, backend="onnx", file_name=args.onnx_file)
+    
+    # Warm up both backends before timing
+    torch_encoder.encode(texts[:2])
+    onnx_encoder.encode(texts[:2])
+    
+    torch_embeddings, torch_seconds = timed_encode(torch_encoder, texts)
+    onnx_embeddings, onnx_seconds = timed_encode(onnx_encoder, texts)
+    
+    torch_normed = torch_embeddings / np.linalg.norm(torch_embeddings, axis=1, keepdims=True)
+    onnx_normed = onnx_embeddings / np.linalg.norm(onnx_embeddings, axis=1, keepdims=True)
+    cosines = (torch_normed * onnx_normed).sum(axis=1)
+    max_abs_diff = float(np.abs(torch_embeddings - onnx_embeddings).max())
+    
+    print(f"Min cosine similarity:  {cosines.min():.6f}")
+    print(f"Mean cosine similarity: {cosines.mean():.6f}")
+    print(f"Max absolute diff:      {max_abs_diff:.6f}")
+    print(f"PyTorch encode time:    {torch_seconds * 1000:.1f} ms")
+    print(f"ONNX encode time:       {onnx_seconds * 1000:.1f} ms ({torch_seconds / onnx_seconds:.1f}x)")
+    
+    if cosines.min() < args.min_cosine:
+        print(f"❌ Parity check failed (min cosine < {args.min_cosine})")
+        sys.exit(1)
+    
+    print("✅ Parity check passed")
+    sys.exit(0)
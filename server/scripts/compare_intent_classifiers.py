@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Compare the zero-shot and embedding intent classifiers
+Run from the server directory: python -m scripts.compare_intent_classifiers [--data labelled.csv] [--calibrate calibration.json]
+
+Classifies a labelled evaluation set with both IntentClassificationService
+backends and the tiered cascade, and reports accuracy, per-intent accuracy,
+agreement, per-message latency, load time and the cascade's per-tier hits. The built-in evaluation set is
+disjoint from the examples the embedding prototypes are built from.
+
+With --calibrate, each early-exit cascade tier's raw score is Platt-calibrated
+against the labels and its exit threshold derived from the calibrated scores
+(the lowest one at which its answers reached --target-accuracy); point
+INTENT_CASCADE_CALIBRATION_PATH at the written file. Calibrate on a labelled
+set larger than the built-in one.
+"""
+
+import argparse
+import sys
+import time
+import numpy as np
+import pandas as pd
+from app.core.config import settings
+from app.services.intent_classification import IntentClassificationService, EMBEDDING_INTENT_MODEL
+from app.services.intent_calibration import fit_platt, derive_exit_confidence, save_cascade_calibration
+from app.services.verse_artifact import encoder_signature
+
+EVALUATION_SET = [
+    ("hey there", "casual_chat"),
+    ("good evening, hope you're well", "casual_chat"),
+    ("what is your name?", "casual_chat"),
+    ("can you explain what this website does", "casual_chat"),
+    ("thank you, that was helpful", "casual_chat"),
+    ("what's the weather like today", "casual_chat"),
+    ("bye for now", "casual_chat"),
+    ("are you a real person?", "casual_chat"),
+    ("I can't stop worrying about my health", "emotional_query"),
+    ("my girlfriend broke up with me and I feel worthless", "emotional_query"),
+    ("I'm so tired of everything, nothing makes me happy anymore", "emotional_query"),
+    ("I failed my interview again and feel hopeless", "emotional_query"),
+    ("I feel jealous of my brother's success", "emotional_query"),
+    ("my parents keep fighting and it hurts me", "emotional_query"),
+    ("I'm confused about whether to quit my job, it's stressing me out", "emotional_query"),
+    ("I regret the way I treated my mother", "emotional_query"),
+    ("what does the Gita teach about desire?", "spiritual_guidance"),
+    ("explain the concept of moksha", "spiritual_guidance"),
+    ("why did Krishna ask Arjuna to fight?", "spiritual_guidance"),
+    ("what is bhakti yoga", "spiritual_guidance"),
+    ("how can one control the mind according to Krishna", "spiritual_guidance"),
+    ("what happens to the soul after death?", "spiritual_guidance"),
+    ("what are the three gunas", "spiritual_guidance"),
+    ("is it wrong to want wealth in the eyes of dharma?", "spiritual_guidance"),
+]
+
+
+def load_evaluation_set(path):
+    """Load (text, intent) pairs from a CSV with text and intent columns."""
+    if not path:
+        return EVALUATION_SET
+    df = pd.read_csv(path)
+    return list(zip(df["text"].astype(str), df["intent"].astype(str)))
+
+
+def evaluate(service, texts):
+    """Classify texts one at a time and return (predictions, latencies in ms)."""
+    # Warm up before timing
+    service.classify_intent(texts[0])
+    
+    predictions, latencies = [], []
+    for text in texts:
+        start = time.perf_counter()
+        predictions.append(service.classify_intent(text)[0])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return predictions, np.asarray(latencies)
+
+
+def calibrate_cascade(service, texts, labels, target_accuracy, min_support):
+    """
+    Platt-calibrate each early-exit tier and derive its exit threshold.
+    
+    Returns:
+        Tier name -> {"a", "b", "exit_confidence", "support", "accuracy"}
+    """
+    answers = {}
+    for text, label in zip(texts, labels):
+        for tier, result in service.tier_scores(text).items():
+            if result is not None:
+                answers.setdefault(tier, []).append((result[1], result[0] == label))
+    
+    tiers = {}
+    for tier, pairs in answers.items():
+        scores = np.asarray([score for score, _ in pairs])
+        correct = np.asarray([right for _, right in pairs])
+        a, b = fit_platt(scores, correct)
+        calibrated = 1.0 / (1.0 + np.exp(-(a * scores + b)))
+        exit_confidence = derive_exit_confidence(calibrated, correct, target_accuracy, min_support)
+        tiers[tier] = {
+            "a": a,
+            "b": b,
+            "exit_confidence": exit_confidence,
+            "support": len(pairs),
+            "accuracy": float(correct.mean())
+        }
+        exits = f"exits at ≥ {exit_confidence:.3f}" if exit_confidence is not None else "never exits"
+        print(f"  {tier:<20} answered {len(pairs)}, accuracy {correct.mean():.1%}, {exits}")
+    return tiers
+
+
+def report(name, predictions, labels, latencies, load_seconds):
+    """Print accuracy and latency for one classifier."""
+    correct = np.asarray(predictions) == np.asarray(labels)
+    print(f"\n{name}")
+    print("-" * 50)
+    print(f"Load time:        {load_seconds:.1f} s")
+    print(f"Accuracy:         {correct.mean():.1%} ({correct.sum()}/{len(labels)})")
+    for intent in IntentClassificationService.INTENT_LABELS:
+        mask = np.asarray(labels) == intent
+        if mask.any():
+            print(f"  {intent:<20} {correct[mask].mean():.1%} ({correct[mask].sum()}/{mask.sum()})")
+    print(f"Latency mean/p95: {latencies.mean():.1f} / {np.percentile(latencies, 95):.1f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compare zero-shot and embedding intent classifiers")
+    parser.add_argument("--data", default=None, help="CSV with text and intent columns (defaults to the built-in set)")
+    parser.add_argument("--zero-shot-model", default="facebook/bart-large-mnli", help="Zero-shot NLI model")
+    parser.add_argument("--min-accuracy", type=float, default=None, help="Fail if the embedding classifier scores lower")
+    parser.add_argument("--calibrate", default=None, help="Write the cascade calibration (JSON) here")
+    parser.add_argument("--target-accuracy", type=float, default=0.95, help="Accuracy a tier's early exits must reach")
+    parser.add_argument("--min-support", type=int, default=5, help="Minimum answers above a tier's exit threshold")
+    args = parser.parse_args()
+    
+    pairs = load_evaluation_set(args.data)
+    texts = [text for text, _ in pairs]
+    labels = [label for _, label in pairs]
+    
+    print(f"🕉️ Intent classifier comparison on {len(pairs)} labelled messages")
+    print(f"Embedding model: {settings.EMBEDDING_MODEL} ({settings.EMBEDDING_BACKEND})")
+    print("=" * 50)
+    
+    results = {}
+    cascade_service = None
+    for key, name, model_name, cascade in [
+        ("zero_shot", f"Zero-shot ({args.zero_shot_model})", args.zero_shot_model, False),
+        ("embedding", "Embedding prototypes", EMBEDDING_INTENT_MODEL, False),
+        ("cascade", "Cascade (rules → lexical → embedding → zero-shot)", args.zero_shot_model, True),
+    ]:
+        start = time.perf_counter()
+        service = IntentClassificationService(model_name, cascade=cascade)
+        load_seconds = time.perf_counter() - start
+        if service.classifier is None and service.embedding_classifier is None:
+            print(f"❌ Could not load {name}")
+            sys.exit(1)
+        predictions, latencies = evaluate(service, texts)
+        report(name, predictions, labels, latencies, load_seconds)
+        results[key] = (predictions, latencies)
+        if cascade:
+            cascade_service = service
+    
+    # Per-tier hits (the counts include the warmup call)
+    stats = cascade_service.get_cascade_stats()
+    for tier, tier_stats in stats["per_tier"].items():
+        print(f"  {tier:<20} decided {tier_stats['hits']}/{stats['requests']} ({tier_stats['hit_rate']:.0%}), avg {tier_stats['avg_ms']:.2f} ms")
+    
+    zero_shot_predictions, zero_shot_latencies = results["zero_shot"]
+    embedding_predictions, embedding_latencies = results["embedding"]
+    cascade_predictions, cascade_latencies = results["cascade"]
+    agreement = np.mean(np.asarray(zero_shot_predictions) == np.asarray(embedding_predictions))
+    cascade_agreement = np.mean(np.asarray(zero_shot_predictions) == np.asarray(cascade_predictions))
+    
+    print("\n" + "=" * 50)
+    print(f"Agreement (embedding vs zero-shot): {agreement:.1%}")
+    print(f"Agreement (cascade vs zero-shot):   {cascade_agreement:.1%}")
+    print(f"Speedup (mean, embedding):          {zero_shot_latencies.mean() / embedding_latencies.mean():.1f}x")
+    print(f"Speedup (mean, cascade):            {zero_shot_latencies.mean() / cascade_latencies.mean():.1f}x")
+    
+    disagreements = [
+        (text, label, zero_shot, embedding)
+        for text, label, zero_shot, embedding in zip(texts, labels, zero_shot_predictions, embedding_predictions)
+        if zero_shot != embedding
+    ]
+    for text, label, zero_shot, embedding in disagreements:
+        print(f"  [{label}] zero-shot={zero_shot} embedding={embedding}: {text}")
+    
+    if args.calibrate:
+        print(f"\nCalibrating cascade tiers (target accuracy {args.target_accuracy:.0%})...")
+        tiers = calibrate_cascade(cascade_service, texts, labels, args.target_accuracy, args.min_support)
+        save_cascade_calibration(
+            args.calibrate,
+            tiers,
+            encoder_signature(settings.EMBEDDING_MODEL, settings.EMBEDDING_BACKEND, settings.EMBEDDING_MODEL_FILE),
+            args.target_accuracy
+        )
+        print(f"✅ Calibration saved to {args.calibrate} (set INTENT_CASCADE_CALIBRATION_PATH)")
+    
+    embedding_accuracy = np.mean(np.asarray(embedding_predictions) == np.asarray(labels))
+    if args.min_accuracy is not None and embedding_accuracy < args.min_accuracy:
+        print(f"❌ Embedding accuracy {embedding_accuracy:.1%} below {args.min_accuracy:.1%}")
+        sys.exit(1)
+    
+    print("✅ Comparison complete")
+    sys.exit(0)
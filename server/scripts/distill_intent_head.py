@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+Distill the intent classifier into a tiny NumPy head on sentence embeddings
+Run from the server directory: python -m scripts.distill_intent_head [--hidden 64] [--output ./models/intent_head.npz]
+
+Historical inputs from emotion_logs (plus the built-in intent examples and
+an optional text file) are labelled in batch by the current
+IntentClassificationService, which supplies its full score distribution as
+soft labels. The inputs are embedded with the retrieval encoder and a
+softmax-regression head (or, with --hidden, a one-hidden-layer MLP) is fit
+with NumPy and saved as .npz. The report compares the head with the
+teacher on held-out inputs: routed-intent agreement, agreement where the
+head is confident enough to exit the cascade, and per-message latency.
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+import numpy as np
+from app.core.config import settings
+from app.core.registry import model_registry
+from app.services.intent_classification import IntentClassificationService
+from app.services.intent_head import IntentHead
+from app.services.verse_artifact import encoder_signature
+from scripts.intent_teacher import load_training_texts, teacher_intent_probabilities
+
+
+def fit_head(embeddings, targets, hidden, epochs, learning_rate, weight_decay, seed=0):
+    """
+    Fit a softmax head to soft targets with full-batch Adam.
+    
+    Returns:
+        List of (weights, bias) layers for IntentHead
+    """
+    rng = np.random.default_rng(seed)
+    sizes = [embeddings.shape[1]] + ([hidden] if hidden else []) + [targets.shape[1]]
+    params = []
+    for inputs, outputs in zip(sizes[:-1], sizes[1:]):
+        params += [rng.normal(0.0, np.sqrt(2.0 / inputs), (inputs, outputs)).astype(np.float32),
+                   np.zeros(outputs, dtype=np.float32)]
+    moments = [np.zeros_like(p) for p in params]
+    velocities = [np.zeros_like(p) for p in params]
+    
+    for step in range(1, epochs + 1):
+        # Forward pass, keeping the input of every layer
+        activations = [embeddings]
+        for i in range(0, len(params) - 2, 2):
+            activations.append(np.maximum(activations[-1] @ params[i] + params[i + 1], 0.0))
+        logits = activations[-1] @ params[-2] + params[-1]
+        logits -= logits.max(axis=1, keepdims=True)
+        log_probabilities = logits - np.log(np.exp(logits).sum(axis=1, keepdims=True))
+        loss = -(targets * log_probabilities).sum(axis=1).mean()
+        
+        # Backward pass (softmax cross-entropy with soft targets)
+        delta = (np.exp(log_probabilities) - targets) / len(embeddings)
+        gradients = [None] * len(params)
+        for layer in reversed(range(len(params) // 2)):
+            gradients[2 * layer] = activations[layer].T @ delta + weight_decay * params[2 * layer]
+            gradients[2 * layer + 1] = delta.sum(axis=0)
+            if layer > 0:
+                delta = (delta @ params[2 * layer].T) * (activations[layer] > 0)
+        
+        for i, gradient in enumerate(gradients):
+            moments[i] = 0.9 * moments[i] + 0.1 * gradient
+            velocities[i] = 0.999 * velocities[i] + 0.001 * gradient ** 2
+            params[i] -= learning_rate * (moments[i] / (1 - 0.9 ** step)) / (np.sqrt(velocities[i] / (1 - 0.999 ** step)) + 1e-8)
+    
+    print(f"   Final distillation loss: {loss:.4f}")
+    return list(zip(params[0::2], params[1::2]))
+
+
+def route(labels, probabilities, threshold):
+    """Apply the service's low-confidence fallback to casual_chat."""
+    best = probabilities.argmax(axis=1)
+    confidence = probabilities[np.arange(len(best)), best]
+    return np.where(confidence < threshold, "casual_chat", np.asarray(labels)[best]), confidence
+
+
+def agreement_report(head, embeddings, targets, teacher_seconds, encode_seconds):
+    """Compare the head with the teacher on held-out inputs."""
+    threshold = settings.INTENT_CONFIDENCE_THRESHOLD
+    teacher_intents, _ = route(head.labels, targets, threshold)
+    head_intents, confidence = route(head.labels, head.probabilities(embeddings), threshold)
+    agree = teacher_intents == head_intents
+    confident = confidence >= settings.INTENT_HEAD_EXIT_CONFIDENCE
+    
+    # Serving scores one message at a time from its shared embedding
+    start = time.perf_counter()
+    for embedding in embeddings:
+        head.classify_embedding(embedding)
+    head_seconds = (time.perf_counter() - start) / max(len(embeddings), 1)
+    
+    print(f"   Held-out inputs:           {len(embeddings)}")
+    print(f"   Routed-intent agreement:   {agree.mean():.1%}")
+    for label in head.labels:
+        mask = teacher_intents == label
+        if mask.any():
+            print(f"     {label:<20} {agree[mask].mean():.1%} ({agree[mask].sum()}/{mask.sum()})")
+    if confident.any():
+        print(f"   Confident (≥ {settings.INTENT_HEAD_EXIT_CONFIDENCE:.2f}):        "
+              f"{confident.mean():.1%} of inputs, {agree[confident].mean():.1%} agreement")
+    print(f"   Teacher:                   {teacher_seconds * 1000:.1f} ms/text")
+    print(f"   Encoder (shared):          {encode_seconds * 1000:.2f} ms/text")
+    print(f"   Head:                      {head_seconds * 1e6:.1f} µs/text")
+    return agree.mean()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Distill the intent classifier into a NumPy head")
+    parser.add_argument("--output", default=settings.INTENT_HEAD_PATH or "./models/intent_head.npz", help="Output .npz file")
+    parser.add_argument("--texts", default=None, help="Extra inputs (one per line)")
+    parser.add_argument("--no-db", action="store_true", help="Don't read inputs from emotion_logs")
+    parser.add_argument("--limit", type=int, default=50000, help="Maximum inputs read from the database")
+    parser.add_argument("--hidden", type=int, default=0, help="Hidden units (0 = softmax regression)")
+    parser.add_argument("--epochs", type=int, default=500, help="Full-batch training steps")
+    parser.add_argument("--learning-rate", type=float, default=1e-2, help="Adam learning rate")
+    parser.add_argument("--weight-decay", type=float, default=1e-4, help="L2 penalty")
+    parser.add_argument("--holdout", type=float, default=0.2, help="Fraction of inputs held out for the report")
+    parser.add_argument("--min-agreement", type=float, default=None, help="Fail (and don't save) below this agreement")
+    args = parser.parse_args()
+    
+    print("🕉️ Intent head distillation")
+    print(f"Teacher: {settings.INTENT_MODEL}, encoder: {settings.EMBEDDING_MODEL} ({settings.EMBEDDING_BACKEND})")
+    print("=" * 50)
+    
+    try:
+        print("1. Loading inputs...")
+        texts = load_training_texts(args.texts, not args.no_db, args.limit)
+        random.Random(0).shuffle(texts)
+        holdout_size = max(1, int(len(texts) * args.holdout))
+        print(f"   {len(texts)} inputs ({len(texts) - holdout_size} train, {holdout_size} held out)")
+        
+        print("2. Labelling with the current intent classifier...")
+        labels = list(IntentClassificationService.INTENT_LABELS)
+        teacher = IntentClassificationService(cascade=False)
+        start = time.perf_counter()
+        targets = teacher_intent_probabilities(teacher, texts, labels)
+        teacher_seconds = (time.perf_counter() - start) / len(texts)
+        
+        print("3. Embedding inputs...")
+        encoder = model_registry.get("sentence_encoder")
+        start = time.perf_counter()
+        embeddings = np.asarray(encoder.encode(texts, batch_size=64), dtype=np.float32)
+        encode_seconds = (time.perf_counter() - start) / len(texts)
+        
+        print(f"4. Fitting the head ({'MLP, %d hidden' % args.hidden if args.hidden else 'softmax regression'})...")
+        layers = fit_head(
+            embeddings[holdout_size:], targets[holdout_size:],
+            args.hidden, args.epochs, args.learning_rate, args.weight_decay
+        )
+        head = IntentHead(
+            layers, labels,
+            encoder_signature(settings.EMBEDDING_MODEL, settings.EMBEDDING_BACKEND, settings.EMBEDDING_MODEL_FILE)
+        )
+        
+        print("5. Agreement report...")
+        agreement = agreement_report(head, embeddings[:holdout_size], targets[:holdout_size], teacher_seconds, encode_seconds)
+        if args.min_agreement is not None and agreement < args.min_agreement:
+            print(f"❌ Agreement {agreement:.1%} below {args.min_agreement:.1%}, head not saved")
+            sys.exit(1)
+        
+        Path(args.output).parent.mkdir(parents=True, exist_ok=True)
+        head.save(args.output)
+        print(f"   ✅ Saved head to {args.output} ({Path(args.output).stat().st_size / 1024:.1f} KB)")
+    except Exception as e:
+        print(f"❌ Distillation failed: {e}")
+        sys.exit(1)
+    
+    print("\n🎉 Distillation completed! Configure the server with:")
+    print(f"   INTENT_HEAD_PATH={args.output}")
+    sys.exit(0)
@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Export the zero-shot intent NLI model to ONNX (optionally int8-quantized)
+Run from the server directory: python -m scripts.export_intent_nli --quantize
+
+Writes the ONNX model, tokenizer and config.json to one directory, which
+IntentClassificationService loads with INTENT_ZERO_SHOT_BACKEND=onnx. With
+--check the exported model is compared against the transformers pipeline.
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from transformers import AutoTokenizer, pipeline
+from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from app.core.config import settings
+from app.services.intent_classification import IntentClassificationService
+from app.services.zero_shot_nli import OnnxZeroShotClassifier
+
+SAMPLE_INPUTS = [
+    "I feel anxious about my exams",
+    "What does Krishna say about dharma?",
+    "Hello, how are you?",
+    "I lost my father last month and I can't stop crying",
+    "What is the nature of the soul?",
+    "Can you recommend a good movie?",
+]
+
+
+def export_nli_model(model_name: str, output_dir: Path, quantize: bool) -> Path:
+    """Export the model to ONNX and return the path of the file to serve."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    print(f"1. Exporting {model_name} to ONNX...")
+    model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+    model.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(output_dir)
+    print(f"   ✅ Saved ONNX model to {output_dir / 'model.onnx'}")
+    
+    if not quantize:
+        return output_dir / "model.onnx"
+    
+    print("2. Quantizing to int8 (dynamic, per-tensor)...")
+    quantizer = ORTQuantizer.from_pretrained(output_dir, file_name="model.onnx")
+    quantization_config = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    quantizer.quantize(save_dir=output_dir, quantization_config=quantization_config)
+    print(f"   ✅ Saved quantized model to {output_dir / 'model_quantized.onnx'}")
+    return output_dir / "model_quantized.onnx"
+
+
+def check_against_pipeline(model_name: str, output_dir: Path, onnx_path: Path) -> bool:
+    """Compare top labels and latency of the exported model and the pipeline."""
+    labels = list(IntentClassificationService.INTENT_LABELS)
+    reference = pipeline("zero-shot-classification", model=model_name, device=-1)
+    exported = OnnxZeroShotClassifier(str(output_dir), onnx_path.name)
+    
+    agree = 0
+    reference_seconds = exported_seconds = 0.0
+    for text in SAMPLE_INPUTS:
+        start = time.perf_counter()
+        expected = reference(text, labels, hypothesis_template="This text is about {}", multi_label=False)
+        reference_seconds += time.perf_counter() - start
+        
+        start = time.perf_counter()
+        actual = exported(text, labels, hypothesis_template="This text is about {}", multi_label=False)
+        exported_seconds += time.perf_counter() - start
+        
+        agree += expected["labels"][0] == actual["labels"][0]
+        print(f"   {expected['labels'][0]:<20} {expected['scores'][0]:.3f} | "
+              f"{actual['labels'][0]:<20} {actual['scores'][0]:.3f}  {text}")
+    
+    print(f"   Top-label agreement: {agree}/{len(SAMPLE_INPUTS)}")
+    print(f"   Pipeline: {reference_seconds / len(SAMPLE_INPUTS) * 1000:.1f} ms/text, "
+          f"ONNX: {exported_seconds / len(SAMPLE_INPUTS) * 1000:.1f} ms/text")
+    return agree == len(SAMPLE_INPUTS)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the zero-shot intent model to ONNX")
+    parser.add_argument("--model", default="facebook/bart-large-mnli", help="NLI model name or Hub ID")
+    parser.add_argument("--output-dir", default=settings.INTENT_NLI_ONNX_MODEL, help="Output directory")
+    parser.add_argument("--quantize", action="store_true", help="Also write an int8-quantized model")
+    parser.add_argument("--check", action="store_true", help="Compare the export against the transformers pipeline")
+    args = parser.parse_args()
+    
+    try:
+        onnx_path = export_nli_model(args.model, Path(args.output_dir), args.quantize)
+        if args.check:
+            print("3. Comparing against the transformers pipeline...")
+            if not check_against_pipeline(args.model, Path(args.output_dir), onnx_path):
+                print("   ⚠️ Top labels differ on some inputs")
+    except Exception as e:
+        print(f"❌ Export failed: {e}")
+        sys.exit(1)
+    
+    print("\n🎉 Export completed! Configure the server with:")
+    print(f"   INTENT_ZERO_SHOT_BACKEND=onnx")
+    print(f"   INTENT_NLI_ONNX_MODEL={args.output_dir}")
+    print(f"   INTENT_NLI_ONNX_FILE={onnx_path.name}")
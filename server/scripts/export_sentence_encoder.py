@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Export the sentence embedding model to ONNX (optionally int8-quantized)
+Run from the server directory: python -m scripts.export_sentence_encoder --quantize
+"""
+
+import argparse
+import shutil
+import sys
+from pathlib import Path
+from huggingface_hub import hf_hub_download
+from transformers import AutoTokenizer
+from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+from optimum.onnxruntime.configuration import AutoQuantizationConfig
+from app.core.config import settings
+from app.services.sentence_encoder import resolve_model_id
+
+# sentence-transformers files needed to reproduce pooling/normalization
+SENTENCE_TRANSFORMERS_FILES = ["modules.json", "sentence_bert_config.json", "1_Pooling/config.json"]
+
+
+def export_encoder(model_name: str, output_dir: Path, quantize: bool) -> Path:
+    """Export the model to ONNX and return the path of the file to serve."""
+    model_id = resolve_model_id(model_name)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    
+    print(f"1. Exporting {model_id} to ONNX...")
+    model = ORTModelForFeatureExtraction.from_pretrained(model_id, export=True)
+    model.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(model_id).save_pretrained(output_dir)
+    
+    for file_name in SENTENCE_TRANSFORMERS_FILES:
+        try:
+            target = output_dir / file_name
+            target.parent.mkdir(parents=True, exist_ok=True)
+            shutil.copy(hf_hub_download(model_id, file_name), target)
+        except Exception as e:
+            print(f"   ⚠️ Could not copy {file_name}: {e}")
+    print(f"   ✅ Saved ONNX model to {output_dir / 'model.onnx'}")
+    
+    if not quantize:
+        return output_dir / "model.onnx"
+    
+    print("2. Quantizing to int8 (dynamic, per-tensor)...")
+    quantizer = ORTQuantizer.from_pretrained(output_dir, file_name="model.onnx")
+    quantization_config = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    quantizer.quantize(save_dir=output_dir, quantization_config=quantization_config)
+    print(f"   ✅ Saved quantized model to {output_dir / 'model_quantized.onnx'}")
+    return output_dir / "model_quantized.onnx"
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export the sentence encoder to ONNX")
+    parser.add_argument("--model", default=settings.EMBEDDING_MODEL, help="Model name or Hub ID")
+    parser.add_argument("--output-dir", default="./models/sentence_encoder_onnx", help="Output directory")
+    parser.add_argument("--quantize", action="store_true", help="Also write an int8-quantized model")
+    args = parser.parse_args()
+    
+    try:
+        onnx_path = export_encoder(args.model, Path(args.output_dir), args.quantize)
+    except Exception as e:
+        print(f"❌ Export failed: {e}")
+        sys.exit(1)
+    
+    print("\n🎉 Export completed! Configure the server with:")
+    print(f"   EMBEDDING_BACKEND=onnx")
+    print(f"   EMBEDDING_MODEL={args.output_dir}")
+    print(f"   EMBEDDING_MODEL_FILE={onnx_path.name}")
@@ -0,0 +1,85 @@
+"""
+Shared helpers for the intent distillation scripts
+(scripts.distill_intent_head and scripts.build_multitask_model).
+
+Both collect the same historical inputs and label them with the current
+IntentClassificationService, whose full score distribution is used as
+soft labels.
+"""
+
+import numpy as np
+from app.services.intent_classification import INTENT_EXAMPLES
+
+
+def load_training_texts(texts_file, from_db, limit):
+    """Collect distinct inputs from emotion_logs, the intent examples and a file."""
+    texts = []
+    if from_db:
+        from app.db.database import SessionLocal
+        from app.models.emotion_log import EmotionLog
+        db = SessionLocal()
+        try:
+            rows = db.query(EmotionLog.user_input).distinct().limit(limit).all()
+        finally:
+            db.close()
+        texts += [row[0].strip() for row in rows if row[0] and row[0].strip()]
+        print(f"   {len(texts)} distinct inputs from emotion_logs")
+    texts += [text for examples in INTENT_EXAMPLES.values() for text in examples]
+    if texts_file:
+        with open(texts_file, encoding="utf-8") as f:
+            texts += [line.strip() for line in f if line.strip()]
+    return list(dict.fromkeys(texts))
+
+
+def teacher_intent_probabilities(teacher, texts, labels, batch_size=64):
+    """
+    Label texts with the teacher's full score distribution.
+    
+    Rule-matched greetings get a one-hot casual_chat label; the remaining
+    texts go to the teacher's zero-shot classifier (or, without one, its
+    embedding classifier) in chunks of batch_size.
+    
+    Args:
+        teacher: IntentClassificationService (typically with cascade=False)
+        texts: Inputs to label
+        labels: Intent label per output column
+        batch_size: Texts per classifier call
+    
+    Returns:
+        Probability matrix of shape (texts, labels)
+    
+    Raises:
+        RuntimeError: If the teacher has no model loaded
+    """
+    probabilities = np.zeros((len(texts), len(labels)), dtype=np.float32)
+    
+    casual = [i for i, text in enumerate(texts) if teacher.is_casual_by_rules(text)]
+    probabilities[casual, labels.index("casual_chat")] = 1.0
+    remaining = sorted(set(range(len(texts))) - set(casual))
+    
+    if teacher.classifier is not None:
+        for batch_start in range(0, len(remaining), batch_size):
+            batch = remaining[batch_start:batch_start + batch_size]
+            results = teacher.classifier(
+                [texts[i] for i in batch], labels,
+                hypothesis_template="This text is about {}", multi_label=False
+            )
+            if isinstance(results, dict):
+                # The transformers pipeline unwraps single-text batches
+                results = [results]
+            for i, result in zip(batch, results):
+                for label, score in zip(result["labels"], result["scores"]):
+                    probabilities[i, labels.index(label)] = score
+            done = batch_start + len(batch)
+            if done % 512 == 0 or done == len(remaining):
+                print(f"   Labelled {done}/{len(remaining)}")
+    elif teacher.embedding_classifier is not None:
+        classifier = teacher.embedding_classifier
+        for batch_start in range(0, len(remaining), batch_size):
+            batch = remaining[batch_start:batch_start + batch_size]
+            scores = classifier.probabilities(classifier.encoder.encode([texts[i] for i in batch]))
+            probabilities[batch] = scores[:, [classifier.labels.index(label) for label in labels]]
+    else:
+        raise RuntimeError("Intent teacher could not be loaded")
+    
+    return probabilities
@@ -0,0 +1,53 @@
+"""
+Tests for direct verse reference parsing.
+
+Run from the server directory: python -m pytest tests
+"""
+import pytest
+from app.services.verse_reference import VerseReference, parse_verse_reference
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("BG 2.47", VerseReference(2, 47, 47)),
+    ("bg2:47", VerseReference(2, 47, 47)),
+    ("Bhagavad Gita 2.47?", VerseReference(2, 47, 47)),
+    ("Gita 2:47-50", VerseReference(2, 47, 50)),
+    ("gita 2.47 to 2.50", VerseReference(2, 47, 50)),
+    ("verse 2.47", VerseReference(2, 47, 47)),
+    ("show me shloka 18.66", VerseReference(18, 66, 66)),
+    ("what does BG 3.35 say", VerseReference(3, 35, 35)),
+    ("chapter 2 verse 47", VerseReference(2, 47, 47)),
+    ("ch 2 v 47-50", VerseReference(2, 47, 50)),
+    ("अध्याय २ श्लोक ४७", VerseReference(2, 47, 47)),
+])
+def test_parses_references(text, expected):
+    assert parse_verse_reference(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    # Bare numbers are times, prices or versions as often as verses
+    "10:30",
+    "4.20",
+    "2.47",
+    "at 10:30?",
+    "what is 4.20",
+    "show me 2:47",
+    "meet me at 10:30 tomorrow",
+])
+def test_rejects_bare_numbers(text):
+    assert parse_verse_reference(text) is None
+
+
+@pytest.mark.parametrize("text", [
+    "BG 19.1",
+    "BG 0.1",
+    "Gita 2.50-47",
+    "gita 2.47 to 3.5",
+    "I was reading BG 2.47 yesterday and it made me think",
+])
+def test_rejects_invalid_or_embedded_references(text):
+    assert parse_verse_reference(text) is None
+
+
+def test_caps_long_ranges():
+    assert parse_verse_reference("BG 2.1-72") == VerseReference(2, 1, 10)